@@ -26,12 +26,48 @@ from backlog.backlog_manager import BacklogManager
 from helpers.tool_registry import ToolRegistry
 from agents.orchestrator_agent import OrchestratorAgent
 from clients.memory_client import MemoryClient
+from vector_stores.books_vector_store import warmup_books_store
 
 dotenv.load_dotenv(".env.local")
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Use uvloop (a dependency everywhere but Windows, which keeps asyncio's
+# loop). This runs at import time so it also applies inside the worker
+# processes that re-import this module to run jobs.
+try:
+    import uvloop
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
+# Strong references to fire-and-forget tasks (asyncio only keeps weak ones)
+_background_tasks: set = set()
+
+
+def _on_background_task_done(task: asyncio.Task):
+    """Drop a finished background task and log its failure, if any."""
+    _background_tasks.discard(task)
+
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(
+            f"Background task {task.get_name()} failed: {task.exception()}",
+            exc_info=task.exception(),
+        )
+
+
+def _spawn_background_task(coro, name: str) -> asyncio.Task:
+    """Run a coroutine in the background, keeping it alive until it finishes."""
+    task = asyncio.create_task(coro, name=name)
+
+    _background_tasks.add(task)
+
+    task.add_done_callback(_on_background_task_done)
+
+    return task
+
 
 def prewarm_fnc(proc: agents.JobProcess):
     """Prewarm function - runs once per worker process."""
@@ -59,6 +95,9 @@ async def entrypoint(ctx: agents.JobContext):
 
     logger.info(f"✅ Joining agent room: {room_name}")
 
+    # Warm up the books vector store in the background while we connect
+    _spawn_background_task(warmup_books_store(), name="books_warmup")
+
     # Extract voice preference from metadata
     voice_preference = "alloy"
 
@@ -200,12 +239,8 @@ async def entrypoint(ctx: agents.JobContext):
         if role == "assistant":
             shared_state.add_to_history("assistant", content)
 
-        # Save to Firebase
-        asyncio.create_task(
-            asyncio.to_thread(
-                firebase_client.add_message, user_id, role.upper(), content
-            )
-        )
+        # Save to Firebase (buffered and committed in batches)
+        firebase_client.queue_message(user_id, role.upper(), content)
 
     # Create orchestrator agent
     orchestrator = OrchestratorAgent(shared_state)
@@ -216,6 +251,8 @@ async def entrypoint(ctx: agents.JobContext):
     @ctx.add_shutdown_callback
     async def on_shutdown():
         logger.info("🔌 Shutting down - cleaning up")
+        await firebase_client.close()
+        await memory_client.flush_access_counts()
         await lifecycle.teardown()
 
     # Start the session with orchestrator
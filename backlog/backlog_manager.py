@@ -5,10 +5,11 @@ Handles all CRUD operations for user reminders and tasks.
 """
 
 import os
+import time
 import uuid
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
 
 import boto3
 from boto3.dynamodb.conditions import Key, Attr
@@ -22,6 +23,11 @@ load_dotenv(".env.secrets")
 
 logger = logging.getLogger(__name__)
 
+# Recurrence intervals
+ONE_DAY = timedelta(days=1)
+ONE_WEEK = timedelta(weeks=1)
+ONE_MONTH = relativedelta(months=1)
+
 
 class BacklogManager:
     """Manages backlog items (reminders/tasks) in DynamoDB."""
@@ -29,6 +35,36 @@ class BacklogManager:
     TABLE_NAME = "BacklogItems"
     GSI_NAME = "ScheduledTimeIndex"
 
+    # Sparse GSI (due_marker, scheduled_epoch). due_marker is only set on
+    # active, uncompleted items, so the index holds nothing else.
+    # Created and backfilled by backlog.due_index_migration.
+    DUE_GSI_NAME = "DueIndex"
+
+    # How often to re-check a user who still has items without due_marker
+    DUE_INDEX_RECHECK_SECONDS = 60 * 60
+
+    # Recurrence type -> function computing the next occurrence
+    _RECURRENCE_DELTAS = {
+        "daily": lambda t: t + ONE_DAY,
+        "weekly": lambda t: t + ONE_WEEK,
+        "monthly": lambda t: t + ONE_MONTH,
+    }
+
+    # Don't repeat a reminder more often than this
+    REMINDER_REPEAT_SECONDS = 5 * 60
+
+    # Attributes needed to schedule and announce reminders
+    REMINDER_ATTRIBUTES = (
+        "item_id",
+        "title",
+        "scheduled_time",
+        "scheduled_epoch",
+        "display_time",
+        "remind_before_minutes",
+        "last_reminded_at",
+        "last_reminded_epoch",
+    )
+
     def __init__(self, dynamodb_resource=None):
         """
         Initialize BacklogManager.
@@ -48,8 +84,37 @@ class BacklogManager:
             self.dynamodb = dynamodb_resource
 
         self.table = self.dynamodb.Table(self.TABLE_NAME)
+
+        self._change_listener: Optional[Callable[[], None]] = None
+
+        # Cleared if the table turns out not to have the DueIndex GSI
+        self._due_index_available = True
+
+        # user_id -> True once every pending item carries due_marker, or the
+        # monotonic time it was last found with items that don't
+        self._due_index_users: Dict[str, Any] = {}
+
         logger.info(f"BacklogManager initialized with table: {self.TABLE_NAME}")
 
+    def set_change_listener(self, listener: Optional[Callable[[], None]]) -> None:
+        """
+        Register a callback invoked whenever items are added, completed or deleted.
+
+        Used by TimeMonitor to re-plan its next wakeup.
+
+        Args:
+            listener: Callable with no arguments, or None to unregister
+        """
+        self._change_listener = listener
+
+    def _notify_change(self) -> None:
+        """Invoke the change listener, if any."""
+        if self._change_listener:
+            try:
+                self._change_listener()
+            except Exception as e:
+                logger.error(f"Backlog change listener failed: {e}")
+
     def add_item(
         self,
         user_id: str,
@@ -80,7 +145,10 @@ class BacklogManager:
             "user_id": user_id,
             "item_id": item_id,
             "title": title,
+            "title_lower": title.lower(),
             "scheduled_time": scheduled_datetime.isoformat(),
+            "scheduled_epoch": int(scheduled_datetime.timestamp()),
+            "display_time": scheduled_datetime.strftime("%I:%M %p").lstrip("0"),
             "remind_before_minutes": remind_before_minutes,
             "recurrence": recurrence,
             "is_active": True,
@@ -89,11 +157,13 @@ class BacklogManager:
             "notes": notes,
             "created_at": now.isoformat(),
             "last_reminded_at": None,
+            "due_marker": user_id,
         }
 
         try:
             self.table.put_item(Item=item)
             logger.info(f"Added backlog item: {item_id} for user {user_id}")
+            self._notify_change()
             return item
 
         except ClientError as e:
@@ -133,6 +203,7 @@ class BacklogManager:
         try:
             self.table.delete_item(Key={"user_id": user_id, "item_id": item_id})
             logger.info(f"Deleted backlog item: {item_id}")
+            self._notify_change()
             return True
 
         except ClientError as e:
@@ -140,7 +211,10 @@ class BacklogManager:
             raise
 
     def get_upcoming_items(
-        self, user_id: str, hours_ahead: int = 24
+        self,
+        user_id: str,
+        hours_ahead: int = 24,
+        attributes: Optional[Tuple[str, ...]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Get upcoming active items within a time window.
@@ -148,6 +222,7 @@ class BacklogManager:
         Args:
             user_id: User identifier
             hours_ahead: How many hours ahead to look (default 24)
+            attributes: Optional attribute names to return (default: all)
 
         Returns:
             List of upcoming items sorted by scheduled_time
@@ -155,19 +230,27 @@ class BacklogManager:
         now = datetime.utcnow()
         future_cutoff = now + timedelta(hours=hours_ahead)
 
+        query_params = {
+            "IndexName": self.GSI_NAME,
+            "KeyConditionExpression": (
+                Key("user_id").eq(user_id)
+                & Key("scheduled_time").between(
+                    now.isoformat(), future_cutoff.isoformat()
+                )
+            ),
+            "FilterExpression": Attr("is_active").eq(True)
+            & Attr("is_completed").eq(False),
+        }
+
+        # Only return the requested attributes (aliased to avoid reserved words)
+        if attributes:
+            names = {f"#a{i}": name for i, name in enumerate(attributes)}
+            query_params["ProjectionExpression"] = ", ".join(names)
+            query_params["ExpressionAttributeNames"] = names
+
         try:
             # Query using GSI for efficient time-based retrieval
-            response = self.table.query(
-                IndexName=self.GSI_NAME,
-                KeyConditionExpression=(
-                    Key("user_id").eq(user_id)
-                    & Key("scheduled_time").between(
-                        now.isoformat(), future_cutoff.isoformat()
-                    )
-                ),
-                FilterExpression=Attr("is_active").eq(True)
-                & Attr("is_completed").eq(False),
-            )
+            response = self.table.query(**query_params)
 
             items = response.get("Items", [])
 
@@ -198,33 +281,267 @@ class BacklogManager:
         Returns:
             List of items that should be announced now
         """
+        due_items, _ = self.get_reminder_schedule(user_id, current_time)
+
+        return due_items
+
+    def get_reminder_schedule(
+        self, user_id: str, current_time: Optional[datetime] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Get due reminders and the time of the next reminder from one query.
+
+        Args:
+            user_id: User identifier
+            current_time: Current time (defaults to utcnow)
+
+        Returns:
+            Tuple of (items that should be announced now,
+            epoch seconds of the next reminder or None if nothing is upcoming)
+        """
+        state = self.fetch_user_state(user_id, current_time)
+
+        return state["due"], state["next_remind_epoch"]
+
+    def fetch_user_state(
+        self, user_id: str, current_time: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Get upcoming items, due reminders and the next reminder time
+        from a single query.
+
+        Args:
+            user_id: User identifier
+            current_time: Current time (defaults to utcnow)
+
+        Returns:
+            Dict with "upcoming" (items in the next 24 hours), "due"
+            (items that should be announced now) and "next_remind_epoch"
+            (epoch seconds of the next reminder, or None)
+        """
         if current_time is None:
             current_time = datetime.utcnow()
 
+        current_epoch = int(current_time.timestamp())
+
         # Get items scheduled within the next 24 hours
         # (wider window to catch various remind_before_minutes values)
-        upcoming = self.get_upcoming_items(user_id, hours_ahead=24)
+        upcoming = self._query_upcoming_reminders(user_id, current_epoch)
 
         due_items = []
+        next_remind_epoch = None
         for item in upcoming:
-            scheduled_time = datetime.fromisoformat(item["scheduled_time"])
-            remind_before = timedelta(minutes=int(item.get("remind_before_minutes", 0)))
-            remind_at_time = scheduled_time - remind_before
+            remind_before = int(item.get("remind_before_minutes", 0)) * 60
+            remind_at_epoch = self.get_scheduled_epoch(item) - remind_before
 
             # Check if it's time to remind
-            if current_time >= remind_at_time:
+            if current_epoch >= remind_at_epoch:
                 # Check if already reminded recently (within 5 minutes)
-                last_reminded = item.get("last_reminded_at")
-                if last_reminded:
-                    last_reminded_time = datetime.fromisoformat(last_reminded)
-                    if (current_time - last_reminded_time) < timedelta(minutes=5):
-                        continue  # Skip - already reminded recently
-
-                due_items.append(item)
+                last_reminded = self._get_last_reminded_epoch(item)
+                if (
+                    last_reminded is not None
+                    and (current_epoch - last_reminded) < self.REMINDER_REPEAT_SECONDS
+                ):
+                    # Skip for now - repeat once the cooldown has passed
+                    remind_at_epoch = last_reminded + self.REMINDER_REPEAT_SECONDS
+                else:
+                    due_items.append(item)
+                    remind_at_epoch = current_epoch + self.REMINDER_REPEAT_SECONDS
+
+            if next_remind_epoch is None or remind_at_epoch < next_remind_epoch:
+                next_remind_epoch = remind_at_epoch
 
         # logger.info(f"Found {len(due_items)} due reminders for user {user_id}")
 
-        return due_items
+        return {
+            "upcoming": upcoming,
+            "due": due_items,
+            "next_remind_epoch": next_remind_epoch,
+        }
+
+    def _query_upcoming_reminders(
+        self, user_id: str, current_epoch: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Get pending items scheduled in the next 24 hours.
+
+        Reads the sparse DueIndex once the table has it and all of the user's
+        pending items carry due_marker. Otherwise falls back to the
+        ScheduledTimeIndex query, which works for items written before the
+        index existed.
+
+        Args:
+            user_id: User identifier
+            current_epoch: Current time (epoch seconds)
+
+        Returns:
+            List of items (REMINDER_ATTRIBUTES only)
+        """
+        if self._due_index_available and self._uses_due_index(user_id):
+            try:
+                return self._query_due_index(
+                    user_id, current_epoch, current_epoch + 24 * 60 * 60
+                )
+
+            except ClientError as e:
+                if not self._is_missing_index_error(e):
+                    raise
+
+                logger.warning(
+                    f"{self.DUE_GSI_NAME} not found on {self.TABLE_NAME}, "
+                    f"falling back to {self.GSI_NAME}"
+                )
+
+                self._due_index_available = False
+
+        return self.get_upcoming_items(
+            user_id, hours_ahead=24, attributes=self.REMINDER_ATTRIBUTES
+        )
+
+    def _uses_due_index(self, user_id: str) -> bool:
+        """
+        Check whether all of a user's pending items are in DueIndex.
+
+        New items always carry due_marker, so a user stays on the index once
+        their older items have been backfilled, completed or deleted.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            True if DueIndex returns every pending item for the user
+        """
+        state = self._due_index_users.get(user_id)
+
+        if state is True:
+            return True
+
+        now = time.monotonic()
+
+        if state is not None and now - state < self.DUE_INDEX_RECHECK_SECONDS:
+            return False
+
+        try:
+            unmarked = self._iter_query(
+                IndexName=self.GSI_NAME,
+                KeyConditionExpression=Key("user_id").eq(user_id),
+                FilterExpression=Attr("is_active").eq(True)
+                & Attr("is_completed").eq(False)
+                & Attr("due_marker").not_exists(),
+                ProjectionExpression="item_id",
+            )
+
+            has_unmarked = next(unmarked, None) is not None
+
+        except ClientError as e:
+            logger.error(f"Failed to check due_marker backfill: {e}")
+
+            has_unmarked = True
+
+        self._due_index_users[user_id] = now if has_unmarked else True
+
+        return not has_unmarked
+
+    @staticmethod
+    def _is_missing_index_error(error: ClientError) -> bool:
+        """Check whether a query failed because the GSI doesn't exist."""
+        details = error.response.get("Error", {})
+
+        return (
+            details.get("Code") == "ValidationException"
+            and "index" in details.get("Message", "").lower()
+        )
+
+    def _query_due_index(
+        self, user_id: str, start_epoch: int, end_epoch: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Get active, uncompleted items scheduled within an epoch range.
+
+        Queries the sparse DueIndex, so only pending items are read and
+        no FilterExpression is needed.
+
+        Args:
+            user_id: User identifier
+            start_epoch: Range start (epoch seconds, inclusive)
+            end_epoch: Range end (epoch seconds, inclusive)
+
+        Returns:
+            List of items (REMINDER_ATTRIBUTES only) sorted by scheduled time
+        """
+        names = {f"#a{i}": name for i, name in enumerate(self.REMINDER_ATTRIBUTES)}
+
+        try:
+            response = self.table.query(
+                IndexName=self.DUE_GSI_NAME,
+                KeyConditionExpression=(
+                    Key("due_marker").eq(user_id)
+                    & Key("scheduled_epoch").between(start_epoch, end_epoch)
+                ),
+                ProjectionExpression=", ".join(names),
+                ExpressionAttributeNames=names,
+            )
+
+            return response.get("Items", [])
+
+        except ClientError as e:
+            logger.error(f"Failed to query due index: {e}")
+            raise
+
+    @staticmethod
+    def get_scheduled_epoch(item: Dict[str, Any]) -> int:
+        """
+        Get an item's scheduled time as epoch seconds.
+
+        Items created before scheduled_epoch was stored fall back to
+        parsing the ISO scheduled_time string.
+
+        Args:
+            item: Backlog item dictionary
+
+        Returns:
+            Scheduled time in epoch seconds
+        """
+        scheduled_epoch = item.get("scheduled_epoch")
+        if scheduled_epoch is not None:
+            return int(scheduled_epoch)
+
+        return int(datetime.fromisoformat(item["scheduled_time"]).timestamp())
+
+    @staticmethod
+    def get_display_time(item: Dict[str, Any]) -> str:
+        """
+        Get an item's scheduled time formatted for speech (e.g., "2:30 PM").
+
+        Items created before display_time was stored fall back to
+        formatting scheduled_time.
+
+        Args:
+            item: Backlog item dictionary
+
+        Returns:
+            Formatted time string
+        """
+        display_time = item.get("display_time")
+        if display_time:
+            return display_time
+
+        scheduled_time = datetime.fromisoformat(item["scheduled_time"])
+
+        return scheduled_time.strftime("%I:%M %p").lstrip("0")
+
+    @staticmethod
+    def _get_last_reminded_epoch(item: Dict[str, Any]) -> Optional[int]:
+        """Get last_reminded_at as epoch seconds, or None if never reminded."""
+        last_reminded_epoch = item.get("last_reminded_epoch")
+        if last_reminded_epoch is not None:
+            return int(last_reminded_epoch)
+
+        last_reminded = item.get("last_reminded_at")
+        if last_reminded:
+            return int(datetime.fromisoformat(last_reminded).timestamp())
+
+        return None
 
     def update_reminded_timestamp(self, user_id: str, item_id: str) -> bool:
         """
@@ -242,8 +559,11 @@ class BacklogManager:
         try:
             self.table.update_item(
                 Key={"user_id": user_id, "item_id": item_id},
-                UpdateExpression="SET last_reminded_at = :time",
-                ExpressionAttributeValues={":time": now.isoformat()},
+                UpdateExpression="SET last_reminded_at = :time, last_reminded_epoch = :epoch",
+                ExpressionAttributeValues={
+                    ":time": now.isoformat(),
+                    ":epoch": int(now.timestamp()),
+                },
             )
             logger.info(f"Updated reminded timestamp for item: {item_id}")
             return True
@@ -252,34 +572,67 @@ class BacklogManager:
             logger.error(f"Failed to update reminded timestamp: {e}")
             raise
 
-    def list_all_active(self, user_id: str) -> List[Dict[str, Any]]:
+    def _iter_query(self, **query_params) -> Iterator[Dict[str, Any]]:
         """
-        Get all active (non-deleted) reminders for a user.
+        Run a table query and yield items one page at a time.
+
+        Follows LastEvaluatedKey so results past DynamoDB's 1MB page
+        limit aren't dropped, while holding only one page in memory.
+
+        Args:
+            **query_params: Arguments for table.query
+
+        Yields:
+            Matching items
+        """
+        while True:
+            response = self.table.query(**query_params)
+
+            yield from response.get("Items", [])
+
+            if "LastEvaluatedKey" not in response:
+                return
+
+            query_params["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    def iter_all_active(self, user_id: str) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all active (non-deleted) reminders for a user.
 
         Args:
             user_id: User identifier
 
-        Returns:
-            List of all active items sorted by scheduled_time
+        Yields:
+            Active items sorted by scheduled_time
         """
         try:
-            response = self.table.query(
+            yield from self._iter_query(
                 IndexName=self.GSI_NAME,
                 KeyConditionExpression=Key("user_id").eq(user_id),
                 FilterExpression=Attr("is_active").eq(True)
                 & Attr("is_completed").eq(False),
             )
 
-            items = response.get("Items", [])
-
-            logger.info(f"Found {len(items)} active items for user {user_id}")
-
-            return items
-
         except ClientError as e:
             logger.error(f"Failed to list active items: {e}")
             raise
 
+    def list_all_active(self, user_id: str) -> List[Dict[str, Any]]:
+        """
+        Get all active (non-deleted) reminders for a user.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            List of all active items sorted by scheduled_time
+        """
+        items = list(self.iter_all_active(user_id))
+
+        logger.info(f"Found {len(items)} active items for user {user_id}")
+
+        return items
+
     def complete_item(self, user_id: str, item_id: str) -> Dict[str, Any]:
         """
         Mark an item as complete.
@@ -304,13 +657,17 @@ class BacklogManager:
         try:
             self.table.update_item(
                 Key={"user_id": user_id, "item_id": item_id},
-                UpdateExpression="SET is_completed = :completed, completed_at = :time",
+                UpdateExpression=(
+                    "SET is_completed = :completed, completed_at = :time "
+                    "REMOVE due_marker"
+                ),
                 ExpressionAttributeValues={
                     ":completed": True,
                     ":time": now.isoformat(),
                 },
             )
             logger.info(f"Completed backlog item: {item_id}")
+            self._notify_change()
 
         except ClientError as e:
             logger.error(f"Failed to complete item: {e}")
@@ -362,21 +719,16 @@ class BacklogManager:
         Returns:
             Next occurrence datetime
         """
-        if recurrence == "daily":
-            return current_time + timedelta(days=1)
-
-        elif recurrence == "weekly":
-            return current_time + timedelta(weeks=1)
+        next_occurrence = self._RECURRENCE_DELTAS.get(recurrence)
 
-        elif recurrence == "monthly":
-            return current_time + relativedelta(months=1)
-
-        else:
+        if next_occurrence is None:
             # Default to daily if unknown
             logger.warning(
                 f"Unknown recurrence type: {recurrence}, defaulting to daily"
             )
-            return current_time + timedelta(days=1)
+            next_occurrence = self._RECURRENCE_DELTAS["daily"]
+
+        return next_occurrence(current_time)
 
     def find_item_by_title(
         self, user_id: str, title_search: str
@@ -392,15 +744,35 @@ class BacklogManager:
         Returns:
             First matching item or None
         """
-        items = self.list_all_active(user_id)
+        search_lower = title_search.lower()
 
-        title_lower = title_search.lower()
+        # Match title_lower server-side. Items created before title_lower
+        # existed (until due_index_migration backfills them) come back
+        # unfiltered and are matched case-insensitively here
+        try:
+            candidates = self._iter_query(
+                IndexName=self.GSI_NAME,
+                KeyConditionExpression=Key("user_id").eq(user_id),
+                FilterExpression=Attr("is_active").eq(True)
+                & Attr("is_completed").eq(False)
+                & (
+                    Attr("title_lower").contains(search_lower)
+                    | Attr("title_lower").not_exists()
+                ),
+            )
 
-        for item in items:
-            if title_lower in item["title"].lower():
-                return item
+            matches = (
+                item
+                for item in candidates
+                if "title_lower" in item or search_lower in item["title"].lower()
+            )
 
-        return None
+            # Stops paging at the first match
+            return next(matches, None)
+
+        except ClientError as e:
+            logger.error(f"Failed to find item by title: {e}")
+            raise
 
     def get_items_by_timeframe(
         self, user_id: str, timeframe: str, current_time: Optional[datetime] = None
@@ -419,32 +791,42 @@ class BacklogManager:
         if current_time is None:
             current_time = datetime.utcnow()
 
+        if timeframe == "all":
+            return self.list_all_active(user_id)
+
         today_start = current_time.replace(hour=0, minute=0, second=0, microsecond=0)
 
-        today_end = today_start + timedelta(days=1)
+        timeframe_ranges = {
+            "today": (today_start, today_start + timedelta(days=1)),
+            "tomorrow": (
+                today_start + timedelta(days=1),
+                today_start + timedelta(days=2),
+            ),
+            "week": (today_start, today_start + timedelta(days=7)),
+        }
 
-        tomorrow_end = today_start + timedelta(days=2)
+        if timeframe not in timeframe_ranges:
+            return []
 
-        week_end = today_start + timedelta(days=7)
+        start, end = timeframe_ranges[timeframe]
 
-        if timeframe == "all":
-            return self.list_all_active(user_id)
-
-        # Get all active items first
-        all_items = self.list_all_active(user_id)
+        try:
+            # Push the time window down to the GSI instead of filtering in Python
+            items = self._iter_query(
+                IndexName=self.GSI_NAME,
+                KeyConditionExpression=(
+                    Key("user_id").eq(user_id)
+                    & Key("scheduled_time").between(start.isoformat(), end.isoformat())
+                ),
+                FilterExpression=Attr("is_active").eq(True)
+                & Attr("is_completed").eq(False),
+            )
 
-        filtered = []
-        for item in all_items:
-            scheduled = datetime.fromisoformat(item["scheduled_time"])
+            # BETWEEN is inclusive; keep the end of the window exclusive
+            end_iso = end.isoformat()
 
-            if timeframe == "today":
-                if today_start <= scheduled < today_end:
-                    filtered.append(item)
-            elif timeframe == "tomorrow":
-                if today_end <= scheduled < tomorrow_end:
-                    filtered.append(item)
-            elif timeframe == "week":
-                if today_start <= scheduled < week_end:
-                    filtered.append(item)
+            return [item for item in items if item["scheduled_time"] < end_iso]
 
-        return filtered
+        except ClientError as e:
+            logger.error(f"Failed to get items by timeframe: {e}")
+            raise
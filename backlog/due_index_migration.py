@@ -0,0 +1,194 @@
+"""
+DueIndex migration - Creates the sparse DueIndex GSI on BacklogItems and
+backfills due_marker/scheduled_epoch (and title_lower, used by
+find_item_by_title) on items written before they existed.
+
+Usage:
+    python -m backlog.due_index_migration --create-index
+    python -m backlog.due_index_migration --backfill [--dry-run]
+
+BacklogManager falls back to ScheduledTimeIndex until both steps are done,
+so the migration can run while agents are live.
+"""
+
+import argparse
+import logging
+from typing import Any, Dict
+
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+
+from backlog.backlog_manager import BacklogManager
+
+logger = logging.getLogger(__name__)
+
+# Table key attributes are always projected into a GSI
+_TABLE_KEYS = {"user_id", "item_id"}
+
+# Index keys plus everything BacklogManager reads from it
+DUE_INDEX_DEFINITION: Dict[str, Any] = {
+    "IndexName": BacklogManager.DUE_GSI_NAME,
+    "KeySchema": [
+        {"AttributeName": "due_marker", "KeyType": "HASH"},
+        {"AttributeName": "scheduled_epoch", "KeyType": "RANGE"},
+    ],
+    "Projection": {
+        "ProjectionType": "INCLUDE",
+        "NonKeyAttributes": [
+            name
+            for name in BacklogManager.REMINDER_ATTRIBUTES
+            if name not in _TABLE_KEYS and name != "scheduled_epoch"
+        ],
+    },
+}
+
+DUE_INDEX_ATTRIBUTE_DEFINITIONS = [
+    {"AttributeName": "due_marker", "AttributeType": "S"},
+    {"AttributeName": "scheduled_epoch", "AttributeType": "N"},
+]
+
+
+def create_due_index(manager: BacklogManager) -> bool:
+    """
+    Add the DueIndex GSI to the BacklogItems table.
+
+    Args:
+        manager: BacklogManager whose table gets the index
+
+    Returns:
+        True if the index was requested, False if it already exists
+    """
+    table = manager.table
+
+    table.load()
+
+    existing = {index["IndexName"] for index in table.global_secondary_indexes or []}
+
+    if DUE_INDEX_DEFINITION["IndexName"] in existing:
+        logger.info(f"{DUE_INDEX_DEFINITION['IndexName']} already exists")
+        return False
+
+    index = dict(DUE_INDEX_DEFINITION)
+
+    # Provisioned tables need throughput for the new index too
+    billing = (table.billing_mode_summary or {}).get("BillingMode")
+
+    if billing != "PAY_PER_REQUEST":
+        throughput = table.provisioned_throughput
+        index["ProvisionedThroughput"] = {
+            "ReadCapacityUnits": throughput["ReadCapacityUnits"],
+            "WriteCapacityUnits": throughput["WriteCapacityUnits"],
+        }
+
+    table.update(
+        AttributeDefinitions=DUE_INDEX_ATTRIBUTE_DEFINITIONS,
+        GlobalSecondaryIndexUpdates=[{"Create": index}],
+    )
+
+    logger.info(f"Requested {index['IndexName']} on {manager.TABLE_NAME}")
+
+    return True
+
+
+def backfill_due_markers(manager: BacklogManager, dry_run: bool = False) -> int:
+    """
+    Set due_marker (and scheduled_epoch/title_lower if missing) on pending items.
+
+    Only active, uncompleted items missing due_marker or title_lower are
+    touched. The update is conditional on the item still being uncompleted,
+    so it can't race a complete_item call back into the index.
+
+    Args:
+        manager: BacklogManager whose table is backfilled
+        dry_run: Count the items without updating them
+
+    Returns:
+        Number of items updated (or that would be updated)
+    """
+    table = manager.table
+
+    # Placeholders keep attribute names clear of DynamoDB reserved words
+    names = {
+        f"#a{i}": name
+        for i, name in enumerate(
+            ("user_id", "item_id", "title", "scheduled_time", "scheduled_epoch")
+        )
+    }
+
+    scan_params = {
+        "FilterExpression": Attr("is_active").eq(True)
+        & Attr("is_completed").eq(False)
+        & (Attr("due_marker").not_exists() | Attr("title_lower").not_exists()),
+        "ProjectionExpression": ", ".join(names),
+        "ExpressionAttributeNames": names,
+    }
+
+    updated = 0
+
+    while True:
+        response = table.scan(**scan_params)
+
+        for item in response.get("Items", []):
+            if not dry_run:
+                try:
+                    table.update_item(
+                        Key={"user_id": item["user_id"], "item_id": item["item_id"]},
+                        UpdateExpression=(
+                            "SET due_marker = :user, "
+                            "scheduled_epoch = if_not_exists(scheduled_epoch, :epoch), "
+                            "title_lower = if_not_exists(title_lower, :title_lower)"
+                        ),
+                        ConditionExpression=Attr("is_completed").eq(False),
+                        ExpressionAttributeValues={
+                            ":user": item["user_id"],
+                            ":epoch": BacklogManager.get_scheduled_epoch(item),
+                            ":title_lower": item["title"].lower(),
+                        },
+                    )
+                except ClientError as e:
+                    code = e.response.get("Error", {}).get("Code")
+
+                    if code != "ConditionalCheckFailedException":
+                        raise
+
+                    # Completed since the scan - leave it out of the index
+                    continue
+
+            updated += 1
+
+        if "LastEvaluatedKey" not in response:
+            break
+
+        scan_params["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    logger.info(
+        f"{'Would backfill' if dry_run else 'Backfilled'} {updated} backlog items"
+    )
+
+    return updated
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--create-index", action="store_true")
+    parser.add_argument("--backfill", action="store_true")
+    parser.add_argument("--dry-run", action="store_true")
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+
+    manager = BacklogManager()
+
+    if args.create_index:
+        create_due_index(manager)
+
+    if args.backfill:
+        backfill_due_markers(manager, dry_run=args.dry_run)
+
+    if not (args.create_index or args.backfill):
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
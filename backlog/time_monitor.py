@@ -5,16 +5,46 @@ Time Monitor - Background task that checks for due reminders and announces them.
 import asyncio
 import logging
 from datetime import datetime
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Dict, Optional
 
 from backlog.backlog_manager import BacklogManager
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1440)
+def _format_time_desc(minutes_until: int) -> str:
+    """
+    Describe how far away a reminder is (e.g., "1 hour and 15 minutes").
+
+    Args:
+        minutes_until: Whole minutes until the scheduled time
+
+    Returns:
+        Human-readable duration
+    """
+    if minutes_until >= 60:
+        hours = minutes_until // 60
+
+        mins = minutes_until % 60
+
+        if mins > 0:
+            return f"{hours} hour{'s' if hours > 1 else ''} and {mins} minutes"
+
+        return f"{hours} hour{'s' if hours > 1 else ''}"
+
+    return f"{minutes_until} minutes"
+
+
 class TimeMonitor:
     """Monitors time and triggers reminders when they're due."""
 
+    # Bounds on how long the loop sleeps between schedule checks
+    MIN_SLEEP_SECONDS = 1
+
+    MAX_SLEEP_SECONDS = 300
+
     def __init__(
         self,
         user_id: str,
@@ -41,6 +71,12 @@ class TimeMonitor:
 
         self._session = None
 
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self._wakeup = asyncio.Event()
+
+        self._last_state: Optional[Dict[str, Any]] = None
+
         logger.info(f"TimeMonitor initialized for user: {user_id}")
 
     def set_session(self, session):
@@ -57,6 +93,10 @@ class TimeMonitor:
 
         self._running = True
 
+        self._loop = asyncio.get_running_loop()
+
+        self.backlog_manager.set_change_listener(self.notify_backlog_changed)
+
         self._task = asyncio.create_task(self._monitor_loop())
 
         logger.info("🕐 TimeMonitor started")
@@ -68,6 +108,8 @@ class TimeMonitor:
 
         self._running = False
 
+        self.backlog_manager.set_change_listener(None)
+
         if self._task:
             self._task.cancel()
             try:
@@ -77,23 +119,71 @@ class TimeMonitor:
 
         logger.info("🕐 TimeMonitor stopped")
 
-    async def _monitor_loop(self):
-        """Main monitoring loop - checks for due reminders every 30 seconds."""
-        check_interval = 30  # seconds
+    def notify_backlog_changed(self):
+        """
+        Wake the monitor loop so it re-plans around added/completed items.
+
+        Safe to call from any thread.
+        """
+        if self._loop and self._running:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    @property
+    def last_state(self) -> Optional[Dict[str, Any]]:
+        """
+        Most recent reminder state fetched by the monitor loop.
+
+        Dict with "upcoming", "due" and "next_remind_epoch", or None
+        before the first check.
+        """
+        return self._last_state
+
+    def _get_current_time(self) -> datetime:
+        """Get current client time, falling back to UTC."""
+        if self.time_tracker and self.time_tracker.is_initialized():
+            return self.time_tracker.get_current_client_time()
 
-        logger.info(f"🕐 Monitor loop started (checking every {check_interval}s)")
+        return datetime.utcnow()
+
+    async def _monitor_loop(self):
+        """
+        Main monitoring loop - sleeps until the next reminder is due,
+        or until the backlog changes.
+        """
+        logger.info(
+            f"🕐 Monitor loop started (checking at least every {self.MAX_SLEEP_SECONDS}s)"
+        )
 
         while self._running:
+            # Clear before checking so changes made during the check aren't lost
+            self._wakeup.clear()
+
+            sleep_seconds = self.MAX_SLEEP_SECONDS
+
             try:
-                await self._check_and_announce_reminders()
+                seconds_until_next = await self._check_and_announce_reminders()
+
+                if seconds_until_next is not None:
+                    sleep_seconds = min(
+                        max(seconds_until_next, self.MIN_SLEEP_SECONDS),
+                        self.MAX_SLEEP_SECONDS,
+                    )
             except Exception as e:
                 logger.error(f"Error in monitor loop: {e}", exc_info=True)
 
-            # Wait before next check
-            await asyncio.sleep(check_interval)
+            # Wait until the next reminder or a backlog change
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=sleep_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _check_and_announce_reminders(self) -> Optional[float]:
+        """
+        Check for due reminders and announce them.
 
-    async def _check_and_announce_reminders(self):
-        """Check for due reminders and announce them."""
+        Returns:
+            Seconds until the next reminder, or None if nothing is upcoming
+        """
         try:
             # Get current client time
             if self.time_tracker and self.time_tracker.is_initialized():
@@ -103,23 +193,37 @@ class TimeMonitor:
                 current_time = datetime.utcnow()
                 logger.warning("Time tracker not initialized, using UTC")
 
-            # Get due reminders
-            due_items = self.backlog_manager.get_due_reminders(
-                self.user_id, current_time
+            # Get upcoming items, due reminders and when the next one is
+            # (blocking boto3 call - run it off the event loop)
+            state = await asyncio.to_thread(
+                self.backlog_manager.fetch_user_state,
+                self.user_id,
+                current_time,
             )
 
-            if not due_items:
-                return  # Nothing due
+            self._last_state = state
 
-            logger.info(f"⏰ Found {len(due_items)} due reminder(s)")
+            due_items = state["due"]
 
-            # Announce each reminder
-            for item in due_items:
-                await self._announce_reminder(item)
+            next_remind_epoch = state["next_remind_epoch"]
+
+            if due_items:
+                logger.info(f"⏰ Found {len(due_items)} due reminder(s)")
+
+                # Announce each reminder
+                for item in due_items:
+                    await self._announce_reminder(item)
+
+            if next_remind_epoch is None:
+                return None
+
+            return next_remind_epoch - self._get_current_time().timestamp()
 
         except Exception as e:
             logger.error(f"Error checking reminders: {e}", exc_info=True)
 
+            return None
+
     async def _announce_reminder(self, item: dict):
         """
         Announce a reminder to the user.
@@ -130,9 +234,7 @@ class TimeMonitor:
         try:
             title = item.get("title", "something")
 
-            scheduled_time = datetime.fromisoformat(item["scheduled_time"])
-
-            time_display = scheduled_time.strftime("%I:%M %p").lstrip("0")
+            scheduled_epoch = BacklogManager.get_scheduled_epoch(item)
 
             # Build announcement message
             announcement = f"Reminder: {title}"
@@ -141,32 +243,17 @@ class TimeMonitor:
             remind_before = int(item.get("remind_before_minutes", 0))
 
             if remind_before > 0:
-                if self.time_tracker and self.time_tracker.is_initialized():
-                    current_time = self.time_tracker.get_current_client_time()
+                current_time = self._get_current_time()
 
-                else:
-                    current_time = datetime.utcnow()
-
-                time_until = scheduled_time - current_time
+                seconds_until = scheduled_epoch - current_time.timestamp()
 
-                minutes_until = int(time_until.total_seconds() / 60)
+                minutes_until = int(seconds_until / 60)
 
                 if minutes_until > 5:
                     # Early warning
-                    if minutes_until >= 60:
-
-                        hours = minutes_until // 60
-
-                        mins = minutes_until % 60
-
-                        if mins > 0:
-                            time_desc = f"{hours} hour{'s' if hours > 1 else ''} and {mins} minutes"
-
-                        else:
-                            time_desc = f"{hours} hour{'s' if hours > 1 else ''}"
+                    time_desc = _format_time_desc(minutes_until)
 
-                    else:
-                        time_desc = f"{minutes_until} minutes"
+                    time_display = BacklogManager.get_display_time(item)
 
                     announcement = (
                         f"Reminder: {title} in {time_desc} (at {time_display})"
@@ -193,8 +280,10 @@ class TimeMonitor:
                 logger.error("Session not available, cannot announce reminder")
 
             # Update last_reminded_at timestamp
-            self.backlog_manager.update_reminded_timestamp(
-                self.user_id, item["item_id"]
+            await asyncio.to_thread(
+                self.backlog_manager.update_reminded_timestamp,
+                self.user_id,
+                item["item_id"],
             )
 
             logger.info(
@@ -2,16 +2,39 @@ import os
 import logging
 import asyncio
 import json
-from datetime import datetime
-from typing import List, Dict, Any, Optional
-from firebase_admin import credentials, firestore
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, Set
+from firebase_admin import credentials, firestore, firestore_async
 import firebase_admin
 
 logger = logging.getLogger(__name__)
 
 
 class FirebaseClient:
-    """Service class for handling Firebase Firestore operations for Nova Sonic chat history."""
+    """
+    Service class for handling Firebase Firestore operations for Nova Sonic chat history.
+
+    History queries filter on userId and order on timestamp server-side, which
+    needs a composite index on the messages collection:
+
+        gcloud firestore indexes composite create --collection-group=messages \
+            --field-config=field-path=userId,order=ascending \
+            --field-config=field-path=timestamp,order=descending
+    """
+
+    # Firestore limit on writes per batch commit
+    MAX_BATCH_WRITES = 500
+
+    # Sentinel for server-assigned write times, bound once
+    _SERVER_TIMESTAMP = firestore.SERVER_TIMESTAMP
+
+    # Buffered message writes (see queue_message)
+    FLUSH_INTERVAL_SECONDS = 0.1
+    FLUSH_BATCH_SIZE = 10
+
+    # Failed batches are re-queued this many times before being dropped
+    MAX_FLUSH_RETRIES = 3
+    FLUSH_RETRY_DELAY_SECONDS = 1.0
 
     def __init__(self, credentials_path=None):
         """Initialize Firebase with the provided credentials."""
@@ -42,6 +65,20 @@ class FirebaseClient:
             firebase_admin.initialize_app(cred)
 
         self.db = firestore.client()
+
+        # Native asyncio client (same app/credentials) for use on the event loop
+        self.async_db = firestore_async.client()
+
+        self._pending_messages: List[Dict[str, Any]] = []
+        # Scheduled delayed flush, if any
+        self._flush_task: Optional[asyncio.Task] = None
+        # Strong references to running flushes so they aren't garbage collected
+        self._flush_tasks: Set[asyncio.Task] = set()
+        # Consecutive failed commits, reset by a successful one
+        self._failed_flushes = 0
+        # Set by close(); retries are then run by close() itself
+        self._closing = False
+
         logger.info("Firebase initialized successfully")
 
     def add_message(self, user_id: str, role: str, content: str) -> bool:
@@ -51,7 +88,7 @@ class FirebaseClient:
                 "userId": user_id,
                 "role": role.upper(),
                 "content": content,
-                "timestamp": firestore.SERVER_TIMESTAMP,
+                "timestamp": self._SERVER_TIMESTAMP,
             }
 
             # Log what we're about to save
@@ -74,32 +111,160 @@ class FirebaseClient:
             logger.error(f"Error adding message to Firestore: {e}")
             return False
 
+    def queue_message(self, user_id: str, role: str, content: str):
+        """
+        Buffer a message and write it with the next batch commit.
+
+        Batches are committed every FLUSH_INTERVAL_SECONDS, or as soon as
+        FLUSH_BATCH_SIZE messages are pending. Must be called from the event
+        loop; use add_message for an immediate write.
+
+        Messages carry their queue time rather than SERVER_TIMESTAMP, since
+        every write in a batch would get the same server timestamp and lose
+        its order.
+        """
+        self._pending_messages.append(
+            {
+                "userId": user_id,
+                "role": role.upper(),
+                "content": content,
+                "timestamp": datetime.now(timezone.utc),
+            }
+        )
+
+        if len(self._pending_messages) >= self.FLUSH_BATCH_SIZE:
+            self._spawn_flush(self.flush())
+
+        else:
+            self._schedule_flush(self.FLUSH_INTERVAL_SECONDS)
+
+    def _spawn_flush(self, coro) -> asyncio.Task:
+        """Run a flush coroutine as a task, holding a reference until it finishes."""
+        task = asyncio.create_task(coro)
+
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+        return task
+
+    def _schedule_flush(self, delay: float):
+        """Schedule a delayed flush unless one is already pending."""
+        if self._closing:
+            return
+
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = self._spawn_flush(self._flush_after_delay(delay))
+
+    async def _flush_after_delay(self, delay: float):
+        """Commit pending messages once the flush window has passed."""
+        await asyncio.sleep(delay)
+
+        # Let the flush schedule a retry if it fails
+        self._flush_task = None
+
+        await self.flush()
+
+    async def flush(self) -> bool:
+        """
+        Commit all pending messages in batch writes.
+
+        A failed batch goes back to the front of the queue and is retried
+        after FLUSH_RETRY_DELAY_SECONDS, up to MAX_FLUSH_RETRIES times in a
+        row before it is dropped.
+        """
+        while self._pending_messages:
+            messages = self._pending_messages[: self.MAX_BATCH_WRITES]
+            del self._pending_messages[: len(messages)]
+
+            try:
+                collection = self.async_db.collection("messages")
+
+                batch = self.async_db.batch()
+                for message_data in messages:
+                    batch.set(collection.document(), message_data)
+
+                await batch.commit()
+
+            except Exception as e:
+                self._failed_flushes += 1
+
+                if self._failed_flushes > self.MAX_FLUSH_RETRIES:
+                    logger.error(
+                        f"Dropping {len(messages)} messages after "
+                        f"{self.MAX_FLUSH_RETRIES} failed retries: {e}"
+                    )
+                    self._failed_flushes = 0
+
+                else:
+                    logger.warning(
+                        f"Error flushing {len(messages)} messages to Firestore "
+                        f"(retry {self._failed_flushes}/{self.MAX_FLUSH_RETRIES}): {e}"
+                    )
+                    # Ahead of anything queued since, keeping write order
+                    self._pending_messages[:0] = messages
+                    self._schedule_flush(self.FLUSH_RETRY_DELAY_SECONDS)
+
+                return False
+
+            self._failed_flushes = 0
+
+        return True
+
+    async def close(self) -> bool:
+        """
+        Write out every buffered message before shutdown.
+
+        Cancels the pending delayed flush, waits for flushes that already
+        took a batch off the queue (a failed one puts it back), then drains
+        the queue, retrying failed batches up to MAX_FLUSH_RETRIES times.
+
+        Returns:
+            False if a batch was dropped during the final drain
+        """
+        self._closing = True
+
+        if self._flush_task is not None:
+            # Still in its delay - the messages it would write are queued
+            self._flush_task.cancel()
+            self._flush_task = None
+
+        while running := [task for task in self._flush_tasks if not task.done()]:
+            await asyncio.gather(*running, return_exceptions=True)
+
+        dropped = False
+
+        while self._pending_messages:
+            if await self.flush():
+                break
+
+            if self._failed_flushes == 0:
+                # Dropped after its last retry; keep draining the rest
+                dropped = True
+            else:
+                await asyncio.sleep(self.FLUSH_RETRY_DELAY_SECONDS)
+
+        return not dropped
+
     async def get_history(self, user_id: str, limit: int = 50):
         """Get recent chat history for a user"""
         try:
             # ✅ Order and limit on server-side
             messages_ref = (
-                self.db.collection("messages")
+                self.async_db.collection("messages")
                 .where(filter=firestore.FieldFilter("userId", "==", user_id))
                 .order_by(
                     "timestamp", direction=firestore.Query.DESCENDING
                 )  # Newest first
                 .limit(limit)
+                .select(["role", "content"])  # Only fetch the fields we return
             )
 
-            docs = await asyncio.to_thread(lambda: list(messages_ref.stream()))
-
             messages = []
-            for doc in docs:
+            async for doc in messages_ref.stream():
                 data = doc.to_dict()
-                messages.append(
-                    {
-                        "role": data["role"],
-                        "content": data["content"],
-                    }
-                )
+                messages.append({"role": data["role"], "content": data["content"]})
 
-            # Reverse to chronological order (oldest first)
+            # Reverse newest-first results into chronological order (oldest first)
             messages.reverse()
 
             logger.info(f"Retrieved {len(messages)} messages for user {user_id}")
@@ -118,17 +283,16 @@ class FirebaseClient:
 
             # ✅ Filter on Firestore server, not in Python
             messages_ref = (
-                self.db.collection("messages")
+                self.async_db.collection("messages")
                 .where(filter=firestore.FieldFilter("userId", "==", user_id))
                 .where(filter=firestore.FieldFilter("timestamp", ">=", cutoff_time))
                 .order_by("timestamp")  # Sort server-side
                 .limit(100)  # Reasonable limit
+                .select(["role", "content", "timestamp"])
             )
 
-            docs = await asyncio.to_thread(lambda: list(messages_ref.stream()))
-
             messages = []
-            for doc in docs:
+            async for doc in messages_ref.stream():
                 data = doc.to_dict()
                 messages.append(
                     {
@@ -148,20 +312,34 @@ class FirebaseClient:
             return []
 
     async def delete_user_history(self, user_id: str) -> bool:
-        """Delete all messages for a user (for testing/cleanup)"""
+        """
+        Delete all messages for a user (for testing/cleanup).
+
+        Reads at most MAX_BATCH_WRITES document references (no fields) per
+        round and deletes them in one batch commit, so memory stays bounded
+        however long the history is.
+        """
         try:
-            messages_ref = self.db.collection("messages").where(
-                filter=firestore.FieldFilter("userId", "==", user_id)
+            page = (
+                self.async_db.collection("messages")
+                .where(filter=firestore.FieldFilter("userId", "==", user_id))
+                .select([])
+                .limit(self.MAX_BATCH_WRITES)
             )
 
-            # Wrap blocking stream() call in asyncio.to_thread to avoid blocking event loop
-            docs = await asyncio.to_thread(lambda: list(messages_ref.stream()))
-
             deleted_count = 0
-            for doc in docs:
-                # Wrap blocking delete() call
-                await asyncio.to_thread(doc.reference.delete)
-                deleted_count += 1
+            while True:
+                batch = self.async_db.batch()
+                page_count = 0
+                async for doc in page.stream():
+                    batch.delete(doc.reference)
+                    page_count += 1
+
+                if page_count == 0:
+                    break
+
+                await batch.commit()
+                deleted_count += page_count
 
             logger.info(f"Deleted {deleted_count} messages for user {user_id}")
             return True
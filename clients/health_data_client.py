@@ -4,29 +4,122 @@ Health Data Client - Handles encrypted health data from DynamoDB.
 
 import os
 import json
+import asyncio
 import logging
+import time
 import base64
-from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+import stat
+import tempfile
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 import boto3
-from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.conditions import Key, Attr
 from botocore.exceptions import ClientError
-from cryptography.hazmat.primitives.ciphers import Cipher, algorithms
-from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+import numpy as np
 import requests
 from dotenv import load_dotenv
 
+# orjson parses bytes faster when installed; its JSONDecodeError subclasses json's
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
 load_dotenv(".env.local")
 load_dotenv(".env.secrets")
 
 logger = logging.getLogger(__name__)
 
+# Payload size above which numpy's vectorized XOR beats big-int XOR
+NUMPY_XOR_MIN_BYTES = 1024
+
+# Shared session so repeated key fetches reuse the pooled TLS connection
+_http = requests.Session()
+
+
+def _default_key_cache_path() -> str:
+    """Key cache file in the user's private cache directory (not shared /tmp)."""
+    cache_home = os.getenv("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+
+    return os.path.join(cache_home, "voice_command_agent", "health_key.cache")
+
+
+def _is_private(st: os.stat_result) -> bool:
+    """True if owned by this user and not accessible to group or others."""
+    return st.st_uid == os.getuid() and st.st_mode & 0o077 == 0
+
+
+def _recent_window(hours_back: int) -> Tuple[str, str]:
+    """
+    Get ISO (start, end) timestamps for the last `hours_back` hours.
+
+    The window ends at the close of the current UTC minute, so it's cached
+    per minute instead of rebuilding datetimes and ISO strings on every query.
+
+    Args:
+        hours_back: Window length in hours
+
+    Returns:
+        Tuple of (start ISO timestamp, end ISO timestamp)
+    """
+    return _window_for_minute(hours_back, int(time.time()) // 60)
+
+
+@lru_cache(maxsize=16)
+def _window_for_minute(hours_back: int, epoch_minute: int) -> Tuple[str, str]:
+    """Build the (start, end) ISO window ending at the close of an epoch minute."""
+    # Naive UTC, matching the datetime.utcnow() timestamps used elsewhere
+    end_time = datetime.fromtimestamp((epoch_minute + 1) * 60, timezone.utc)
+    end_time = end_time.replace(tzinfo=None)
+    start_time = end_time - timedelta(hours=hours_back)
+
+    return start_time.isoformat(), end_time.isoformat()
+
+
+def _xor_bytes(data: bytes, keystream: bytes) -> bytes:
+    """
+    XOR data with the start of a keystream.
+
+    Large payloads use numpy's SIMD XOR; small ones XOR as
+    big ints, which avoids numpy's per-call overhead.
+
+    Args:
+        data: Bytes to XOR
+        keystream: Keystream at least as long as data
+
+    Returns:
+        data XOR keystream[:len(data)]
+    """
+    length = len(data)
+
+    if length >= NUMPY_XOR_MIN_BYTES:
+        return np.bitwise_xor(
+            np.frombuffer(data, dtype=np.uint8),
+            np.frombuffer(keystream, dtype=np.uint8, count=length),
+        ).tobytes()
+
+    return (
+        int.from_bytes(data, "little") ^ int.from_bytes(keystream[:length], "little")
+    ).to_bytes(length, "little")
+
 
 class HealthDataClient:
     """Client for reading and decrypting health data from DynamoDB."""
 
     TABLE_NAME = "health_data"
-    IV_KEY = "aBcDeFgHiJkLmNoP"  # Static IV from Dart code
+    # Static IV from Dart code. Every record reuses the same key and IV, so
+    # they share one CTR keystream - insecure (XOR of two ciphertexts leaks
+    # the XOR of their plaintexts), but it's what the app writes today and
+    # what lets _get_keystream precompute decryption.
+    IV_KEY = "aBcDeFgHiJkLmNoP"
+    KEY_CACHE_TTL_SECONDS = 3600
+    QUERY_CACHE_TTL_SECONDS = 60
+    QUERY_CACHE_SIZE = 1024
+    LATEST_METRIC_PAGE_SIZE = 25
+    # Keystream generated up front when the key loads (longer records grow it)
+    KEYSTREAM_PRELOAD_BYTES = 64 * 1024
 
     def __init__(self, dynamodb_resource=None):
         """Initialize HealthDataClient."""
@@ -42,32 +135,53 @@ class HealthDataClient:
 
         self.table = self.dynamodb.Table(self.TABLE_NAME)
         self._encryption_key = None
+        self._key_bytes = None
+        self._iv_bytes = self.IV_KEY.encode("utf-8")
+        self._aes_algorithm = None
+        self._aes_key = None
+        self._ctr_mode = modes.CTR(self._iv_bytes)
+        # (key_bytes, keystream) - see _get_keystream
+        self._keystream_cache = (None, b"")
         self._lambda_url = os.getenv("HEALTH_ENCRYPTION_LAMBDA_URL")
+        self._key_cache_path = (
+            os.getenv("HEALTH_KEY_CACHE_PATH") or _default_key_cache_path()
+        )
+        # (user_id, hours_back, metric_type) -> (expires_at, decrypted items)
+        self._query_cache: Dict[tuple, tuple] = {}
 
         logger.info(f"HealthDataClient initialized with table: {self.TABLE_NAME}")
 
     def _get_encryption_key(self) -> str:
         """
         Get encryption key from Lambda function.
-        Caches the key to avoid repeated Lambda calls.
+        Caches the key in memory and in a local file (with a TTL) so new
+        processes don't have to call the Lambda on their first query.
         """
         if self._encryption_key:
             return self._encryption_key
 
+        cached_key = self._read_cached_key()
+        if cached_key:
+            self._set_encryption_key(cached_key)
+            return self._encryption_key
+
         if not self._lambda_url:
             raise ValueError(
                 "HEALTH_ENCRYPTION_LAMBDA_URL not set in environment variables"
             )
 
         try:
-            response = requests.get(self._lambda_url, timeout=5)
+            response = _http.get(self._lambda_url, timeout=5)
             response.raise_for_status()
             data = response.json()
-            self._encryption_key = data.get("key")
+            encryption_key = data.get("key")
 
-            if not self._encryption_key:
+            if not encryption_key:
                 raise ValueError("No encryption key in Lambda response")
 
+            self._set_encryption_key(encryption_key)
+            self._write_cached_key(encryption_key)
+
             logger.info("✅ Encryption key retrieved from Lambda")
             return self._encryption_key
 
@@ -75,73 +189,362 @@ class HealthDataClient:
             logger.error(f"Failed to get encryption key from Lambda: {e}")
             raise
 
-    def _decrypt_data(self, encrypted_base64: str, encryption_key: str) -> dict:
+    def _set_encryption_key(self, encryption_key: str):
+        """Store the key, encoded once so decrypts don't re-encode per item."""
+        self._encryption_key = encryption_key
+        self._key_bytes = encryption_key.encode("utf-8")
+
+        # Pay the AES cost once per key instead of on the first queries
+        self._get_keystream(self._key_bytes, self.KEYSTREAM_PRELOAD_BYTES)
+
+    def _read_cached_key(self) -> Optional[str]:
         """
-        Decrypt health data using AES-CTR encryption (matching Dart's default).
+        Read the encryption key from the file cache if it hasn't expired.
 
-        Args:
-            encrypted_base64: Base64-encoded encrypted data
-            encryption_key: Encryption key from Lambda
+        The file is opened without following symlinks and is only trusted if
+        it's a regular file owned by this user with owner-only permissions.
 
         Returns:
-            Decrypted data as dictionary
+            Cached key, or None if missing, expired, unreadable or untrusted
         """
         try:
-            from cryptography.hazmat.primitives.ciphers import modes
+            fd = os.open(self._key_cache_path, os.O_RDONLY | os.O_NOFOLLOW)
+        except OSError:
+            return None
 
-            # Prepare key and IV
-            key = encryption_key.encode("utf-8")
-            iv = self.IV_KEY.encode("utf-8")
+        with os.fdopen(fd, "r", encoding="utf-8") as f:
+            st = os.fstat(f.fileno())
 
-            # Decode base64
-            encrypted_bytes = base64.b64decode(encrypted_base64)
+            if not stat.S_ISREG(st.st_mode) or not _is_private(st):
+                logger.warning(
+                    f"Ignoring key cache {self._key_cache_path}: "
+                    "not a private file owned by this user"
+                )
+                return None
 
-            # Create cipher with CTR mode
-            cipher = Cipher(
-                algorithms.AES(key), modes.CTR(iv), backend=default_backend()
-            )
-            decryptor = cipher.decryptor()
+            if time.time() - st.st_mtime > self.KEY_CACHE_TTL_SECONDS:
+                return None
 
-            # Decrypt
-            decrypted_bytes = decryptor.update(encrypted_bytes) + decryptor.finalize()
+            try:
+                return f.read().strip() or None
+            except (OSError, UnicodeDecodeError):
+                return None
 
-            # 🆕 Strip trailing null bytes and whitespace
-            decrypted_bytes = decrypted_bytes.rstrip(
-                b"\x00\x01\x02\x03\x04\x05\x06\x07\x08\x09\x0a\x0b\x0c\x0d\x0e\x0f"
-            )
-            decrypted_bytes = decrypted_bytes.rstrip()
+    def _write_cached_key(self, encryption_key: str):
+        """
+        Write the encryption key to the file cache (owner-only permissions).
 
-            # Parse JSON
-            decrypted_json = decrypted_bytes.decode("utf-8")
+        The cache directory is created 0700 and must stay private to this
+        user; the key goes through a mkstemp file (O_EXCL, 0600) and an
+        atomic rename. Failures are logged and ignored - the cache is only
+        an optimization.
+        """
+        cache_dir = os.path.dirname(self._key_cache_path) or "."
+        tmp_path = None
 
-            # 🆕 Find where JSON actually ends
-            # Sometimes there's garbage after the closing }
-            try:
-                # Try to parse as-is first
-                return json.loads(decrypted_json)
-            except json.JSONDecodeError as e:
-                # If it fails, try to find the last valid JSON object
+        try:
+            os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+
+            dir_stat = os.lstat(cache_dir)
+            if not stat.S_ISDIR(dir_stat.st_mode) or not _is_private(dir_stat):
                 logger.warning(
-                    f"JSON has extra data, attempting to extract valid JSON: {e}"
+                    f"Not caching encryption key: {cache_dir} is not a private "
+                    "directory owned by this user"
                 )
+                return
+
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=".health_key.")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(encryption_key)
+
+            # Atomic rename so concurrent readers never see a partial key
+            os.replace(tmp_path, self._key_cache_path)
+            tmp_path = None
 
-                # Find the last closing brace
-                last_brace = decrypted_json.rfind("}")
-                if last_brace != -1:
-                    clean_json = decrypted_json[: last_brace + 1]
-                    return json.loads(clean_json)
-                else:
-                    raise
+        except OSError as e:
+            logger.warning(f"Failed to cache encryption key: {e}")
+
+        finally:
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+
+    def _get_aes_algorithm(self, key_bytes: bytes) -> algorithms.AES:
+        """
+        Get the AES algorithm for a key, building it only when the key changes.
+
+        Args:
+            key_bytes: UTF-8 encoded encryption key
+
+        Returns:
+            AES algorithm instance
+        """
+        if self._aes_algorithm is None or self._aes_key != key_bytes:
+            self._aes_algorithm = algorithms.AES(key_bytes)
+            self._aes_key = key_bytes
+
+        return self._aes_algorithm
+
+    def _get_keystream(self, key_bytes: bytes, length: int) -> bytes:
+        """
+        Get at least `length` bytes of CTR keystream for the static IV.
+
+        Every item is encrypted with the same key and IV, so they all share
+        one keystream. It's generated once per key and grown on demand,
+        which turns each decrypt into an XOR instead of a cipher setup.
+
+        Args:
+            key_bytes: UTF-8 encoded encryption key
+            length: Minimum keystream length in bytes
+
+        Returns:
+            Keystream bytes (may be longer than requested)
+        """
+        cached_key, keystream = self._keystream_cache
+
+        if cached_key != key_bytes or len(keystream) < length:
+            # Grow geometrically so a run of longer items doesn't rebuild each time
+            if cached_key == key_bytes:
+                length = max(length, 2 * len(keystream))
+
+            encryptor = Cipher(
+                self._get_aes_algorithm(key_bytes), self._ctr_mode
+            ).encryptor()
+            keystream = encryptor.update(bytes(length)) + encryptor.finalize()
+
+            # Swap in one assignment so decrypt threads never see a mismatched pair
+            self._keystream_cache = (key_bytes, keystream)
+
+        return keystream
+
+    def _decrypt_data(self, encrypted_base64: str, key_bytes: bytes) -> dict:
+        """
+        Decrypt health data using AES-CTR encryption (matching Dart's default).
+
+        Args:
+            encrypted_base64: Base64-encoded encrypted data
+            key_bytes: UTF-8 encoded encryption key (see _get_encryption_key)
+
+        Returns:
+            Decrypted data as dictionary
+        """
+        try:
+            # Decode base64
+            encrypted_bytes = base64.b64decode(encrypted_base64)
+
+            # CTR decryption is ciphertext XOR keystream
+            keystream = self._get_keystream(key_bytes, len(encrypted_bytes))
+            decrypted_bytes = _xor_bytes(encrypted_bytes, keystream)
+
+            # CTR output can carry trailing padding/garbage after the
+            # closing }, so cut at the last brace in a single scan
+            json_end = decrypted_bytes.rfind(b"}") + 1
+            if json_end == 0:
+                raise json.JSONDecodeError(
+                    "No closing brace in decrypted data",
+                    decrypted_bytes.decode("utf-8", errors="replace"),
+                    0,
+                )
+
+            # Both parsers accept UTF-8 bytes directly
+            return json_loads(decrypted_bytes[:json_end])
 
         except json.JSONDecodeError as e:
             logger.error(f"JSON decode failed: {e}")
-            logger.error(f"Decrypted string (first 500 chars): {decrypted_json[:500]}")
-            logger.error(f"Decrypted string (last 100 chars): {decrypted_json[-100:]}")
+            logger.error(f"Decrypted string (first 500 chars): {e.doc[:500]}")
+            logger.error(f"Decrypted string (last 100 chars): {e.doc[-100:]}")
             raise
         except Exception as e:
             logger.error(f"Decryption failed: {e}")
             raise
 
+    def _decrypt_items(
+        self, items: List[Dict[str, Any]], key_bytes: bytes
+    ) -> List[Dict[str, Any]]:
+        """
+        Decrypt DynamoDB items, skipping any that fail.
+
+        Runs inline: each decrypt is a keystream XOR plus a JSON parse, both
+        GIL-bound, so a thread pool only adds hand-off overhead.
+
+        Args:
+            items: Raw DynamoDB items with encrypted_data
+            key_bytes: UTF-8 encoded encryption key
+
+        Returns:
+            List of decrypted data dictionaries (input order, failures dropped)
+        """
+        decrypted_items = []
+        for item in items:
+            try:
+                decrypted_items.append(
+                    self._decrypt_data(item["encrypted_data"], key_bytes)
+                )
+
+            except Exception as e:
+                logger.error(f"Failed to decrypt item {item.get('timestamp')}: {e}")
+
+        return decrypted_items
+
+    def _query_pages(
+        self,
+        user_id: str,
+        start_iso: str,
+        end_iso: str,
+        metric_type: Optional[str] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Query encrypted health records for a user within a time range,
+        following LastEvaluatedKey past DynamoDB's 1MB page limit.
+
+        Args:
+            user_id: Elderly user ID
+            start_iso: Range start (ISO timestamp)
+            end_iso: Range end (ISO timestamp)
+            metric_type: Optional filter by type
+
+        Yields:
+            Raw DynamoDB items, one page at a time
+        """
+        query_params = {
+            "KeyConditionExpression": Key("elderly_user_id").eq(user_id)
+            & Key("timestamp").between(start_iso, end_iso),
+            # Everything else is inside encrypted_data
+            "ProjectionExpression": "encrypted_data, #ts",
+            "ExpressionAttributeNames": {"#ts": "timestamp"},
+        }
+
+        # Add type filter if specified (evaluated before projection)
+        if metric_type:
+            query_params["FilterExpression"] = Attr("type").eq(metric_type)
+
+        while True:
+            response = self.table.query(**query_params)
+
+            yield response.get("Items", [])
+
+            if "LastEvaluatedKey" not in response:
+                return
+
+            query_params["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    def _query_items(
+        self,
+        user_id: str,
+        start_iso: str,
+        end_iso: str,
+        metric_type: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Query all encrypted health records for a user within a time range.
+
+        Args:
+            user_id: Elderly user ID
+            start_iso: Range start (ISO timestamp)
+            end_iso: Range end (ISO timestamp)
+            metric_type: Optional filter by type
+
+        Returns:
+            Raw DynamoDB items
+        """
+        return [
+            item
+            for page in self._query_pages(user_id, start_iso, end_iso, metric_type)
+            for item in page
+        ]
+
+    def _query_and_decrypt(
+        self,
+        user_id: str,
+        start_iso: str,
+        end_iso: str,
+        metric_type: Optional[str] = None,
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Query and decrypt health records one page at a time.
+
+        Requires the encryption key to have been fetched.
+
+        Args:
+            user_id: Elderly user ID
+            start_iso: Range start (ISO timestamp)
+            end_iso: Range end (ISO timestamp)
+            metric_type: Optional filter by type
+
+        Returns:
+            Tuple of (records retrieved, decrypted items sorted most recent first)
+        """
+        record_count = 0
+        decrypted_items = []
+        for page in self._query_pages(user_id, start_iso, end_iso, metric_type):
+            record_count += len(page)
+            decrypted_items.extend(self._decrypt_items(page, self._key_bytes))
+
+        # Sort by timestamp descending (most recent first)
+        decrypted_items.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
+
+        return record_count, decrypted_items
+
+    def _decrypt_sorted(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Decrypt items and sort them most recent first.
+
+        Requires the encryption key to have been fetched.
+
+        Args:
+            items: Raw DynamoDB items
+
+        Returns:
+            Decrypted items sorted by timestamp descending
+        """
+        decrypted_items = self._decrypt_items(items, self._key_bytes)
+
+        # Sort by timestamp descending (most recent first)
+        decrypted_items.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
+
+        return decrypted_items
+
+    def _get_cached_query(self, cache_key: tuple) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get a cached get_health_data result if it hasn't expired.
+
+        Args:
+            cache_key: (user_id, hours_back, metric_type)
+
+        Returns:
+            Copy of the cached items, or None on a miss
+        """
+        entry = self._query_cache.get(cache_key)
+        if entry is None:
+            return None
+
+        expires_at, items = entry
+        if time.monotonic() >= expires_at:
+            self._query_cache.pop(cache_key, None)
+            return None
+
+        return list(items)
+
+    def _set_cached_query(self, cache_key: tuple, items: List[Dict[str, Any]]):
+        """
+        Cache a get_health_data result, evicting the oldest entry when full.
+
+        Args:
+            cache_key: (user_id, hours_back, metric_type)
+            items: Decrypted items
+        """
+        self._query_cache.pop(cache_key, None)
+
+        if len(self._query_cache) >= self.QUERY_CACHE_SIZE:
+            self._query_cache.pop(next(iter(self._query_cache)), None)
+
+        self._query_cache[cache_key] = (
+            time.monotonic() + self.QUERY_CACHE_TTL_SECONDS,
+            list(items),
+        )
+
     def get_health_data(
         self,
         user_id: str,
@@ -161,49 +564,86 @@ class HealthDataClient:
             {id, type, value, unit, timestamp, dateFrom, dateTo,
              source, deviceId, deviceName, metadata}
         """
+        # Health data is append-only, so a short-lived cached result is fine
+        cache_key = (user_id, hours_back, metric_type)
+        cached = self._get_cached_query(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            # Get encryption key
-            encryption_key = self._get_encryption_key()
+            # Get encryption key (encoded once for all items)
+            self._get_encryption_key()
 
             # Calculate time range
-            end_time = datetime.utcnow()
-            start_time = end_time - timedelta(hours=hours_back)
+            start_iso, end_iso = _recent_window(hours_back)
 
-            # Query DynamoDB
-            query_params = {
-                "KeyConditionExpression": Key("elderly_user_id").eq(user_id)
-                & Key("timestamp").between(start_time.isoformat(), end_time.isoformat())
-            }
+            record_count, decrypted_items = self._query_and_decrypt(
+                user_id, start_iso, end_iso, metric_type
+            )
 
-            # Add type filter if specified
-            if metric_type:
-                from boto3.dynamodb.conditions import Attr
+            logger.info(
+                f"Retrieved {record_count} health records for user {user_id} "
+                f"(last {hours_back} hours)"
+            )
 
-                query_params["FilterExpression"] = Attr("type").eq(metric_type)
+            self._set_cached_query(cache_key, decrypted_items)
 
-            response = self.table.query(**query_params)
-            items = response.get("Items", [])
+            return decrypted_items
+
+        except ClientError as e:
+            logger.error(f"DynamoDB query failed: {e}")
+            raise
+
+    async def get_health_data_async(
+        self,
+        user_id: str,
+        hours_back: int = 24,
+        metric_type: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Async version of get_health_data for use from the event loop.
+
+        The Lambda key fetch and the DynamoDB query run concurrently in
+        worker threads, so a cold key fetch doesn't add to query latency.
+        Gather it with other I/O when assembling context, e.g.:
+
+            history, health = await asyncio.gather(
+                firebase_client.get_messages_by_timeframe(user_id, hours=24),
+                health_client.get_health_data_async(user_id, hours_back=24),
+            )
+
+        Args:
+            user_id: Elderly user ID
+            hours_back: How many hours of data to retrieve
+            metric_type: Optional filter by type (heartRate, steps, etc.)
+
+        Returns:
+            List of decrypted health data items (most recent first)
+        """
+        cache_key = (user_id, hours_back, metric_type)
+        cached = self._get_cached_query(cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            # Calculate time range
+            start_iso, end_iso = _recent_window(hours_back)
+
+            _, items = await asyncio.gather(
+                asyncio.to_thread(self._get_encryption_key),
+                asyncio.to_thread(
+                    self._query_items, user_id, start_iso, end_iso, metric_type
+                ),
+            )
 
             logger.info(
                 f"Retrieved {len(items)} health records for user {user_id} "
                 f"(last {hours_back} hours)"
             )
 
-            # Decrypt each item
-            decrypted_items = []
-            for item in items:
-                try:
-                    decrypted_data = self._decrypt_data(
-                        item["encrypted_data"], encryption_key
-                    )
-                    decrypted_items.append(decrypted_data)
-
-                except Exception as e:
-                    logger.error(f"Failed to decrypt item {item.get('timestamp')}: {e}")
-                    continue
+            decrypted_items = await asyncio.to_thread(self._decrypt_sorted, items)
 
-            # Sort by timestamp descending (most recent first)
-            decrypted_items.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
+            self._set_cached_query(cache_key, decrypted_items)
 
             return decrypted_items
 
@@ -224,13 +664,41 @@ class HealthDataClient:
         Returns:
             Latest metric data or None
         """
-        data = self.get_health_data(user_id, hours_back=24, metric_type=metric_type)
+        try:
+            # Get encryption key (encoded once for all items)
+            self._get_encryption_key()
 
-        if not data:
-            return None
+            start_iso, end_iso = _recent_window(24)
+
+            # Newest first, so only the latest matching record is decrypted.
+            # Limit applies before the type filter, so page until one matches.
+            query_params = {
+                "KeyConditionExpression": Key("elderly_user_id").eq(user_id)
+                & Key("timestamp").between(start_iso, end_iso),
+                "FilterExpression": Attr("type").eq(metric_type),
+                "ScanIndexForward": False,
+                "Limit": self.LATEST_METRIC_PAGE_SIZE,
+                "ProjectionExpression": "encrypted_data, #ts",
+                "ExpressionAttributeNames": {"#ts": "timestamp"},
+            }
+
+            while True:
+                response = self.table.query(**query_params)
+
+                # Items are newest first; decrypt until one succeeds
+                for item in response.get("Items", []):
+                    decrypted_items = self._decrypt_items([item], self._key_bytes)
+                    if decrypted_items:
+                        return decrypted_items[0]
+
+                if "LastEvaluatedKey" not in response:
+                    return None
 
-        # Return most recent (already sorted)
-        return data[0]
+                query_params["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+        except ClientError as e:
+            logger.error(f"DynamoDB query failed: {e}")
+            raise
 
     def get_aggregated_metrics(
         self, user_id: str, hours_back: int = 24
@@ -258,30 +726,79 @@ class HealthDataClient:
         """
         all_data = self.get_health_data(user_id, hours_back=hours_back)
 
-        # Group by type
-        metrics_by_type = {}
+        return self._aggregate(all_data)
+
+    async def get_aggregated_metrics_async(
+        self, user_id: str, hours_back: int = 24
+    ) -> Dict[str, Any]:
+        """
+        Async version of get_aggregated_metrics for use from the event loop.
+
+        Args:
+            user_id: Elderly user ID
+            hours_back: Hours of data to analyze
+
+        Returns:
+            Dictionary with aggregated metrics by type
+        """
+        all_data = await self.get_health_data_async(user_id, hours_back=hours_back)
+
+        return self._aggregate(all_data)
+
+    @staticmethod
+    def _aggregate(all_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Aggregate decrypted items by metric type.
+
+        Args:
+            all_data: Decrypted items sorted most recent first
+
+        Returns:
+            Dictionary with latest/average/min/max/count per metric type
+        """
+        # Single pass: accumulate per-type stats without building value lists
+        accumulators = {}
         for item in all_data:
             metric_type = item.get("type")
-            if metric_type not in metrics_by_type:
-                metrics_by_type[metric_type] = []
-            metrics_by_type[metric_type].append(item)
 
-        # Calculate aggregations
-        aggregated = {}
-        for metric_type, items in metrics_by_type.items():
-            values = [
-                item.get("value") for item in items if item.get("value") is not None
-            ]
+            acc = accumulators.get(metric_type)
+            if acc is None:
+                # Unit/source come from the most recent item (already sorted)
+                acc = accumulators[metric_type] = {
+                    "latest": None,
+                    "sum": 0,
+                    "min": None,
+                    "max": None,
+                    "count": 0,
+                    "unit": item.get("unit", ""),
+                    "source": item.get("source", ""),
+                }
 
-            if values:
+            value = item.get("value")
+            if value is None:
+                continue
+
+            if acc["count"] == 0:
+                acc["latest"] = acc["min"] = acc["max"] = value
+            elif value < acc["min"]:
+                acc["min"] = value
+            elif value > acc["max"]:
+                acc["max"] = value
+
+            acc["sum"] += value
+            acc["count"] += 1
+
+        aggregated = {}
+        for metric_type, acc in accumulators.items():
+            if acc["count"]:
                 aggregated[metric_type] = {
-                    "latest": values[0],  # Most recent (already sorted)
-                    "average": sum(values) / len(values),
-                    "min": min(values),
-                    "max": max(values),
-                    "count": len(values),
-                    "unit": items[0].get("unit", ""),
-                    "source": items[0].get("source", ""),
+                    "latest": acc["latest"],
+                    "average": acc["sum"] / acc["count"],
+                    "min": acc["min"],
+                    "max": acc["max"],
+                    "count": acc["count"],
+                    "unit": acc["unit"],
+                    "source": acc["source"],
                 }
 
         logger.info(f"Aggregated {len(aggregated)} metric types")
@@ -301,72 +818,9 @@ class HealthDataClient:
         Returns:
             Dictionary with aggregated metrics by type
         """
-        try:
-            # Get encryption key
-            encryption_key = self._get_encryption_key()
-
-            # Query DynamoDB with absolute date range
-            query_params = {
-                "KeyConditionExpression": Key("elderly_user_id").eq(user_id)
-                & Key("timestamp").between(start_date.isoformat(), end_date.isoformat())
-            }
-
-            response = self.table.query(**query_params)
-            items = response.get("Items", [])
-
-            logger.info(
-                f"Retrieved {len(items)} health records for user {user_id} "
-                f"between {start_date.date()} and {end_date.date()}"
-            )
-
-            # Decrypt each item
-            decrypted_items = []
-            for item in items:
-                try:
-                    decrypted_data = self._decrypt_data(
-                        item["encrypted_data"], encryption_key
-                    )
-                    decrypted_items.append(decrypted_data)
-
-                except Exception as e:
-                    logger.error(f"Failed to decrypt item {item.get('timestamp')}: {e}")
-                    continue
-
-            # Sort by timestamp descending (most recent first)
-            decrypted_items.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-
-            # Group by type
-            metrics_by_type = {}
-            for item in decrypted_items:
-                metric_type = item.get("type")
-                if metric_type not in metrics_by_type:
-                    metrics_by_type[metric_type] = []
-                metrics_by_type[metric_type].append(item)
-
-            # Calculate aggregations
-            aggregated = {}
-            for metric_type, items in metrics_by_type.items():
-                values = [
-                    item.get("value") for item in items if item.get("value") is not None
-                ]
-
-                if values:
-                    aggregated[metric_type] = {
-                        "latest": values[0],  # Most recent
-                        "average": sum(values) / len(values),
-                        "min": min(values),
-                        "max": max(values),
-                        "count": len(values),
-                        "unit": items[0].get("unit", ""),
-                        "source": items[0].get("source", ""),
-                    }
-
-            logger.info(f"Aggregated {len(aggregated)} metric types")
-            return aggregated
+        all_data = self.get_health_data_by_date(user_id, start_date, end_date)
 
-        except ClientError as e:
-            logger.error(f"DynamoDB query failed: {e}")
-            raise
+        return self._aggregate(all_data)
 
     def get_health_data_by_date(
         self,
@@ -388,45 +842,18 @@ class HealthDataClient:
             List of decrypted health data items
         """
         try:
-            # Get encryption key
-            encryption_key = self._get_encryption_key()
-
-            # Query DynamoDB
-            query_params = {
-                "KeyConditionExpression": Key("elderly_user_id").eq(user_id)
-                & Key("timestamp").between(start_date.isoformat(), end_date.isoformat())
-            }
-
-            # Add type filter if specified
-            if metric_type:
-                from boto3.dynamodb.conditions import Attr
+            # Get encryption key (encoded once for all items)
+            self._get_encryption_key()
 
-                query_params["FilterExpression"] = Attr("type").eq(metric_type)
-
-            response = self.table.query(**query_params)
-            items = response.get("Items", [])
+            record_count, decrypted_items = self._query_and_decrypt(
+                user_id, start_date.isoformat(), end_date.isoformat(), metric_type
+            )
 
             logger.info(
-                f"Retrieved {len(items)} health records for user {user_id} "
+                f"Retrieved {record_count} health records for user {user_id} "
                 f"between {start_date.date()} and {end_date.date()}"
             )
 
-            # Decrypt each item
-            decrypted_items = []
-            for item in items:
-                try:
-                    decrypted_data = self._decrypt_data(
-                        item["encrypted_data"], encryption_key
-                    )
-                    decrypted_items.append(decrypted_data)
-
-                except Exception as e:
-                    logger.error(f"Failed to decrypt item {item.get('timestamp')}: {e}")
-                    continue
-
-            # Sort by timestamp descending
-            decrypted_items.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-
             return decrypted_items
 
         except ClientError as e:
@@ -5,11 +5,18 @@ Manages item locations, personal information, and daily activities.
 
 import os
 import json
+import asyncio
 import logging
+import threading
+import time
+from collections import defaultdict
 from datetime import datetime
+from decimal import Decimal
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
 import boto3
 from boto3.dynamodb.conditions import Key
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from openai import OpenAI
 from dotenv import load_dotenv
@@ -19,8 +26,137 @@ from clients.pinecone_client import PineconeClient
 load_dotenv(".env.local")
 load_dotenv(".env.secrets")
 
+# orjson parses legacy JSON-string activity details faster when installed
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+# (epoch_ms, iso string) for the most recent _iso_now() call
+_last_iso_now = (0, "")
+
+
+# Per-thread DynamoDB resource and tables (see get_dynamodb_resource)
+_dynamodb_local = threading.local()
+
+
+@lru_cache(maxsize=1)
+def get_dynamodb_client():
+    """
+    Process-wide low-level DynamoDB client shared by the memory and story clients.
+
+    Clients are thread-safe, so one connection pool, sized for concurrent
+    asyncio.to_thread calls, serves every thread.
+    """
+    return boto3.client(
+        "dynamodb",
+        region_name=os.getenv("AWS_REGION", "us-east-1"),
+        aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
+        aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
+        config=Config(max_pool_connections=50),
+    )
+
+
+@lru_cache(maxsize=1)
+def _dynamodb_resource_class() -> type:
+    """boto3's generated DynamoDB ServiceResource class, built once."""
+    return type(
+        boto3.resource("dynamodb", region_name=os.getenv("AWS_REGION", "us-east-1"))
+    )
+
+
+def get_dynamodb_resource():
+    """
+    DynamoDB resource for the calling thread.
+
+    boto3 resources aren't thread-safe, so each thread (event loop or
+    asyncio.to_thread worker) gets its own, all wrapping the shared
+    get_dynamodb_client() and its connection pool.
+    """
+    resource = getattr(_dynamodb_local, "resource", None)
+
+    if resource is None:
+        resource = _dynamodb_resource_class()(client=get_dynamodb_client())
+
+        _dynamodb_local.resource = resource
+        _dynamodb_local.tables = {}
+
+    return resource
+
+
+def get_dynamodb_table(name: str):
+    """Table resource for the calling thread, cached (Table() costs ~1ms)."""
+    resource = get_dynamodb_resource()
+
+    table = _dynamodb_local.tables.get(name)
+
+    if table is None:
+        table = _dynamodb_local.tables[name] = resource.Table(name)
+
+    return table
+
+
+def _to_dynamo_value(value: Any) -> Any:
+    """
+    Convert floats (rejected by boto3) to Decimal, recursing into containers.
+
+    Args:
+        value: Value destined for a DynamoDB attribute
+
+    Returns:
+        Value boto3 can marshal
+    """
+    if isinstance(value, float):
+        return Decimal(str(value))
+
+    if isinstance(value, dict):
+        return {k: _to_dynamo_value(v) for k, v in value.items()}
+
+    if isinstance(value, (list, tuple)):
+        return [_to_dynamo_value(v) for v in value]
+
+    return value
+
+
+def _parse_details(details: Any) -> Any:
+    """
+    Read activity details stored either as a Map or as a legacy JSON string.
+
+    Args:
+        details: The item's "details" attribute
+
+    Returns:
+        Details dict
+    """
+    if isinstance(details, str):
+        return json_loads(details)
+
+    return details
+
+
+def _iso_now() -> str:
+    """
+    Current local time as an ISO string, formatted once per millisecond.
+
+    Not for sort keys - calls within the same millisecond share a value.
+    """
+    global _last_iso_now
+
+    now_ms = time.time_ns() // 1_000_000
+
+    cached_ms, cached_iso = _last_iso_now
+
+    if cached_ms == now_ms:
+        return cached_iso
+
+    iso = datetime.fromtimestamp(now_ms / 1000).isoformat(timespec="milliseconds")
+
+    _last_iso_now = (now_ms, iso)
+
+    return iso
+
 
 class MemoryClient:
     """Client for managing elderly user memory across DynamoDB and Pinecone."""
@@ -35,52 +171,102 @@ class MemoryClient:
     # Pinecone index
     PINECONE_INDEX_NAME = "elderly-memory"
 
+    # Activity logs arriving within this window share one BatchWriteItem
+    ACTIVITY_BATCH_WINDOW_SECONDS = 0.05
+
+    # How long find_item results are served from memory
+    ITEM_CACHE_TTL_SECONDS = 60
+
+    # Access counts from recall_information are written back this often
+    ACCESS_FLUSH_INTERVAL_SECONDS = 30
+
     def __init__(self, dynamodb_resource=None):
         """Initialize MemoryClient with DynamoDB and Pinecone."""
 
         # DynamoDB setup
         if dynamodb_resource is None:
-            self.dynamodb = boto3.resource(
-                "dynamodb",
-                region_name=os.getenv("AWS_REGION", "us-east-1"),
-                aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-                aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-            )
+            # Looked up per thread - see get_dynamodb_table
+            self._tables = None
         else:
-            self.dynamodb = dynamodb_resource
+            self._tables = {
+                name: dynamodb_resource.Table(name)
+                for name in (
+                    self.ITEM_LOCATIONS_TABLE,
+                    self.STORED_INFO_TABLE,
+                    self.DAILY_CONTEXT_TABLE,
+                )
+            }
 
-        self.item_table = self.dynamodb.Table(self.ITEM_LOCATIONS_TABLE)
+        self.pinecone_client = PineconeClient()
 
-        self.info_table = self.dynamodb.Table(self.STORED_INFO_TABLE)
+        self._pending_activities: List[Dict[str, Any]] = []
 
-        self.context_table = self.dynamodb.Table(self.DAILY_CONTEXT_TABLE)
+        self._activity_flush: Optional[asyncio.Future] = None
 
-        self.pinecone_client = PineconeClient()
+        # (user_id, item_name) -> (expires_at, item or None if not stored)
+        self._item_cache: Dict[tuple, tuple] = {}
+
+        # (user_id, key) -> accesses / last access time not yet written back
+        self._access_deltas: Dict[tuple, int] = defaultdict(int)
+
+        self._access_times: Dict[tuple, str] = {}
+
+        self._access_flush: Optional[asyncio.Task] = None
 
         logger.info("MemoryClient initialized with DynamoDB and Pinecone")
 
+    def _table(self, name: str):
+        """
+        Table resource usable from the calling thread.
+
+        The table properties resolve per thread, so worker calls look them
+        up inside the worker: asyncio.to_thread(lambda: self.item_table...).
+        """
+        if self._tables is not None:
+            return self._tables[name]
+
+        return get_dynamodb_table(name)
+
+    @property
+    def item_table(self):
+        return self._table(self.ITEM_LOCATIONS_TABLE)
+
+    @property
+    def info_table(self):
+        return self._table(self.STORED_INFO_TABLE)
+
+    @property
+    def context_table(self):
+        return self._table(self.DAILY_CONTEXT_TABLE)
+
     def _get_today_date(self) -> str:
         """Get today's date in YYYY-MM-DD format."""
         return datetime.now().strftime("%Y-%m-%d")
 
-    def store_item_location(
+    async def store_item_location(
         self, user_id: str, item: str, location: str, room: str
     ) -> Dict[str, Any]:
         """Store where user put an item."""
         try:
             item_lower = item.lower().strip()
 
-            timestamp = datetime.now().isoformat()
+            timestamp = _iso_now()
 
-            self.item_table.put_item(
-                Item={
-                    "user_id": user_id,
-                    "item_name": item_lower,
-                    "location": location,
-                    "room": room,
-                    "stored_at": timestamp,
-                    "source": "user_reported",
-                }
+            item_data = {
+                "user_id": user_id,
+                "item_name": item_lower,
+                "location": location,
+                "room": room,
+                "stored_at": timestamp,
+                "source": "user_reported",
+            }
+
+            await asyncio.to_thread(lambda: self.item_table.put_item(Item=item_data))
+
+            # Write through so the next find_item doesn't need DynamoDB
+            self._item_cache[(user_id, item_lower)] = (
+                time.monotonic() + self.ITEM_CACHE_TTL_SECONDS,
+                item_data,
             )
 
             logger.info(f"Stored location for '{item}': {location} ({room})")
@@ -96,18 +282,34 @@ class MemoryClient:
 
             return {"success": False, "error": str(e)}
 
-    def find_item(self, user_id: str, item: str) -> Optional[Dict[str, Any]]:
+    async def find_item(self, user_id: str, item: str) -> Optional[Dict[str, Any]]:
         """Find where an item was last stored."""
         try:
             item_lower = item.lower().strip()
 
-            response = self.item_table.get_item(
-                Key={"user_id": user_id, "item_name": item_lower}
-            )
+            cache_key = (user_id, item_lower)
 
-            if "Item" in response:
-                item_data = response["Item"]
+            now = time.monotonic()
+
+            cached = self._item_cache.get(cache_key)
 
+            if cached and cached[0] > now:
+                item_data = cached[1]
+            else:
+                response = await asyncio.to_thread(
+                    lambda: self.item_table.get_item(
+                        Key={"user_id": user_id, "item_name": item_lower}
+                    )
+                )
+
+                item_data = response.get("Item")
+
+                self._item_cache[cache_key] = (
+                    now + self.ITEM_CACHE_TTL_SECONDS,
+                    item_data,
+                )
+
+            if item_data:
                 logger.info(f"Found '{item}' at {item_data['location']}")
 
                 return {
@@ -127,34 +329,38 @@ class MemoryClient:
 
             return {"found": False, "error": str(e)}
 
-    def store_information(
+    async def store_information(
         self, user_id: str, category: str, key: str, value: str
     ) -> Dict[str, Any]:
         """Store personal information with Pinecone indexing."""
         try:
             key_lower = key.lower().strip()
-            timestamp = datetime.now().isoformat()
-
-            # Store in DynamoDB
-            self.info_table.put_item(
-                Item={
-                    "user_id": user_id,
-                    "key": key_lower,
-                    "category": category,
-                    "value": value,
-                    "created_at": timestamp,
-                    "last_accessed": timestamp,
-                    "access_count": 0,
-                }
-            )
+            timestamp = _iso_now()
 
-            # Generate embedding and store in Pinecone - USE NEW CLIENT
+            # Store in DynamoDB while generating the embedding for Pinecone
             embedding_text = f"{key}: {value}"
-            embedding = self.pinecone_client.generate_embedding(embedding_text)
+
+            _, embedding = await asyncio.gather(
+                asyncio.to_thread(
+                    lambda: self.info_table.put_item(
+                        Item={
+                            "user_id": user_id,
+                            "key": key_lower,
+                            "category": category,
+                            "value": value,
+                            "created_at": timestamp,
+                            "last_accessed": timestamp,
+                            "access_count": 0,
+                        }
+                    )
+                ),
+                self.pinecone_client.generate_embedding_async(embedding_text),
+            )
 
             vector_id = f"{user_id}_{key_lower}"
 
-            self.pinecone_client.upsert(
+            await asyncio.to_thread(
+                self.pinecone_client.upsert,
                 index_name=self.PINECONE_INDEX_NAME,
                 vectors=[
                     (
@@ -178,7 +384,7 @@ class MemoryClient:
             logger.error(f"Failed to store information: {e}")
             return {"success": False, "error": str(e)}
 
-    def recall_information(
+    async def recall_information(
         self, user_id: str, search_key: str
     ) -> Optional[Dict[str, Any]]:
         """
@@ -189,22 +395,17 @@ class MemoryClient:
             key_lower = search_key.lower().strip()
 
             # Step 1: Try exact match in DynamoDB
-            response = self.info_table.get_item(
-                Key={"user_id": user_id, "key": key_lower}
+            response = await asyncio.to_thread(
+                lambda: self.info_table.get_item(
+                    Key={"user_id": user_id, "key": key_lower}
+                )
             )
 
             if "Item" in response:
                 item = response["Item"]
 
-                # Update access tracking
-                self.info_table.update_item(
-                    Key={"user_id": user_id, "key": key_lower},
-                    UpdateExpression="SET last_accessed = :t, access_count = access_count + :inc",
-                    ExpressionAttributeValues={
-                        ":t": datetime.now().isoformat(),
-                        ":inc": 1,
-                    },
-                )
+                # Access tracking is written back in batches (counters are advisory)
+                self._record_access(user_id, key_lower)
 
                 logger.info(f"Found exact match for '{search_key}': {item['value']}")
 
@@ -219,9 +420,12 @@ class MemoryClient:
             # Step 2: Semantic search via Pinecone - USE NEW CLIENT
             logger.info(f"No exact match, trying semantic search for '{search_key}'")
 
-            query_embedding = self.pinecone_client.generate_embedding(search_key)
+            query_embedding = await self.pinecone_client.generate_embedding_async(
+                search_key
+            )
 
-            results = self.pinecone_client.query(
+            results = await asyncio.to_thread(
+                self.pinecone_client.query,
                 index_name=self.PINECONE_INDEX_NAME,
                 vector=query_embedding,
                 top_k=1,
@@ -259,21 +463,86 @@ class MemoryClient:
 
             return {"found": False, "error": str(e)}
 
-    def log_activity(
+    def _record_access(self, user_id: str, key_lower: str):
+        """
+        Count an access to stored information, to be written back later.
+
+        Args:
+            user_id: User identifier
+            key_lower: Normalized information key
+        """
+        access_key = (user_id, key_lower)
+
+        self._access_deltas[access_key] += 1
+
+        self._access_times[access_key] = _iso_now()
+
+        if self._access_flush is None:
+            self._access_flush = asyncio.create_task(self._flush_access_after_delay())
+
+    async def _flush_access_after_delay(self):
+        """Write back access counts after ACCESS_FLUSH_INTERVAL_SECONDS."""
+        await asyncio.sleep(self.ACCESS_FLUSH_INTERVAL_SECONDS)
+
+        self._access_flush = None
+
+        await self.flush_access_counts()
+
+    async def flush_access_counts(self):
+        """Write accumulated access counts to DynamoDB (call on shutdown)."""
+        if not self._access_deltas:
+            return
+
+        deltas, self._access_deltas = self._access_deltas, defaultdict(int)
+
+        times, self._access_times = self._access_times, {}
+
+        await asyncio.to_thread(self._apply_access_counts, deltas, times)
+
+    def _apply_access_counts(self, deltas: Dict[tuple, int], times: Dict[tuple, str]):
+        """
+        Add accumulated access counts to their stored information items.
+
+        Args:
+            deltas: (user_id, key) -> number of accesses
+            times: (user_id, key) -> last access time
+        """
+        for (user_id, key_lower), count in deltas.items():
+            try:
+                self.info_table.update_item(
+                    Key={"user_id": user_id, "key": key_lower},
+                    UpdateExpression="SET last_accessed = :t ADD access_count :n",
+                    # Don't recreate information deleted since it was read
+                    ConditionExpression="attribute_exists(user_id)",
+                    ExpressionAttributeValues={
+                        ":t": times[(user_id, key_lower)],
+                        ":n": count,
+                    },
+                )
+
+            except ClientError as e:
+                logger.warning(
+                    f"Failed to update access tracking for '{key_lower}': {e}"
+                )
+
+    async def log_activity(
         self, user_id: str, activity_type: str, details: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Log a daily activity."""
         try:
-            timestamp = datetime.now().isoformat()
+            # Full precision - the timestamp is the activity's sort key
+            now = datetime.now()
 
-            date = self._get_today_date()
+            timestamp = now.isoformat()
 
-            self.context_table.put_item(
-                Item={
+            date = now.strftime("%Y-%m-%d")
+
+            await self._write_activity(
+                {
                     "user_id": user_id,
                     "timestamp": timestamp,
                     "activity_type": activity_type,
-                    "details": json.dumps(details),
+                    "details": _to_dynamo_value(details),
                     "date": date,
                 }
             )
@@ -291,28 +560,63 @@ class MemoryClient:
 
             return {"success": False, "error": str(e)}
 
-    def get_daily_context(
+    async def _write_activity(self, item: Dict[str, Any]):
+        """
+        Write an activity item, batching it with concurrent writes.
+
+        Items queued within ACTIVITY_BATCH_WINDOW_SECONDS go out in a single
+        BatchWriteItem; every caller waits for (and sees errors from) the
+        batch its item was in.
+        """
+        self._pending_activities.append(item)
+
+        if self._activity_flush is None:
+            self._activity_flush = asyncio.ensure_future(self._flush_activities())
+
+        await asyncio.shield(self._activity_flush)
+
+    async def _flush_activities(self):
+        """Send queued activity items after the batch window closes."""
+        await asyncio.sleep(self.ACTIVITY_BATCH_WINDOW_SECONDS)
+
+        items, self._pending_activities = self._pending_activities, []
+
+        self._activity_flush = None
+
+        await asyncio.to_thread(self._batch_write_activities, items)
+
+    def _batch_write_activities(self, items: List[Dict[str, Any]]):
+        """Write activity items with BatchWriteItem (25 per request)."""
+        # Dedupe same-key items in the buffer instead of failing the batch
+        with self.context_table.batch_writer(
+            overwrite_by_pkeys=["user_id", "timestamp"]
+        ) as batch:
+            for item in items:
+                batch.put_item(Item=item)
+
+    async def get_daily_context(
         self, user_id: str, date: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """Get all activities for a specific date (defaults to today)."""
         try:
             target_date = date if date else self._get_today_date()
 
-            response = self.context_table.query(
-                IndexName="user_date_index",
-                KeyConditionExpression=Key("user_id").eq(user_id)
-                & Key("date").eq(target_date),
+            response = await asyncio.to_thread(
+                lambda: self.context_table.query(
+                    IndexName="user_date_index",
+                    KeyConditionExpression=Key("user_id").eq(user_id)
+                    & Key("date").eq(target_date),
+                )
             )
 
-            activities = []
-            for item in response.get("Items", []):
-                activities.append(
-                    {
-                        "timestamp": item["timestamp"],
-                        "activity_type": item["activity_type"],
-                        "details": json.loads(item["details"]),
-                    }
-                )
+            activities = [
+                {
+                    "timestamp": item["timestamp"],
+                    "activity_type": item["activity_type"],
+                    "details": _parse_details(item["details"]),
+                }
+                for item in response.get("Items", [])
+            ]
 
             logger.info(f"Retrieved {len(activities)} activities for {target_date}")
 
@@ -324,13 +628,15 @@ class MemoryClient:
 
             return []
 
-    def get_recent_activity(self, user_id: str) -> Optional[Dict[str, Any]]:
+    async def get_recent_activity(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get the most recent activity for 'what was I doing' queries."""
         try:
-            response = self.context_table.query(
-                KeyConditionExpression=Key("user_id").eq(user_id),
-                ScanIndexForward=False,  # Descending order
-                Limit=1,
+            response = await asyncio.to_thread(
+                lambda: self.context_table.query(
+                    KeyConditionExpression=Key("user_id").eq(user_id),
+                    ScanIndexForward=False,  # Descending order
+                    Limit=1,
+                )
             )
 
             items = response.get("Items", [])
@@ -343,7 +649,7 @@ class MemoryClient:
                 return {
                     "timestamp": item["timestamp"],
                     "activity_type": item["activity_type"],
-                    "details": json.loads(item["details"]),
+                    "details": _parse_details(item["details"]),
                 }
             else:
                 logger.info("No recent activities found")
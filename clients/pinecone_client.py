@@ -4,8 +4,15 @@ Used by MemoryClient and StoryClient for vector storage and semantic search.
 """
 
 import os
+import json
+import asyncio
+import hashlib
+import time
 import logging
+import threading
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional
+import numpy as np
 from pinecone import Pinecone
 from openai import OpenAI
 from dotenv import load_dotenv
@@ -23,15 +30,83 @@ class PineconeClient:
 
     EMBEDDING_DIMENSION = 1536
 
+    # Semantic query cache: reuse results for near-duplicate query vectors
+    QUERY_CACHE_SIZE = 1024
+
+    QUERY_CACHE_TTL_SECONDS = 15 * 60
+
+    QUERY_CACHE_THRESHOLD = 0.95
+
+    # Concurrent generate_embedding_async calls within this window share a request
+    EMBED_BATCH_WINDOW_SECONDS = 0.01
+
+    EMBED_BATCH_MAX_INPUTS = 96
+
+    # Longer texts get their own request, so one over the model's token
+    # limit can't fail a whole batch (8000 chars stays well under 8191 tokens
+    # for ordinary text)
+    EMBED_BATCH_MAX_CHARS = 8000
+
+    # Exact-text embedding cache (item names and common queries recur)
+    EMBEDDING_CACHE_SIZE = 4096
+
     def __init__(self):
         """Initialize Pinecone and OpenAI clients"""
         self.pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
 
         self.openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
+        # Ring buffer of unit-norm query vectors, int8-quantized with one
+        # scale per row (zero scale = empty slot); entries hold
+        # (cache_key, results, expires_at) or None for empty/invalidated slots
+        self._qcache_vectors = np.zeros(
+            (self.QUERY_CACHE_SIZE, self.EMBEDDING_DIMENSION), dtype=np.int8
+        )
+
+        self._qcache_scales = np.zeros(self.QUERY_CACHE_SIZE, dtype=np.float32)
+
+        self._qcache_entries: List[Optional[tuple]] = [None] * self.QUERY_CACHE_SIZE
+
+        self._qcache_next = 0
+
+        # Queries run in worker threads (asyncio.to_thread)
+        self._qcache_lock = threading.Lock()
+
+        # (text, future) pairs waiting for the next batched embedding request
+        self._pending_embeddings: List[tuple] = []
+
+        self._embed_flush: Optional[asyncio.Task] = None
+
+        # blake2b(text) -> embedding, least recently used first
+        self._emb_cache: OrderedDict = OrderedDict()
+
+        self._emb_cache_lock = threading.Lock()
+
+        # index_name -> Index handle (each holds its own connection pool)
+        self._index_cache: Dict[str, Any] = {}
+
         logger.info("PineconeClient initialized")
 
-    def generate_embedding(self, text: str) -> List[float]:
+    def _get_index(self, index_name: str):
+        """
+        Get a shared Index handle, creating it on first use.
+
+        Args:
+            index_name: Name of the Pinecone index
+
+        Returns:
+            Pinecone Index for index_name
+        """
+        index = self._index_cache.get(index_name)
+
+        if index is None:
+            index = self.pc.Index(index_name)
+
+            self._index_cache[index_name] = index
+
+        return index
+
+    def generate_embedding(self, text: str) -> np.ndarray:
         """
         Generate embedding vector for text using OpenAI.
 
@@ -39,20 +114,152 @@ class PineconeClient:
             text: Text to embed
 
         Returns:
-            Embedding vector
+            Embedding vector (float32; treat as read-only, it may be cached)
         """
+        cached = self._get_cached_embedding(text)
+        if cached is not None:
+            return cached
+
         try:
             response = self.openai_client.embeddings.create(
                 model=self.EMBEDDING_MODEL, input=text
             )
 
-            return response.data[0].embedding
+            embedding = np.asarray(response.data[0].embedding, dtype=np.float32)
+
+            self._cache_embedding(text, embedding)
+
+            return embedding
 
         except Exception as e:
             logger.error(f"Failed to generate embedding: {e}")
 
             raise
 
+    async def generate_embedding_async(self, text: str) -> np.ndarray:
+        """
+        Generate an embedding, batching with concurrent calls.
+
+        Calls made within EMBED_BATCH_WINDOW_SECONDS are sent as a single
+        embeddings request (up to EMBED_BATCH_MAX_INPUTS texts each). Texts
+        longer than EMBED_BATCH_MAX_CHARS are sent on their own.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Embedding vector (float32; treat as read-only, it may be cached)
+
+        Raises:
+            ValueError: If text is empty
+        """
+        if not text or not text.strip():
+            raise ValueError("Cannot generate an embedding for empty text")
+
+        cached = self._get_cached_embedding(text)
+        if cached is not None:
+            return cached
+
+        if len(text) > self.EMBED_BATCH_MAX_CHARS:
+            return await asyncio.to_thread(self.generate_embedding, text)
+
+        future = asyncio.get_running_loop().create_future()
+
+        self._pending_embeddings.append((text, future))
+
+        if self._embed_flush is None:
+            self._embed_flush = asyncio.create_task(self._flush_embeddings())
+
+        return await future
+
+    async def _flush_embeddings(self):
+        """Send queued texts as batched embedding requests once the window closes."""
+        await asyncio.sleep(self.EMBED_BATCH_WINDOW_SECONDS)
+
+        pending, self._pending_embeddings = self._pending_embeddings, []
+
+        self._embed_flush = None
+
+        for start in range(0, len(pending), self.EMBED_BATCH_MAX_INPUTS):
+            batch = pending[start : start + self.EMBED_BATCH_MAX_INPUTS]
+
+            try:
+                response = await asyncio.to_thread(
+                    self.openai_client.embeddings.create,
+                    model=self.EMBEDDING_MODEL,
+                    input=[text for text, _ in batch],
+                )
+
+                # Results aren't guaranteed to come back in input order
+                data_by_input = sorted(response.data, key=lambda d: d.index)
+
+                if len(data_by_input) != len(batch):
+                    raise ValueError(
+                        f"Got {len(data_by_input)} embeddings for {len(batch)} inputs"
+                    )
+
+                for (text, future), data in zip(batch, data_by_input):
+                    embedding = np.asarray(data.embedding, dtype=np.float32)
+
+                    self._cache_embedding(text, embedding)
+
+                    if not future.done():
+                        future.set_result(embedding)
+
+            except Exception as e:
+                logger.warning(
+                    f"Batched embedding request for {len(batch)} texts failed, "
+                    f"retrying individually: {e}"
+                )
+
+                # Retry one by one so a bad input only fails its own caller
+                await asyncio.gather(
+                    *(self._embed_single(text, future) for text, future in batch)
+                )
+
+    async def _embed_single(self, text: str, future: asyncio.Future):
+        """Embed one queued text on its own, resolving its future."""
+        try:
+            embedding = await asyncio.to_thread(self.generate_embedding, text)
+
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+
+            return
+
+        if not future.done():
+            future.set_result(embedding)
+
+    @staticmethod
+    def _embedding_cache_key(text: str) -> str:
+        """Fixed-size cache key for a text."""
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _get_cached_embedding(self, text: str) -> Optional[np.ndarray]:
+        """Get a cached embedding for this exact text, if any."""
+        key = self._embedding_cache_key(text)
+
+        with self._emb_cache_lock:
+            embedding = self._emb_cache.get(key)
+
+            if embedding is not None:
+                self._emb_cache.move_to_end(key)
+
+            return embedding
+
+    def _cache_embedding(self, text: str, embedding: np.ndarray):
+        """Cache an embedding, evicting the least recently used when full."""
+        key = self._embedding_cache_key(text)
+
+        with self._emb_cache_lock:
+            self._emb_cache[key] = embedding
+
+            self._emb_cache.move_to_end(key)
+
+            if len(self._emb_cache) > self.EMBEDDING_CACHE_SIZE:
+                self._emb_cache.popitem(last=False)
+
     def upsert(
         self, index_name: str, vectors: List[tuple], namespace: Optional[str] = None
     ) -> Dict[str, Any]:
@@ -68,13 +275,13 @@ class PineconeClient:
             Upsert response
         """
         try:
-            index = self.pc.Index(index_name)
+            index = self._get_index(index_name)
 
-            # Format vectors for Pinecone
+            # Format vectors for Pinecone (plain floats at the API boundary)
             formatted_vectors = [
                 {
                     "id": vec[0],
-                    "values": vec[1],
+                    "values": np.asarray(vec[1], dtype=np.float32).tolist(),
                     "metadata": vec[2] if len(vec) > 2 else {},
                 }
                 for vec in vectors
@@ -82,6 +289,8 @@ class PineconeClient:
 
             index.upsert(vectors=formatted_vectors, namespace=namespace or "")
 
+            self._invalidate_query_cache(index_name)
+
             logger.info(f"Upserted {len(vectors)} vectors to {index_name}")
 
             return {"success": True, "upserted_count": len(vectors)}
@@ -94,7 +303,7 @@ class PineconeClient:
     def query(
         self,
         index_name: str,
-        vector: List[float],
+        vector: np.ndarray,
         top_k: int = 5,
         filter: Optional[Dict] = None,
         namespace: Optional[str] = None,
@@ -115,10 +324,28 @@ class PineconeClient:
             Query results with matches
         """
         try:
-            index = self.pc.Index(index_name)
+            cache_key = (
+                index_name,
+                namespace or "",
+                json.dumps(filter, sort_keys=True),
+                top_k,
+                include_metadata,
+            )
+
+            vector = np.asarray(vector, dtype=np.float32)
+
+            query_vec = vector / (np.linalg.norm(vector) or 1.0)
+
+            cached = self._get_cached_query(cache_key, query_vec)
+            if cached is not None:
+                logger.info("Query served from semantic cache")
+
+                return cached
+
+            index = self._get_index(index_name)
 
             results = index.query(
-                vector=vector,
+                vector=vector.tolist(),
                 top_k=top_k,
                 filter=filter,
                 namespace=namespace or "",
@@ -127,6 +354,8 @@ class PineconeClient:
 
             logger.info(f"Query returned {len(results.get('matches', []))} results")
 
+            self._set_cached_query(cache_key, query_vec, results)
+
             return results
 
         except Exception as e:
@@ -149,10 +378,12 @@ class PineconeClient:
             Delete response
         """
         try:
-            index = self.pc.Index(index_name)
+            index = self._get_index(index_name)
 
             index.delete(ids=ids, namespace=namespace or "")
 
+            self._invalidate_query_cache(index_name)
+
             logger.info(f"Deleted {len(ids)} vectors from {index_name}")
 
             return {"success": True, "deleted_count": len(ids)}
@@ -161,3 +392,82 @@ class PineconeClient:
             logger.error(f"Failed to delete vectors: {e}")
 
             return {"success": False, "error": str(e)}
+
+    def _get_cached_query(
+        self, cache_key: tuple, query_vec: np.ndarray
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find cached results for a near-duplicate query.
+
+        Args:
+            cache_key: (index, namespace, filter, top_k, include_metadata)
+            query_vec: Unit-norm query vector
+
+        Returns:
+            Cached results, or None on a miss
+        """
+        now = time.monotonic()
+
+        query_q, query_scale = self._quantize(query_vec)
+
+        with self._qcache_lock:
+            # One int8 matrix-vector product (int32 accumulation) scores every
+            # cached query; scales turn the integer dots back into cosines
+            dots = np.einsum(
+                "ij,j->i", self._qcache_vectors, query_q, dtype=np.int32
+            )
+
+            similarities = dots * self._qcache_scales * query_scale
+
+            candidates = np.flatnonzero(similarities >= self.QUERY_CACHE_THRESHOLD)
+
+            for slot in candidates[np.argsort(-similarities[candidates])]:
+                entry = self._qcache_entries[slot]
+
+                if entry is not None and entry[0] == cache_key and entry[2] > now:
+                    return entry[1]
+
+        return None
+
+    def _set_cached_query(
+        self, cache_key: tuple, query_vec: np.ndarray, results: Dict[str, Any]
+    ):
+        """Cache query results, overwriting the oldest slot."""
+        with self._qcache_lock:
+            slot = self._qcache_next
+
+            self._qcache_vectors[slot], self._qcache_scales[slot] = self._quantize(
+                query_vec
+            )
+
+            self._qcache_entries[slot] = (
+                cache_key,
+                results,
+                time.monotonic() + self.QUERY_CACHE_TTL_SECONDS,
+            )
+
+            self._qcache_next = (slot + 1) % self.QUERY_CACHE_SIZE
+
+    def _invalidate_query_cache(self, index_name: str):
+        """Drop cached queries for an index after its vectors change."""
+        with self._qcache_lock:
+            for slot, entry in enumerate(self._qcache_entries):
+                if entry is not None and entry[0][0] == index_name:
+                    self._qcache_entries[slot] = None
+
+                    self._qcache_scales[slot] = 0
+
+    @staticmethod
+    def _quantize(vec: np.ndarray) -> tuple:
+        """
+        Symmetric int8 quantization with a single per-vector scale.
+
+        Args:
+            vec: float32 vector
+
+        Returns:
+            Tuple of (int8 vector, scale) where vec ~= int8 vector * scale
+        """
+        scale = float(np.max(np.abs(vec))) / 127 or 1.0
+
+        return np.round(vec / scale).astype(np.int8), scale
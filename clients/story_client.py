@@ -3,13 +3,15 @@ Story Client - Handles elderly life story storage and retrieval.
 Uses DynamoDB for structured data and Pinecone for semantic search.
 """
 
+import asyncio
 import logging
+import random
+import time
 import uuid
-import boto3
-import os
 from dotenv import load_dotenv
 from datetime import datetime
 from typing import List, Dict, Any, Optional
+from clients.memory_client import get_dynamodb_resource, get_dynamodb_table
 from clients.pinecone_client import PineconeClient
 
 load_dotenv(".env.local")
@@ -17,24 +19,39 @@ load_dotenv(".env.secrets")
 
 logger = logging.getLogger(__name__)
 
+# Pinecone allows 40KB of metadata per vector; longer stories keep their
+# content in DynamoDB only and are fetched from there on reads
+MAX_METADATA_CONTENT_BYTES = 32 * 1024
+
 
 class StoryClient:
     """Client for managing elderly life stories"""
 
-    def __init__(self):
-        self.dynamodb = boto3.resource(
-            "dynamodb",
-            region_name=os.getenv("AWS_REGION", "us-east-1"),
-            aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-            aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-        )
+    TABLE_NAME = "elderly_stories"
+
+    # Fields returned by limited list_stories calls
+    LIST_PROJECTION = "story_id, title, life_stage, themes, recorded_at, word_count"
+
+    # BatchGetItem retries for UnprocessedKeys (exponential backoff, full jitter)
+    BATCH_GET_MAX_ATTEMPTS = 5
+
+    BATCH_GET_BASE_DELAY_SECONDS = 0.05
 
-        self.table = self.dynamodb.Table("elderly_stories")
+    BATCH_GET_MAX_DELAY_SECONDS = 2.0
 
+    def __init__(self):
         self.pinecone_client = PineconeClient()
 
         logger.info("StoryClient initialized with DynamoDB and Pinecone")
 
+    @property
+    def table(self):
+        """
+        Table resource for the calling thread (boto3 resources aren't
+        thread-safe), so worker calls look it up inside the worker.
+        """
+        return get_dynamodb_table(self.TABLE_NAME)
+
     async def store_story(
         self,
         user_id: str,
@@ -78,34 +95,51 @@ class StoryClient:
                 "word_count": word_count,
             }
 
-            self.table.put_item(Item=item)
-
-            logger.info(f"Stored story {story_id} for user {user_id} in DynamoDB")
-
-            # Generate embedding for Pinecone
-            embed_text = self._prepare_embedding_text(
-                title, content, themes, people_mentioned
-            )
-
-            embedding = self.pinecone_client.generate_embedding(embed_text)
-
-            # Store in Pinecone
+            # Pinecone metadata
             metadata = {
                 "story_id": story_id,
                 "user_id": user_id,
                 "title": title,
                 "life_stage": life_stage,
                 "themes": ",".join(themes) if themes else "",
+                "people_mentioned": ",".join(people_mentioned),
+                "location": location,
+                "time_period": time_period,
+                "word_count": word_count,
                 "recorded_at": timestamp,
             }
 
-            self.pinecone_client.upsert(
-                index_name="elderly-stories",
-                vectors=[(story_id, embedding, metadata)],
-                namespace=user_id,
+            # Denormalize content so semantic reads can skip DynamoDB
+            if len(content.encode("utf-8")) <= MAX_METADATA_CONTENT_BYTES:
+                metadata["content"] = content
+
+            embed_text = self._prepare_embedding_text(
+                title, content, themes, people_mentioned
+            )
+
+            # Write to DynamoDB while embedding and indexing in Pinecone
+            put_result, index_result = await asyncio.gather(
+                asyncio.to_thread(lambda: self.table.put_item(Item=item)),
+                self._index_story(user_id, story_id, embed_text, metadata),
+                return_exceptions=True,
             )
 
-            logger.info(f"Stored story {story_id} embedding in Pinecone")
+            if isinstance(put_result, Exception):
+                # Don't leave a searchable vector for a story that wasn't saved
+                if index_result is True:
+                    await asyncio.to_thread(
+                        self.pinecone_client.delete,
+                        index_name="elderly-stories",
+                        ids=[story_id],
+                        namespace=user_id,
+                    )
+
+                raise put_result
+
+            logger.info(f"Stored story {story_id} for user {user_id} in DynamoDB")
+
+            if isinstance(index_result, Exception):
+                raise index_result
 
             return {
                 "success": True,
@@ -118,6 +152,43 @@ class StoryClient:
 
             return {"success": False, "error": str(e)}
 
+    async def _index_story(
+        self,
+        user_id: str,
+        story_id: str,
+        embed_text: str,
+        metadata: Dict[str, Any],
+    ) -> bool:
+        """
+        Embed a story and upsert it into Pinecone.
+
+        Args:
+            user_id: User identifier (Pinecone namespace)
+            story_id: Story ID (vector ID)
+            embed_text: Text to embed
+            metadata: Vector metadata
+
+        Returns:
+            True if the vector was upserted
+        """
+        embedding = await self.pinecone_client.generate_embedding_async(embed_text)
+
+        result = await asyncio.to_thread(
+            self.pinecone_client.upsert,
+            index_name="elderly-stories",
+            vectors=[(story_id, embedding, metadata)],
+            namespace=user_id,
+        )
+
+        if not result.get("success"):
+            logger.warning(f"Failed to index story {story_id}: {result.get('error')}")
+
+            return False
+
+        logger.info(f"Stored story {story_id} embedding in Pinecone")
+
+        return True
+
     async def find_stories_semantic(
         self, user_id: str, query: str, top_k: int = 5
     ) -> List[Dict[str, Any]]:
@@ -126,10 +197,13 @@ class StoryClient:
         """
         try:
             # Generate query embedding
-            query_embedding = self.pinecone_client.generate_embedding(query)
+            query_embedding = await self.pinecone_client.generate_embedding_async(
+                query
+            )
 
             # Search Pinecone
-            results = self.pinecone_client.query(
+            results = await asyncio.to_thread(
+                self.pinecone_client.query,
                 index_name="elderly-stories",
                 vector=query_embedding,
                 top_k=top_k,
@@ -142,18 +216,36 @@ class StoryClient:
 
                 return []
 
-            # Fetch full stories from DynamoDB
-            stories = []
+            # Build stories straight from Pinecone metadata where it holds
+            # the content
+            stories_by_id = {
+                match["id"]: self._story_from_metadata(user_id, match["metadata"])
+                for match in results["matches"]
+                if "content" in (match.get("metadata") or {})
+            }
 
-            for match in results["matches"]:
-                story_id = match["id"]
+            # Older vectors (and very long stories) only live in DynamoDB
+            missing_ids = [
+                match["id"]
+                for match in results["matches"]
+                if match["id"] not in stories_by_id
+            ]
+
+            if missing_ids:
+                stories_by_id.update(
+                    await asyncio.to_thread(
+                        self._batch_get_stories, user_id, missing_ids
+                    )
+                )
 
-                score = match.get("score", 0)
+            # Keep Pinecone's relevance order
+            stories = []
 
-                story = self.get_story_by_id(user_id, story_id)
+            for match in results["matches"]:
+                story = stories_by_id.get(match["id"])
 
                 if story:
-                    story["relevance_score"] = score
+                    story["relevance_score"] = match.get("score", 0)
                     stories.append(story)
 
             logger.info(f"Found {len(stories)} semantic matches for: {query}")
@@ -188,38 +280,140 @@ class StoryClient:
 
             return None
 
+    def _batch_get_stories(
+        self, user_id: str, story_ids: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Retrieve several stories in one BatchGetItem request.
+
+        UnprocessedKeys are retried with exponential backoff and jitter, up to
+        BATCH_GET_MAX_ATTEMPTS requests in total. Blocking - call it from a
+        worker thread.
+
+        Args:
+            user_id: User identifier
+            story_ids: Story IDs to fetch (at most 100)
+
+        Returns:
+            Dict of story_id -> story for the stories that were retrieved
+        """
+        if not story_ids:
+            return {}
+
+        request_items = {
+            self.table.name: {
+                "Keys": [
+                    {"user_id": user_id, "story_id": story_id}
+                    for story_id in dict.fromkeys(story_ids)
+                ]
+            }
+        }
+
+        stories = {}
+
+        # Retry anything DynamoDB couldn't process (throttling/size limits)
+        for attempt in range(self.BATCH_GET_MAX_ATTEMPTS):
+            if attempt:
+                delay = min(
+                    self.BATCH_GET_MAX_DELAY_SECONDS,
+                    self.BATCH_GET_BASE_DELAY_SECONDS * (2**attempt),
+                )
+
+                time.sleep(random.uniform(0, delay))
+
+            response = get_dynamodb_resource().batch_get_item(
+                RequestItems=request_items
+            )
+
+            for story in response.get("Responses", {}).get(self.table.name, []):
+                stories[story["story_id"]] = story
+
+            request_items = response.get("UnprocessedKeys") or {}
+
+            if not request_items:
+                return stories
+
+        unprocessed = len(request_items.get(self.table.name, {}).get("Keys", []))
+
+        logger.warning(
+            f"BatchGetItem left {unprocessed} stories unprocessed after "
+            f"{self.BATCH_GET_MAX_ATTEMPTS} attempts"
+        )
+
+        return stories
+
+    @staticmethod
+    def _story_from_metadata(user_id: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Rebuild a story item from the metadata stored with its vector.
+
+        Args:
+            user_id: User identifier
+            metadata: Pinecone metadata written by store_story
+
+        Returns:
+            Story dict shaped like the DynamoDB item
+        """
+        themes = metadata.get("themes", "")
+
+        people_mentioned = metadata.get("people_mentioned", "")
+
+        return {
+            "user_id": user_id,
+            "story_id": metadata.get("story_id"),
+            "title": metadata.get("title", ""),
+            "content": metadata["content"],
+            "life_stage": metadata.get("life_stage", ""),
+            "themes": themes.split(",") if themes else [],
+            "people_mentioned": (
+                people_mentioned.split(",") if people_mentioned else []
+            ),
+            "location": metadata.get("location", ""),
+            "time_period": metadata.get("time_period", ""),
+            "recorded_at": metadata.get("recorded_at", ""),
+            # Pinecone returns numbers as floats
+            "word_count": int(metadata.get("word_count", 0)),
+        }
+
     def list_stories(
         self, user_id: str, filters: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
         """
         List stories with optional filters.
+
+        With a "limit" filter, stories are returned without their content.
         """
         try:
             filters = filters or {}
 
             # Filter by life_stage using GSI
             if "life_stage" in filters:
-                response = self.table.query(
-                    IndexName="user_life_stage_index",
-                    KeyConditionExpression="user_id = :uid AND life_stage = :stage",
-                    ExpressionAttributeValues={
+                query_params = {
+                    "IndexName": "user_life_stage_index",
+                    "KeyConditionExpression": "user_id = :uid AND life_stage = :stage",
+                    "ExpressionAttributeValues": {
                         ":uid": user_id,
                         ":stage": filters["life_stage"],
                     },
-                )
+                }
             else:
                 # Get all stories for user
-                response = self.table.query(
-                    KeyConditionExpression="user_id = :uid",
-                    ExpressionAttributeValues={":uid": user_id},
-                    ScanIndexForward=False,  # Most recent first
-                )
+                query_params = {
+                    "KeyConditionExpression": "user_id = :uid",
+                    "ExpressionAttributeValues": {":uid": user_id},
+                    "ScanIndexForward": False,  # Most recent first
+                }
 
-            stories = response.get("Items", [])
+            # Limited listings are overviews - skip the story content and let
+            # DynamoDB stop reading once it has enough
+            if filters.get("limit"):
+                query_params["ProjectionExpression"] = self.LIST_PROJECTION
+
+                query_params["Limit"] = filters["limit"]
 
-            # Apply limit if specified
-            if "limit" in filters and filters["limit"]:
-                stories = stories[: filters["limit"]]
+            response = self.table.query(**query_params)
+
+            stories = response.get("Items", [])
 
             logger.info(f"Listed {len(stories)} stories for user {user_id}")
 
@@ -235,10 +429,12 @@ class StoryClient:
         Get summary statistics about user's stories.
         """
         try:
-            # Get all stories
+            # Get all stories (only the fields the summary needs), newest first
             response = self.table.query(
                 KeyConditionExpression="user_id = :uid",
                 ExpressionAttributeValues={":uid": user_id},
+                ProjectionExpression="life_stage, word_count, title, recorded_at",
+                ScanIndexForward=False,
             )
 
             stories = response.get("Items", [])
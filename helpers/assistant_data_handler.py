@@ -3,10 +3,10 @@ Assistant Data Handler - Handles incoming data messages.
 Refactored to work with SharedState and EmotionHandler.
 """
 
-import json
 import logging
 import asyncio
 from typing import TYPE_CHECKING
+from helpers.json_utils import json_loads
 
 if TYPE_CHECKING:
     from models.shared_state import SharedState
@@ -30,6 +30,17 @@ class AssistantDataHandler:
 
         self.emotion_handler = emotion_handler
 
+        # Message type -> handler (async handlers run as tasks)
+        self._dispatch = {
+            "session_init": lambda m: asyncio.create_task(
+                self._handle_session_init(m)
+            ),
+            "tool_result": self._handle_tool_result,
+            "emotion_detected": lambda m: asyncio.create_task(
+                self._handle_emotion_event(m)
+            ),
+        }
+
         logger.info("AssistantDataHandler initialized")
 
     def handle_data(self, data, participant=None):
@@ -51,21 +62,17 @@ class AssistantDataHandler:
                 message_bytes = data
 
             # Parse message
-            message = json.loads(message_bytes.decode("utf-8"))
+            message = json_loads(message_bytes)
 
             # logger.info(f"Parsed message: {message}")
 
             # Route based on message type
             message_type = message.get("type")
 
-            if message_type == "session_init":
-                asyncio.create_task(self._handle_session_init(message))
-
-            elif message_type == "tool_result":
-                self._handle_tool_result(message)
+            handler = self._dispatch.get(message_type)
 
-            elif message_type == "emotion_detected":
-                asyncio.create_task(self._handle_emotion_event(message))
+            if handler:
+                handler(message)
 
             else:
                 logger.info(f"Non-tool message type: {message_type}")
@@ -87,14 +94,16 @@ class AssistantDataHandler:
             timezone_offset = message.get("timezone_offset_minutes", 0)
 
             if client_time:
-                self.shared_state.time_tracker.initialize(client_time, timezone_offset)
+                time_tracker = self.shared_state.time_tracker
+
+                time_tracker.initialize(client_time, timezone_offset)
 
                 logger.info(f"🕐 Client time received: {client_time}")
 
                 logger.info(f"🕐 Timezone offset: {timezone_offset} minutes")
 
                 logger.info(
-                    f"🕐 Formatted time: {self.shared_state.time_tracker.get_formatted_datetime()}"
+                    f"🕐 Formatted time: {time_tracker.get_formatted_datetime()}"
                 )
 
         except Exception as e:
@@ -6,6 +6,7 @@ Refactored to work with SharedState.
 import logging
 from typing import TYPE_CHECKING
 from livekit.agents import get_job_context
+from backlog.time_monitor import TimeMonitor
 
 if TYPE_CHECKING:
     from models.shared_state import SharedState
@@ -17,6 +18,14 @@ logger = logging.getLogger(__name__)
 class AssistantLifecycle:
     """Manages lifecycle (initialization and cleanup) for the multi-agent system."""
 
+    # Fixed attribute set: one instance per session, no per-instance dict
+    __slots__ = (
+        "shared_state",
+        "data_handler",
+        "time_monitor",
+        "_data_handler_fn",
+    )
+
     def __init__(
         self, shared_state: "SharedState", data_handler: "AssistantDataHandler"
     ):
@@ -70,8 +79,6 @@ class AssistantLifecycle:
     async def _setup_time_monitor(self):
         """Initialize and start the time monitor for backlog reminders."""
         try:
-            from backlog.time_monitor import TimeMonitor
-
             self.time_monitor = TimeMonitor(
                 user_id=self.shared_state.user_id,
                 time_tracker=self.shared_state.time_tracker,
@@ -134,5 +141,11 @@ class AssistantLifecycle:
 
             logger.info("TimeMonitor stopped")
 
+        # Stop the emotion update worker
+        try:
+            await self.data_handler.emotion_handler.stop()
+        except Exception as e:
+            logger.error(f"Error stopping emotion handler: {e}")
+
         # Clean up navigation state
         self.shared_state.navigation_state.clear()
@@ -6,17 +6,57 @@ then calculates accurate client time on demand.
 """
 
 import logging
+import time
+from functools import lru_cache
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional, Tuple
 import pytz
 from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
+# Weekday index (datetime.weekday()) for day names in relative dates
+_DAY_INDEX = {
+    "monday": 0,
+    "tuesday": 1,
+    "wednesday": 2,
+    "thursday": 3,
+    "friday": 4,
+    "saturday": 5,
+    "sunday": 6,
+}
+
+# Map common abbreviations to pytz timezones
+_TZ_MAP = {
+    "CAT": "Africa/Johannesburg",  # Central Africa Time
+    "EAT": "Africa/Nairobi",  # East Africa Time
+    "WAT": "Africa/Lagos",  # West Africa Time
+    "EST": "America/New_York",
+    "PST": "America/Los_Angeles",
+    "UTC": "UTC",
+    "GMT": "GMT",
+}
+
+
+@lru_cache(maxsize=64)
+def _get_timezone(name: str):
+    """Load a pytz timezone once per process (unknown names raise, uncached)."""
+    return pytz.timezone(name)
+
 
 class ClientTimeTracker:
     """Tracks client time accurately throughout a session."""
 
+    # Fixed attribute set: one instance per session, no per-instance dict
+    __slots__ = (
+        "_client_time_at_connect",
+        "_server_time_at_connect",
+        "_timezone_offset_minutes",
+        "_is_initialized",
+        "_mono_at_connect",
+        "_fmt_cache",
+    )
+
     def __init__(self):
         self._client_time_at_connect: Optional[datetime] = None
 
@@ -26,6 +66,12 @@ class ClientTimeTracker:
 
         self._is_initialized: bool = False
 
+        # time.monotonic() when the connect times were recorded
+        self._mono_at_connect: float = 0.0
+
+        # (format, epoch second) -> formatted client time
+        self._fmt_cache: Dict[Tuple[str, int], str] = {}
+
     def initialize(self, client_time_iso: str, timezone_offset_minutes: int = 0):
         """
         Initialize with client time from session_init.
@@ -34,13 +80,18 @@ class ClientTimeTracker:
             client_time_iso: Client's local time in ISO format (e.g., "2025-11-24T14:30:00")
             timezone_offset_minutes: Client's timezone offset from UTC in minutes
         """
+        # Cached strings were formatted against the previous connect time
+        self._fmt_cache.clear()
+
         try:
-            # Validate input - check if it's actually an ISO timestamp
-            if (
-                not client_time_iso
-                or len(client_time_iso) < 10
-                or "T" not in client_time_iso
-            ):
+            # Parse ISO timestamp - fromisoformat rejects anything malformed,
+            # but accepts date-only values as midnight, so require a time part
+            try:
+                client_time = datetime.fromisoformat(client_time_iso)
+
+                if "T" not in client_time_iso:
+                    raise ValueError("client_time_iso has no time component")
+            except (TypeError, ValueError):
                 logger.warning(
                     f"Invalid client_time_iso format: '{client_time_iso}'. "
                     f"Expected ISO format like '2025-11-24T14:30:00'. Using server time instead."
@@ -48,9 +99,7 @@ class ClientTimeTracker:
                 # Fallback to server time
                 now = datetime.now(timezone.utc)
 
-                self._client_time_at_connect = now
-
-                self._server_time_at_connect = now
+                self._set_connect_times(now, now)
 
                 self._timezone_offset_minutes = 0
 
@@ -58,10 +107,7 @@ class ClientTimeTracker:
 
                 return
 
-            # Parse ISO timestamp
-            self._client_time_at_connect = datetime.fromisoformat(client_time_iso)
-
-            self._server_time_at_connect = datetime.now(timezone.utc)  # ✅ Fixed
+            self._set_connect_times(client_time, datetime.now(timezone.utc))
 
             self._timezone_offset_minutes = timezone_offset_minutes
 
@@ -78,14 +124,26 @@ class ClientTimeTracker:
             # Fallback to server time
             now = datetime.now(timezone.utc)
 
-            self._client_time_at_connect = now
-
-            self._server_time_at_connect = now
+            self._set_connect_times(now, now)
 
             self._timezone_offset_minutes = 0
 
             self._is_initialized = False
 
+    def _set_connect_times(self, client_time: datetime, server_time: datetime):
+        """
+        Record the connect-time pair and the monotonic clock reading.
+
+        Args:
+            client_time: Client time at connect (naive local time or aware)
+            server_time: Server UTC time at connect (aware, for logging)
+        """
+        self._client_time_at_connect = client_time
+
+        self._server_time_at_connect = server_time
+
+        self._mono_at_connect = time.monotonic()
+
     def get_current_client_time(self) -> datetime:
         """
         Get the accurate current client time.
@@ -98,21 +156,43 @@ class ClientTimeTracker:
 
             return datetime.now(timezone.utc)
 
-        # Calculate elapsed time since connection
-        elapsed = datetime.now(timezone.utc) - self._server_time_at_connect
+        # Elapsed time from the monotonic clock, immune to wall-clock jumps
+        elapsed = time.monotonic() - self._mono_at_connect
 
-        # Add elapsed to original client time
-        current_client_time = self._client_time_at_connect + elapsed
+        return self._client_time_at_connect + timedelta(seconds=elapsed)
 
-        return current_client_time
+    def _formatted(self, fmt: str) -> str:
+        """
+        Format the current client time, reusing the result within a second.
+
+        Args:
+            fmt: strftime format (second resolution or coarser)
+
+        Returns:
+            Formatted client time (may lag the true time by under a second)
+        """
+        key = (fmt, int(time.time()))
+
+        formatted = self._fmt_cache.get(key)
+
+        if formatted is None:
+            # Only the current second's entries are useful
+            if len(self._fmt_cache) >= 8:
+                self._fmt_cache.clear()
+
+            formatted = self.get_current_client_time().strftime(fmt)
+
+            self._fmt_cache[key] = formatted
+
+        return formatted
 
     def get_current_date_string(self) -> str:
         """Get current client date as YYYY-MM-DD string."""
-        return self.get_current_client_time().strftime("%Y-%m-%d")
+        return self._formatted("%Y-%m-%d")
 
     def get_current_time_string(self) -> str:
         """Get current client time as HH:MM string."""
-        return self.get_current_client_time().strftime("%H:%M")
+        return self._formatted("%H:%M")
 
     def get_current_datetime_iso(self) -> str:
         """Get current client datetime as ISO string."""
@@ -120,7 +200,7 @@ class ClientTimeTracker:
 
     def get_formatted_datetime(self) -> str:
         """Get human-readable datetime (e.g., 'Monday, November 24, 2025 at 2:30 PM')."""
-        return self.get_current_client_time().strftime("%A, %B %d, %Y at %I:%M %p")
+        return self._formatted("%A, %B %d, %Y at %I:%M %p")
 
     def get_timezone_offset_minutes(self) -> int:
         """Get the client's timezone offset in minutes."""
@@ -152,28 +232,10 @@ class ClientTimeTracker:
 
             return tomorrow.strftime("%Y-%m-%d")
 
-        elif relative_lower in [
-            "monday",
-            "tuesday",
-            "wednesday",
-            "thursday",
-            "friday",
-            "saturday",
-            "sunday",
-        ]:
-            # Find next occurrence of this day
-            day_names = [
-                "monday",
-                "tuesday",
-                "wednesday",
-                "thursday",
-                "friday",
-                "saturday",
-                "sunday",
-            ]
-
-            target_day = day_names.index(relative_lower)
+        target_day = _DAY_INDEX.get(relative_lower)
 
+        if target_day is not None:
+            # Find next occurrence of this day
             current_day = current.weekday()
 
             days_ahead = target_day - current_day
@@ -189,6 +251,7 @@ class ClientTimeTracker:
             # Return as-is if not recognized (might already be a date)
             return relative
 
+    @staticmethod
     def parse_timezone(tz_string: str):
         """
         Parse timezone from string (handles abbreviations like 'CAT').
@@ -199,22 +262,11 @@ class ClientTimeTracker:
         Returns:
             pytz timezone object
         """
-        # Map common abbreviations to pytz timezones
-        tz_map = {
-            "CAT": "Africa/Johannesburg",  # Central Africa Time
-            "EAT": "Africa/Nairobi",  # East Africa Time
-            "WAT": "Africa/Lagos",  # West Africa Time
-            "EST": "America/New_York",
-            "PST": "America/Los_Angeles",
-            "UTC": "UTC",
-            "GMT": "GMT",
-        }
-
         # Try abbreviation map first
-        full_tz_name = tz_map.get(tz_string.upper(), tz_string)
+        full_tz_name = _TZ_MAP.get(tz_string.upper(), tz_string)
 
         try:
-            return pytz.timezone(full_tz_name)
+            return _get_timezone(full_tz_name)
         except Exception as e:
             logger.warning(f"Could not parse timezone '{tz_string}', using UTC: {e}")
 
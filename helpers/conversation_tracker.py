@@ -16,6 +16,11 @@ class ConversationTracker:
     Tracks conversation flow and routes to EmotionHandler for check-ins.
     """
 
+    # Fixed attribute set: one instance per session, no per-instance dict
+    __slots__ = (
+        "emotion_handler",
+    )
+
     def __init__(self, emotion_handler: "EmotionHandler"):
         """
         Initialize conversation tracker.
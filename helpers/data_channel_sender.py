@@ -3,8 +3,9 @@ Data channel sender - Send events to mobile app via LiveKit data channel.
 """
 
 import logging
-import json
 from typing import Dict, Any, Optional
+from livekit.agents import get_job_context
+from helpers.json_utils import json_dumps_bytes
 
 logger = logging.getLogger(__name__)
 
@@ -27,8 +28,6 @@ class DataChannelSender:
             medication_data: Medication details (name, dosage, times, etc.)
         """
         try:
-            from livekit.agents import get_job_context
-
             ctx = get_job_context()
 
             if not ctx or not ctx.room:
@@ -41,9 +40,7 @@ class DataChannelSender:
                 "data": medication_data or {},
             }
 
-            message = json.dumps(event)
-
-            message_bytes = message.encode("utf-8")
+            message_bytes = json_dumps_bytes(event)
 
             await ctx.room.local_participant.publish_data(message_bytes)
 
@@ -68,8 +65,6 @@ class DataChannelSender:
             notification_type: Type (success, error, info, warning)
         """
         try:
-            from livekit.agents import get_job_context
-
             ctx = get_job_context()
 
             if not ctx or not ctx.room:
@@ -85,9 +80,7 @@ class DataChannelSender:
                 },
             }
 
-            message_str = json.dumps(event)
-
-            message_bytes = message_str.encode("utf-8")
+            message_bytes = json_dumps_bytes(event)
 
             await ctx.room.local_participant.publish_data(message_bytes)
 
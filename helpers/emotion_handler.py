@@ -2,17 +2,31 @@
 Emotion Handler - Manages emotion detection check-ins independently of agent routing.
 """
 
-import json
 import logging
 import asyncio
+from dataclasses import dataclass
 from typing import Optional
 from livekit.agents import get_job_context
 from livekit.agents import AgentSession
 from models.shared_state import SharedState
+from helpers.json_utils import json_dumps_bytes
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True)
+class PendingCheckIn:
+    """Emotion event awaiting the user's answer to its check-in question."""
+
+    type: Optional[str]
+
+    severity: Optional[str]
+
+    message: Optional[str]
+
+    timestamp: Optional[str]
+
+
 class EmotionHandler:
     """
     Handles emotion detection events and check-in Q&A tracking.
@@ -22,6 +36,27 @@ class EmotionHandler:
     asks check-in questions and tracks the user's responses.
     """
 
+    # Fixed attribute set: one instance per session, no per-instance dict
+    __slots__ = (
+        "session",
+        "user_id",
+        "shared_state",
+        "pending_check_in",
+        "_pending_slot",
+        "waiting_for_response",
+        "check_in_question",
+        "last_check_in_time",
+        "check_in_cooldown",
+        "_update_queue",
+        "_worker",
+    )
+
+    # Q&A updates waiting to be published before new ones are dropped
+    UPDATE_QUEUE_SIZE = 32
+
+    # How long teardown waits for queued updates to be sent
+    UPDATE_DRAIN_TIMEOUT_SECONDS = 2.0
+
     def __init__(self, session: AgentSession, user_id: str, shared_state: SharedState):
         """
         Initialize emotion handler.
@@ -34,25 +69,29 @@ class EmotionHandler:
 
         self.user_id = user_id
 
+        self.shared_state = shared_state
+
         # Check-in tracking state
-        self.pending_check_in: Optional[dict] = None
+        self.pending_check_in: Optional[PendingCheckIn] = None
+
+        # Reused for every event - only one check-in is pending at a time
+        self._pending_slot = PendingCheckIn(None, None, None, None)
 
         self.waiting_for_response: bool = False
 
         self.check_in_question: Optional[str] = None
 
-        self.session = session
-
-        self.shared_state = shared_state
-
-        self.waiting_for_response = False
-
-        self.check_in_question = None
-
         self.last_check_in_time = None
 
         self.check_in_cooldown = 300  # 5 minutes between check-ins
 
+        # Q&A updates are published one at a time by a single worker task
+        self._update_queue: asyncio.Queue = asyncio.Queue(
+            maxsize=self.UPDATE_QUEUE_SIZE
+        )
+
+        self._worker: Optional[asyncio.Task] = None
+
         logger.info("EmotionHandler initialized")
 
     async def handle_emotion_event(self, event: dict) -> None:
@@ -63,13 +102,15 @@ class EmotionHandler:
             event: Emotion event with type, severity, message, timestamp
         """
         try:
-            emotion_type = event.get("emotion_type")
+            get = event.get
+
+            emotion_type = get("emotion_type")
 
-            severity = event.get("severity")
+            severity = get("severity")
 
-            check_in_message = event.get("check_in_message")
+            check_in_message = get("check_in_message")
 
-            timestamp = event.get("timestamp")
+            timestamp = get("timestamp")
 
             logger.info(f"🎭 Emotion event: {emotion_type} ({severity})")
 
@@ -80,12 +121,17 @@ class EmotionHandler:
                 return
 
             # Store event for Q&A tracking
-            self.pending_check_in = {
-                "type": emotion_type,
-                "severity": severity,
-                "message": check_in_message,
-                "timestamp": timestamp,
-            }
+            pending = self._pending_slot
+
+            pending.type = emotion_type
+
+            pending.severity = severity
+
+            pending.message = check_in_message
+
+            pending.timestamp = timestamp
+
+            self.pending_check_in = pending
 
             # Ask check-in question
             await self._ask_check_in_question(check_in_message)
@@ -164,12 +210,12 @@ class EmotionHandler:
 
         # Update DynamoDB with Q&A
         if self.pending_check_in and self.check_in_question:
-            asyncio.create_task(
-                self._update_emotion_event_with_interaction(
-                    timestamp=self.pending_check_in["timestamp"],
-                    agent_question=self.check_in_question,
-                    user_response=user_message,
-                )
+            self._queue_update(
+                {
+                    "timestamp": self.pending_check_in.timestamp,
+                    "agent_question": self.check_in_question,
+                    "user_response": user_message,
+                }
             )
 
         # Clear tracking state
@@ -179,6 +225,54 @@ class EmotionHandler:
 
         self.check_in_question = None
 
+    def _queue_update(self, update: dict) -> None:
+        """
+        Queue a Q&A update for the worker, starting it on first use.
+
+        Args:
+            update: Keyword arguments for _update_emotion_event_with_interaction
+        """
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._drain_updates())
+
+        try:
+            self._update_queue.put_nowait(update)
+        except asyncio.QueueFull:
+            logger.warning(
+                f"⚠️ Emotion update queue full, dropping update: {update['timestamp']!s:.19}"
+            )
+
+    async def _drain_updates(self) -> None:
+        """Publish queued Q&A updates one at a time."""
+        while True:
+            update = await self._update_queue.get()
+
+            try:
+                await self._update_emotion_event_with_interaction(**update)
+            finally:
+                self._update_queue.task_done()
+
+    async def stop(self) -> None:
+        """Send any queued updates, then stop the worker (called at session teardown)."""
+        if self._worker:
+            try:
+                await asyncio.wait_for(
+                    self._update_queue.join(),
+                    timeout=self.UPDATE_DRAIN_TIMEOUT_SECONDS,
+                )
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"⚠️ Dropping {self._update_queue.qsize()} unsent emotion update(s)"
+                )
+
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+
+            self._worker = None
+
     async def _update_emotion_event_with_interaction(
         self, timestamp: str, agent_question: str, user_response: str
     ) -> None:
@@ -191,7 +285,7 @@ class EmotionHandler:
             user_response: User's response
         """
         try:
-            logger.info(f"📝 Updating emotion event: {timestamp[:19]}")
+            logger.info(f"📝 Updating emotion event: {timestamp!s:.19}")
 
             # Get job context to send update to Flutter
             ctx = get_job_context()
@@ -204,7 +298,7 @@ class EmotionHandler:
                     "user_response": user_response,
                 }
 
-                message_bytes = json.dumps(message).encode("utf-8")
+                message_bytes = json_dumps_bytes(message)
 
                 await ctx.room.local_participant.publish_data(message_bytes)
 
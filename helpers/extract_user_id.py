@@ -1,7 +1,12 @@
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
+# room_{userId}_{userName}_{timestamp} - the greedy userId group backtracks to
+# the last two underscores, so userId may contain underscores
+_ROOM_RE = re.compile(r"^room_(?P<uid>.*)_(?P<uname>[^_]*)_(?P<ts>[^_]*)$", re.DOTALL)
+
 
 def extract_user_id(room_name: str) -> str:
     """
@@ -12,32 +17,21 @@ def extract_user_id(room_name: str) -> str:
 
     Note: userId can contain underscores, userName and timestamp cannot
     """
-    logger.info(f"🔍 FULL ROOM NAME: {room_name}")
+    logger.debug(f"🔍 FULL ROOM NAME: {room_name}")
 
     if not room_name.startswith("room_"):
         logger.warning(f"❌ Invalid room name format: {room_name}")
 
         return None
 
-    # Remove "room_" prefix
-    rest = room_name.replace("room_", "", 1)
-
-    logger.info(f"After removing 'room_': {rest}")
-
-    # Split from the RIGHT by last 2 underscores to separate timestamp and userName
-    # Format: {userId}_{userName}_{timestamp}
-    parts = rest.rsplit("_", 2)
+    match = _ROOM_RE.match(room_name)
 
-    if len(parts) != 3:
+    if match is None:
         logger.warning(f"❌ Could not parse room name (expected 3 parts): {room_name}")
 
         return None
 
-    user_id = parts[0]
-
-    user_name = parts[1]
-
-    timestamp = parts[2]
+    user_id, user_name, timestamp = match.group("uid", "uname", "ts")
 
     logger.info(
         f"✅ Extracted user_id: {user_id}, userName: {user_name}, timestamp: {timestamp}"
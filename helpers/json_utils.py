@@ -0,0 +1,16 @@
+"""
+JSON helpers for data channel packets - orjson when installed, stdlib json otherwise.
+"""
+
+import json
+
+try:
+    # orjson parses and serializes in C, straight from/to bytes
+    from orjson import dumps as json_dumps_bytes, loads as json_loads
+except ImportError:
+    # json.loads also accepts UTF-8 bytes
+    json_loads = json.loads
+
+    def json_dumps_bytes(obj) -> bytes:
+        """Serialize obj to UTF-8 JSON bytes."""
+        return json.dumps(obj).encode("utf-8")
@@ -1,9 +1,21 @@
 import os
+import asyncio
+import hashlib
 import logging
+import sqlite3
+import threading
 import time
-from typing import List, Optional
-from openai import OpenAI
+from collections import OrderedDict
+from typing import Dict, List, Optional, Union
+from openai import AsyncOpenAI, OpenAI
 from dotenv import load_dotenv
+import numpy as np
+
+# SIMD cosine kernels (AVX2/AVX-512/NEON) when installed
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
 
 load_dotenv()
 
@@ -11,11 +23,52 @@ logger = logging.getLogger(__name__)
 
 
 class EmbeddingService:
+    # Fixed attribute set: slot access instead of per-instance dict lookups
+    __slots__ = (
+        "client",
+        "async_client",
+        "model",
+        "max_retries",
+        "retry_delay",
+        "batch_size",
+        "_cache",
+        "_cache_max",
+        "_cache_lock",
+        "_inflight",
+        "_disk_cache_path",
+        "_disk_cache_ttl",
+        "_disk_cache",
+        "_disk_lock",
+        "_disk_prune_at",
+    )
+
+    # Seconds between deletes of expired disk cache rows
+    DISK_CACHE_PRUNE_INTERVAL = 3600
+
     def __init__(self):
         self.client = None
+        self.async_client = None
         self.model = "text-embedding-ada-002"
         self.max_retries = 3
         self.retry_delay = 1.0
+        # Texts per embeddings request; at 8000 characters (~2000 tokens)
+        # each this stays under the per-request token limit
+        self.batch_size = 100
+        # (model, blake2b(text)) -> embedding, least recently used first
+        self._cache: OrderedDict = OrderedDict()
+        self._cache_max = 4096
+        self._cache_lock = threading.Lock()
+        # Concurrent async requests for the same text share one API call
+        self._inflight: Dict[tuple, asyncio.Task] = {}
+        # Second tier that survives worker restarts (shared by workers on a host)
+        self._disk_cache_path = os.getenv(
+            "EMBEDDING_CACHE_PATH", "/tmp/embedding_cache.sqlite3"
+        )
+        self._disk_cache_ttl = 30 * 24 * 3600
+        # Disk I/O runs in worker threads and never holds the memory cache lock
+        self._disk_lock = threading.Lock()
+        self._disk_prune_at = 0.0
+        self._disk_cache = self._open_disk_cache()
         self._initialize_client()
 
     def _initialize_client(self):
@@ -27,14 +80,46 @@ class EmbeddingService:
 
             # Add timeout to prevent indefinite hangs
             self.client = OpenAI(api_key=api_key, timeout=30.0, max_retries=3)
+            self.async_client = AsyncOpenAI(
+                api_key=api_key, timeout=30.0, max_retries=3
+            )
             logger.info("OpenAI client initialized successfully")
 
         except Exception as e:
             logger.error(f"Failed to initialize OpenAI client: {e}")
             raise
 
-    async def create_embedding_async(self, text: str) -> Optional[List[float]]:
-        """Create embedding for text with retry logic (async)"""
+    def _open_disk_cache(self) -> Optional[sqlite3.Connection]:
+        """Open the SQLite embedding cache (None if unavailable)"""
+        try:
+            conn = sqlite3.connect(
+                self._disk_cache_path, timeout=1.0, check_same_thread=False
+            )
+            # WAL lets several workers read while one writes; NORMAL skips
+            # the fsync per commit (losing recent entries on a crash is fine)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "model TEXT NOT NULL, digest BLOB NOT NULL, "
+                "embedding BLOB NOT NULL, created_at REAL NOT NULL, "
+                "PRIMARY KEY (model, digest))"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS embeddings_created_at "
+                "ON embeddings (created_at)"
+            )
+            conn.commit()
+            self._prune_disk_cache(conn)
+            return conn
+
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding disk cache unavailable: {e}")
+            return None
+
+    @staticmethod
+    def _prepare_text(text: str) -> Optional[str]:
+        """Strip and truncate text for embedding (None if empty)"""
         if not text or not text.strip():
             logger.warning("Empty text provided for embedding")
             return None
@@ -45,17 +130,155 @@ class EmbeddingService:
             text = text[:8000]
             logger.warning("Text truncated to 8000 characters for embedding")
 
-        for attempt in range(self.max_retries):
+        return text
+
+    def _cache_key(self, text: str) -> tuple:
+        """Fixed-size cache key for a prepared text"""
+        return (
+            self.model,
+            hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest(),
+        )
+
+    def _prune_disk_cache(self, conn: sqlite3.Connection):
+        """Delete expired rows so the disk cache doesn't grow without bound"""
+        now = time.time()
+        with conn:
+            conn.execute(
+                "DELETE FROM embeddings WHERE created_at < ?",
+                (now - self._disk_cache_ttl,),
+            )
+        self._disk_prune_at = now + self.DISK_CACHE_PRUNE_INTERVAL
+
+    def _get_memory(self, key: tuple) -> Optional["np.ndarray"]:
+        """Get an embedding from the in-memory LRU, marking it most recently used"""
+        with self._cache_lock:
+            embedding = self._cache.get(key)
+            if embedding is not None:
+                self._cache.move_to_end(key)
+            return embedding
+
+    def _read_disk(self, key: tuple) -> Optional["np.ndarray"]:
+        """Get an embedding from the disk cache into memory (blocking)"""
+        if self._disk_cache is None:
+            return None
+
+        with self._disk_lock:
             try:
-                import asyncio
+                row = self._disk_cache.execute(
+                    "SELECT embedding FROM embeddings "
+                    "WHERE model = ? AND digest = ? AND created_at > ?",
+                    (key[0], key[1], time.time() - self._disk_cache_ttl),
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding disk cache read failed: {e}")
+                return None
+
+        if row is None:
+            return None
 
-                loop = asyncio.get_event_loop()
-                response = await loop.run_in_executor(
-                    None,
-                    lambda: self.client.embeddings.create(model=self.model, input=text),
-                )
+        embedding = np.frombuffer(row[0], dtype=np.float32)
+        with self._cache_lock:
+            self._remember(key, embedding)
+        return embedding
+
+    def _write_disk(self, entries: List[tuple]):
+        """Store (key, embedding) pairs in the disk cache, pruning periodically (blocking)"""
+        if self._disk_cache is None or not entries:
+            return
+
+        now = time.time()
+        rows = [
+            (key[0], key[1], np.asarray(embedding, dtype=np.float32).tobytes(), now)
+            for key, embedding in entries
+        ]
+        with self._disk_lock:
+            try:
+                with self._disk_cache:
+                    self._disk_cache.executemany(
+                        "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?)", rows
+                    )
+                if now >= self._disk_prune_at:
+                    self._prune_disk_cache(self._disk_cache)
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding disk cache write failed: {e}")
+
+    def _get_cached(self, key: tuple) -> Optional["np.ndarray"]:
+        """Get a cached embedding (memory, then disk); blocks on disk reads"""
+        embedding = self._get_memory(key)
+        if embedding is not None:
+            return embedding
+        return self._read_disk(key)
+
+    async def _get_cached_async(self, key: tuple) -> Optional["np.ndarray"]:
+        """Get a cached embedding, reading the disk tier in a worker thread"""
+        embedding = self._get_memory(key)
+        if embedding is not None or self._disk_cache is None:
+            return embedding
+        return await asyncio.to_thread(self._read_disk, key)
+
+    def _set_cached(self, key: tuple, embedding: "np.ndarray"):
+        """Cache an embedding in memory and on disk; blocks on the disk write"""
+        with self._cache_lock:
+            self._remember(key, embedding)
+        self._write_disk([(key, embedding)])
+
+    async def _set_cached_async(self, key: tuple, embedding: "np.ndarray"):
+        """Cache an embedding, writing the disk tier in a worker thread"""
+        with self._cache_lock:
+            self._remember(key, embedding)
+        if self._disk_cache is not None:
+            await asyncio.to_thread(self._write_disk, [(key, embedding)])
+
+    def _remember(self, key: tuple, embedding: "np.ndarray"):
+        """Add to the in-memory LRU, evicting the least recently used when full (_cache_lock held)"""
+        self._cache[key] = embedding
+        self._cache.move_to_end(key)
+        if len(self._cache) > self._cache_max:
+            self._cache.popitem(last=False)
+
+    async def create_embedding_async(self, text: str) -> Optional["np.ndarray"]:
+        """Create a unit-length embedding for text with retry logic (async)"""
+        text = self._prepare_text(text)
+        if text is None:
+            return None
 
-                embedding = response.data[0].embedding
+        key = self._cache_key(text)
+        cached = await self._get_cached_async(key)
+        if cached is not None:
+            return cached
+
+        task = self._inflight.get(key)
+        if task is None:
+            # A request may have finished while the disk tier was read
+            cached = self._get_memory(key)
+            if cached is not None:
+                return cached
+
+            task = asyncio.ensure_future(self._fetch_embedding_async(key, text))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # Shielded so one caller being cancelled doesn't cancel the others
+        return await asyncio.shield(task)
+
+    async def _fetch_embedding_async(
+        self, key: tuple, text: str
+    ) -> Optional["np.ndarray"]:
+        """Request an embedding and cache it (the shared in-flight task for key)"""
+        embedding = await self._request_embedding_async(text)
+        if embedding is not None:
+            await self._set_cached_async(key, embedding)
+        return embedding
+
+    async def _request_embedding_async(self, text: str) -> Optional["np.ndarray"]:
+        """Request an embedding from the API, retrying with backoff"""
+        model = self.model
+        create = self.async_client.embeddings.create
+        for attempt in range(self.max_retries):
+            try:
+                response = await create(model=model, input=text)
+
+                embedding = self.normalize(response.data[0].embedding)
                 logger.debug(f"Created embedding for text: {text[:50]}...")
                 return embedding
 
@@ -72,23 +295,25 @@ class EmbeddingService:
                     )
                     return None
 
-    def create_embedding(self, text: str) -> Optional[List[float]]:
-        """Create embedding for text with retry logic"""
-        if not text or not text.strip():
-            logger.warning("Empty text provided for embedding")
+    def create_embedding(self, text: str) -> Optional["np.ndarray"]:
+        """Create a unit-length embedding for text with retry logic"""
+        text = self._prepare_text(text)
+        if text is None:
             return None
 
-        # Clean and prepare text
-        text = text.strip()
-        if len(text) > 8000:  # OpenAI's limit is ~8192 tokens
-            text = text[:8000]
-            logger.warning("Text truncated to 8000 characters for embedding")
+        key = self._cache_key(text)
+        cached = self._get_cached(key)
+        if cached is not None:
+            return cached
 
+        model = self.model
+        create = self.client.embeddings.create
         for attempt in range(self.max_retries):
             try:
-                response = self.client.embeddings.create(model=self.model, input=text)
+                response = create(model=model, input=text)
 
-                embedding = response.data[0].embedding
+                embedding = self.normalize(response.data[0].embedding)
+                self._set_cached(key, embedding)
                 logger.debug(f"Created embedding for text: {text[:50]}...")
                 return embedding
 
@@ -103,16 +328,107 @@ class EmbeddingService:
                     )
                     return None
 
-    def create_embeddings_batch(self, texts: List[str]) -> List[Optional[List[float]]]:
-        """Create embeddings for multiple texts"""
-        embeddings = []
+    def create_embeddings_batch(self, texts: List[str]) -> List[Optional["np.ndarray"]]:
+        """Create embeddings for multiple texts, several per API request"""
+        embeddings, prepared = self._split_cached(texts)
+
+        for start in range(0, len(prepared), self.batch_size):
+            chunk = prepared[start : start + self.batch_size]
 
-        for text in texts:
-            embedding = self.create_embedding(text)
-            embeddings.append(embedding)
+            try:
+                chunk_embeddings = self._batch_request([text for _, _, text in chunk])
+            except Exception as e:
+                logger.error(f"Failed to create embeddings for batch: {e}")
+                continue
+
+            entries = []
+            with self._cache_lock:
+                for (indices, key, _), embedding in zip(chunk, chunk_embeddings):
+                    self._remember(key, embedding)
+                    entries.append((key, embedding))
+                    for i in indices:
+                        embeddings[i] = embedding
+            self._write_disk(entries)
 
-            # Small delay to avoid rate limiting
-            time.sleep(0.1)
+        return embeddings
+
+    def _split_cached(self, texts: List[str]) -> tuple:
+        """
+        Fill in cached embeddings for a batch of texts.
+
+        Returns (embeddings, pending): empty texts keep a None embedding,
+        and pending lists (indices, cache key, prepared text) still to
+        request - one entry per unique text, however often it repeats.
+        """
+        embeddings: List[Optional["np.ndarray"]] = [None] * len(texts)
+        pending: Dict[tuple, tuple] = {}
+        for i, text in enumerate(self._prepare_text(t) for t in texts):
+            if text is None:
+                continue
+            key = self._cache_key(text)
+            if key in pending:
+                pending[key][0].append(i)
+                continue
+            cached = self._get_cached(key)
+            if cached is not None:
+                embeddings[i] = cached
+            else:
+                pending[key] = ([i], text)
+        return embeddings, [
+            (indices, key, text) for key, (indices, text) in pending.items()
+        ]
+
+    def _batch_request(self, chunk: List[str]) -> List["np.ndarray"]:
+        """Embed a list of prepared texts in one request (client retries 429s)"""
+        response = self.client.embeddings.create(model=self.model, input=chunk)
+
+        return [
+            self.normalize(d.embedding)
+            for d in sorted(response.data, key=lambda d: d.index)
+        ]
+
+    async def create_embeddings_batch_async(
+        self, texts: List[str], concurrency: int = 16
+    ) -> List[Optional["np.ndarray"]]:
+        """Create embeddings for multiple texts, sending batch requests concurrently"""
+        # Cache lookups may read the disk tier - keep them off the event loop
+        embeddings, prepared = await asyncio.to_thread(self._split_cached, texts)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def embed_chunk(chunk):
+            async with semaphore:
+                response = await self.async_client.embeddings.create(
+                    model=self.model, input=[text for _, _, text in chunk]
+                )
+            return [
+                self.normalize(d.embedding)
+                for d in sorted(response.data, key=lambda d: d.index)
+            ]
+
+        chunks = [
+            prepared[start : start + self.batch_size]
+            for start in range(0, len(prepared), self.batch_size)
+        ]
+        results = await asyncio.gather(
+            *(embed_chunk(chunk) for chunk in chunks), return_exceptions=True
+        )
+
+        entries = []
+        for chunk, chunk_embeddings in zip(chunks, results):
+            if isinstance(chunk_embeddings, Exception):
+                logger.error(f"Failed to create embeddings for batch: {chunk_embeddings}")
+                continue
+
+            with self._cache_lock:
+                for (indices, key, _), embedding in zip(chunk, chunk_embeddings):
+                    self._remember(key, embedding)
+                    entries.append((key, embedding))
+                    for i in indices:
+                        embeddings[i] = embedding
+
+        if entries and self._disk_cache is not None:
+            await asyncio.to_thread(self._write_disk, entries)
 
         return embeddings
 
@@ -120,25 +436,76 @@ class EmbeddingService:
         """Get the dimension of embeddings for this model"""
         return 1536  # ada-002 dimension
 
-    def calculate_similarity(
-        self, embedding1: List[float], embedding2: List[float]
+    @staticmethod
+    def normalize(embedding: Union[List[float], "np.ndarray"]) -> "np.ndarray":
+        """Scale an embedding to unit length (float32)"""
+        vec = np.asarray(embedding, dtype=np.float32)
+        magnitude = np.linalg.norm(vec)
+
+        if magnitude == 0:
+            return vec
+
+        return vec / magnitude
+
+    def calculate_similarity_normalized(
+        self, embedding1: "np.ndarray", embedding2: "np.ndarray"
+    ) -> float:
+        """Cosine similarity of two unit-length float32 embeddings (a dot product)"""
+        if simsimd is not None:
+            return float(simsimd.dot(embedding1, embedding2))
+
+        return float(np.dot(embedding1, embedding2))
+
+    def calculate_similarities(
+        self, query: "np.ndarray", matrix: "np.ndarray"
+    ) -> "np.ndarray":
+        """
+        Cosine similarity of a unit-length query against every row of matrix.
+
+        matrix must be a single contiguous (N, dim) float32 array of
+        unit-length rows (e.g. stacked create_embedding results), not a list
+        of lists, so the whole scan is one BLAS matrix-vector product.
+        """
+        return matrix @ query
+
+    def top_k(
+        self, query: "np.ndarray", matrix: "np.ndarray", k: int
+    ) -> List[tuple]:
+        """Best k (row index, similarity) pairs, most similar first"""
+        sims = self.calculate_similarities(query, matrix)
+        if k <= 0:
+            return []
+        if k < len(sims):
+            # Partial selection instead of sorting every score
+            candidates = np.argpartition(-sims, k)[:k]
+        else:
+            candidates = np.arange(len(sims))
+        best = candidates[np.argsort(-sims[candidates])]
+        return [(int(i), float(sims[i])) for i in best]
+
+    def calculate_similarity_raw(
+        self,
+        embedding1: Union[List[float], "np.ndarray"],
+        embedding2: Union[List[float], "np.ndarray"],
     ) -> float:
         """Calculate cosine similarity between two embeddings"""
         try:
-            import numpy as np
+            # No-op for float32 arrays; lists are converted once
+            vec1 = np.asarray(embedding1, dtype=np.float32)
+            vec2 = np.asarray(embedding2, dtype=np.float32)
 
-            # Convert to numpy arrays
-            vec1 = np.array(embedding1)
-            vec2 = np.array(embedding2)
+            if not vec1.any() or not vec2.any():
+                return 0.0
+
+            if simsimd is not None:
+                # simsimd returns cosine distance
+                return 1.0 - float(simsimd.cosine(vec1, vec2))
 
             # Calculate cosine similarity
             dot_product = np.dot(vec1, vec2)
             magnitude1 = np.linalg.norm(vec1)
             magnitude2 = np.linalg.norm(vec2)
 
-            if magnitude1 == 0 or magnitude2 == 0:
-                return 0.0
-
             similarity = dot_product / (magnitude1 * magnitude2)
             return float(similarity)
 
@@ -146,6 +513,9 @@ class EmbeddingService:
             logger.error(f"Error calculating similarity: {e}")
             return 0.0
 
+    # Works on embeddings of any length
+    calculate_similarity = calculate_similarity_raw
+
     def test_connection(self) -> bool:
         """Test if the OpenAI API connection is working"""
         try:
@@ -0,0 +1,466 @@
+"""
+Unit tests for BacklogManager's queries: reminders (DueIndex and its
+fallback), title lookups and timeframe windows, plus the DueIndex backfill.
+"""
+
+import re
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("boto3")
+pytest.importorskip("dateutil")
+pytest.importorskip("dotenv")
+
+from boto3.dynamodb.conditions import ConditionBase
+from botocore.exceptions import ClientError
+
+from backlog.backlog_manager import BacklogManager
+from backlog.due_index_migration import backfill_due_markers
+
+USER_ID = "user_1"
+
+NOW = datetime(2025, 11, 24, 14, 0, 0)
+
+
+class FakeTable:
+    """Serves BacklogItems queries from a list of items."""
+
+    def __init__(self, items, has_due_index=True):
+        self.items = items
+
+        self.has_due_index = has_due_index
+
+        self.indexes_queried = []
+
+    def query(self, **params):
+        index_name = params.get("IndexName")
+
+        self.indexes_queried.append(index_name)
+
+        if index_name == BacklogManager.DUE_GSI_NAME:
+            if not self.has_due_index:
+                raise ClientError(
+                    {
+                        "Error": {
+                            "Code": "ValidationException",
+                            "Message": "The table does not have the specified index: DueIndex",
+                        }
+                    },
+                    "Query",
+                )
+
+            return {"Items": [item for item in self.items if "due_marker" in item]}
+
+        # The backfill check only asks for item_id of unmarked items
+        if params.get("ProjectionExpression") == "item_id":
+            return {
+                "Items": [
+                    {"item_id": item["item_id"]}
+                    for item in self.items
+                    if "due_marker" not in item
+                ]
+            }
+
+        return {"Items": list(self.items)}
+
+
+class FakeResource:
+    def __init__(self, table):
+        self.table = table
+
+    def Table(self, name):
+        return self.table
+
+
+def evaluate(condition, item):
+    """Evaluate a boto3 condition (the operators BacklogManager uses) on an item."""
+    operator = condition.expression_operator
+    values = condition.get_expression()["values"]
+
+    if operator == "AND":
+        return all(evaluate(value, item) for value in values)
+
+    if operator == "OR":
+        return any(evaluate(value, item) for value in values)
+
+    if operator == "NOT":
+        return not evaluate(values[0], item)
+
+    name = values[0].name
+
+    if operator == "attribute_not_exists":
+        return name not in item
+
+    if name not in item:
+        return False
+
+    actual = item[name]
+
+    if operator == "=":
+        return actual == values[1]
+    if operator == "contains":
+        return values[1] in actual
+    if operator == "BETWEEN":
+        return values[1] <= actual <= values[2]
+
+    raise NotImplementedError(operator)
+
+
+class ConditionTable:
+    """
+    Evaluates ScheduledTimeIndex queries against a list of items.
+
+    Like DynamoDB, each page reads `page_size` items in index order and then
+    applies the FilterExpression, so a page can come back empty.
+    """
+
+    def __init__(self, items, page_size=2):
+        self.items = sorted(items, key=lambda item: item["scheduled_time"])
+
+        self.page_size = page_size
+
+        self.pages_read = 0
+
+    def query(self, **params):
+        assert params.get("IndexName") == BacklogManager.GSI_NAME
+
+        self.pages_read += 1
+
+        matching = [
+            item
+            for item in self.items
+            if evaluate(params["KeyConditionExpression"], item)
+        ]
+
+        start = params.get("ExclusiveStartKey", {}).get("offset", 0)
+        page = matching[start : start + self.page_size]
+
+        filter_expression = params.get("FilterExpression")
+
+        if isinstance(filter_expression, ConditionBase):
+            page = [item for item in page if evaluate(filter_expression, item)]
+
+        response = {"Items": page}
+
+        if start + self.page_size < len(matching):
+            response["LastEvaluatedKey"] = {"offset": start + self.page_size}
+
+        return response
+
+
+def make_item(item_id, minutes_from_now, legacy=False):
+    scheduled = NOW + timedelta(minutes=minutes_from_now)
+
+    item = {
+        "user_id": USER_ID,
+        "item_id": item_id,
+        "title": item_id,
+        "scheduled_time": scheduled.isoformat(),
+        "remind_before_minutes": 15,
+    }
+
+    # Items written before DueIndex have neither attribute
+    if not legacy:
+        item["scheduled_epoch"] = int(scheduled.timestamp())
+        item["due_marker"] = USER_ID
+
+    return item
+
+
+def make_manager(items, has_due_index=True):
+    table = FakeTable(items, has_due_index=has_due_index)
+
+    return BacklogManager(dynamodb_resource=FakeResource(table)), table
+
+
+def due_ids(state):
+    return sorted(item["item_id"] for item in state["due"])
+
+
+def test_uses_due_index_when_all_items_are_marked():
+    manager, table = make_manager([make_item("a", 10), make_item("b", 120)])
+
+    state = manager.fetch_user_state(USER_ID, NOW)
+
+    assert due_ids(state) == ["a"]
+    assert table.indexes_queried[-1] == BacklogManager.DUE_GSI_NAME
+
+
+def test_falls_back_when_due_index_is_missing():
+    manager, table = make_manager([make_item("a", 10)], has_due_index=False)
+
+    state = manager.fetch_user_state(USER_ID, NOW)
+
+    assert due_ids(state) == ["a"]
+    assert table.indexes_queried[-1] == BacklogManager.GSI_NAME
+
+    # The missing index is remembered rather than retried every tick
+    table.indexes_queried.clear()
+
+    manager.fetch_user_state(USER_ID, NOW)
+
+    assert BacklogManager.DUE_GSI_NAME not in table.indexes_queried
+
+
+def test_falls_back_for_items_without_due_marker():
+    items = [make_item("new", 10), make_item("legacy", 5, legacy=True)]
+
+    manager, table = make_manager(items)
+
+    state = manager.fetch_user_state(USER_ID, NOW)
+
+    # The legacy item is only reachable through ScheduledTimeIndex and is
+    # scheduled from its ISO scheduled_time
+    assert due_ids(state) == ["legacy", "new"]
+    assert BacklogManager.DUE_GSI_NAME not in table.indexes_queried
+    assert state["next_remind_epoch"] is not None
+
+
+def test_other_query_errors_are_raised():
+    manager, table = make_manager([make_item("a", 10)])
+
+    def fail(**params):
+        raise ClientError(
+            {"Error": {"Code": "ProvisionedThroughputExceededException"}}, "Query"
+        )
+
+    manager.fetch_user_state(USER_ID, NOW)
+
+    table.query = fail
+
+    with pytest.raises(ClientError):
+        manager.fetch_user_state(USER_ID, NOW)
+
+
+def make_titled_item(item_id, title, hours_from_now=1, legacy=False, **fields):
+    item = make_item(item_id, hours_from_now * 60)
+
+    item.update(title=title, is_active=True, is_completed=False)
+    item.update(fields)
+
+    # Items created before title_lower existed
+    if not legacy:
+        item["title_lower"] = title.lower()
+
+    return item
+
+
+def original_find_item_by_title(items, title_search):
+    """find_item_by_title before the server-side filter."""
+    active = sorted(
+        (item for item in items if item["is_active"] and not item["is_completed"]),
+        key=lambda item: item["scheduled_time"],
+    )
+
+    for item in active:
+        if title_search.lower() in item["title"].lower():
+            return item
+
+    return None
+
+
+TITLED_ITEMS = [
+    make_titled_item("pills", "Take my Pills", 1),
+    make_titled_item("done", "Call my son", 2, is_completed=True),
+    make_titled_item("deleted", "Call my son", 3, is_active=False),
+    make_titled_item("son", "Call my SON", 4),
+    make_titled_item("doctor", "Doctor appointment", 5),
+    make_titled_item("son_again", "call my son again", 6),
+]
+
+
+@pytest.mark.parametrize(
+    "title_search",
+    ["pills", "PILLS", "call my son", "Son", "son again", "appoint", "x", "my"],
+)
+def test_find_item_by_title_matches_original(title_search):
+    manager = BacklogManager(
+        dynamodb_resource=FakeResource(ConditionTable(TITLED_ITEMS))
+    )
+
+    assert manager.find_item_by_title(USER_ID, title_search) == (
+        original_find_item_by_title(TITLED_ITEMS, title_search)
+    )
+
+
+def test_find_item_by_title_stops_paging_at_first_match():
+    items = [make_titled_item(f"item_{i}", f"Task {i}", i) for i in range(10)]
+
+    table = ConditionTable(items, page_size=2)
+
+    manager = BacklogManager(dynamodb_resource=FakeResource(table))
+
+    assert manager.find_item_by_title(USER_ID, "task 5")["item_id"] == "item_5"
+    assert table.pages_read == 3
+
+    table.pages_read = 0
+
+    assert manager.find_item_by_title(USER_ID, "missing") is None
+    assert table.pages_read == 5
+
+
+def test_find_item_by_title_legacy_items_match_case_insensitively():
+    items = [
+        make_titled_item("legacy_other", "Water the plants", 1, legacy=True),
+        make_titled_item("new_other", "Take my pills", 2),
+        make_titled_item("legacy", "Call my Son", 3, legacy=True),
+        make_titled_item("new", "Call my son again", 4),
+    ]
+
+    manager = BacklogManager(dynamodb_resource=FakeResource(ConditionTable(items)))
+
+    for title_search in ("my Son", "my son", "CALL MY SON", "again", "plants", "x"):
+        assert manager.find_item_by_title(USER_ID, title_search) == (
+            original_find_item_by_title(items, title_search)
+        )
+
+
+class ScanTable:
+    """Serves the migration's scan and conditional update_item calls."""
+
+    def __init__(self, items):
+        self.items = {item["item_id"]: item for item in items}
+
+    def scan(self, **params):
+        names = params["ExpressionAttributeNames"]
+
+        return {
+            "Items": [
+                {name: item[name] for name in names.values() if name in item}
+                for item in self.items.values()
+                if evaluate(params["FilterExpression"], item)
+            ]
+        }
+
+    def update_item(self, Key, UpdateExpression, ConditionExpression, **params):
+        item = self.items[Key["item_id"]]
+
+        assert evaluate(ConditionExpression, item)
+
+        values = params["ExpressionAttributeValues"]
+
+        for name, if_not_exists, value in re.findall(
+            r"(\w+) = (if_not_exists\(\w+, )?(:\w+)\)?", UpdateExpression
+        ):
+            if not (if_not_exists and name in item):
+                item[name] = values[value]
+
+
+def test_backfill_sets_title_lower_and_due_marker():
+    legacy = make_titled_item("legacy", "Call my Son", 1, legacy=True)
+
+    # Has due_marker (created after DueIndex) but predates title_lower
+    no_title_lower = make_titled_item("no_title_lower", "Take my Pills", 2, legacy=True)
+    no_title_lower["scheduled_epoch"] = make_item("x", 120)["scheduled_epoch"]
+    no_title_lower["due_marker"] = USER_ID
+
+    current = make_titled_item("current", "Doctor", 3)
+
+    table = ScanTable([legacy, no_title_lower, current])
+
+    manager = BacklogManager(dynamodb_resource=FakeResource(table))
+
+    assert backfill_due_markers(manager, dry_run=True) == 2
+    assert "title_lower" not in table.items["legacy"]
+
+    assert backfill_due_markers(manager) == 2
+
+    assert table.items["legacy"]["title_lower"] == "call my son"
+    assert table.items["legacy"]["due_marker"] == USER_ID
+    assert table.items["legacy"][
+        "scheduled_epoch"
+    ] == BacklogManager.get_scheduled_epoch(legacy)
+    assert table.items["no_title_lower"]["title_lower"] == "take my pills"
+
+    # Nothing left to backfill
+    assert backfill_due_markers(manager) == 0
+
+
+def original_get_items_by_timeframe(items, timeframe, current_time):
+    """get_items_by_timeframe before the BETWEEN key condition."""
+    active = sorted(
+        (item for item in items if item["is_active"] and not item["is_completed"]),
+        key=lambda item: item["scheduled_time"],
+    )
+
+    today_start = current_time.replace(hour=0, minute=0, second=0, microsecond=0)
+    today_end = today_start + timedelta(days=1)
+    tomorrow_end = today_start + timedelta(days=2)
+    week_end = today_start + timedelta(days=7)
+
+    if timeframe == "all":
+        return active
+
+    windows = {
+        "today": (today_start, today_end),
+        "tomorrow": (today_end, tomorrow_end),
+        "week": (today_start, week_end),
+    }
+
+    if timeframe not in windows:
+        return []
+
+    start, end = windows[timeframe]
+
+    return [
+        item
+        for item in active
+        if start <= datetime.fromisoformat(item["scheduled_time"]) < end
+    ]
+
+
+def make_timed_item(item_id, scheduled, **fields):
+    item = make_titled_item(item_id, item_id, **fields)
+
+    item["scheduled_time"] = scheduled.isoformat()
+
+    return item
+
+
+TODAY = NOW.replace(hour=0)
+
+TIMED_ITEMS = [
+    make_timed_item("yesterday_late", TODAY - timedelta(seconds=1)),
+    make_timed_item("today_start", TODAY),
+    make_timed_item("today_morning", TODAY + timedelta(hours=9, minutes=30)),
+    make_timed_item("today_done", TODAY + timedelta(hours=10), is_completed=True),
+    make_timed_item("today_deleted", TODAY + timedelta(hours=11), is_active=False),
+    make_timed_item("today_last", TODAY + timedelta(days=1) - timedelta(seconds=1)),
+    make_timed_item("tomorrow_start", TODAY + timedelta(days=1)),
+    make_timed_item("tomorrow_noon", TODAY + timedelta(days=1, hours=12)),
+    make_timed_item("day_after", TODAY + timedelta(days=2)),
+    make_timed_item("week_last", TODAY + timedelta(days=7) - timedelta(minutes=1)),
+    make_timed_item("week_end", TODAY + timedelta(days=7)),
+    make_timed_item("next_month", TODAY + timedelta(days=30)),
+]
+
+
+@pytest.mark.parametrize("timeframe", ["today", "tomorrow", "week", "all", "month"])
+@pytest.mark.parametrize("page_size", [1, 3, 100])
+def test_get_items_by_timeframe_matches_original(timeframe, page_size):
+    table = ConditionTable(TIMED_ITEMS, page_size=page_size)
+
+    manager = BacklogManager(dynamodb_resource=FakeResource(table))
+
+    assert manager.get_items_by_timeframe(USER_ID, timeframe, NOW) == (
+        original_get_items_by_timeframe(TIMED_ITEMS, timeframe, NOW)
+    )
+
+
+def test_get_items_by_timeframe_keeps_window_end_exclusive():
+    manager = BacklogManager(
+        dynamodb_resource=FakeResource(ConditionTable(TIMED_ITEMS))
+    )
+
+    today = [
+        item["item_id"]
+        for item in manager.get_items_by_timeframe(USER_ID, "today", NOW)
+    ]
+    tomorrow = [
+        item["item_id"]
+        for item in manager.get_items_by_timeframe(USER_ID, "tomorrow", NOW)
+    ]
+
+    assert today == ["today_start", "today_morning", "today_last"]
+    assert tomorrow == ["tomorrow_start", "tomorrow_noon"]
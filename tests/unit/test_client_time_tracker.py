@@ -0,0 +1,58 @@
+"""
+Unit tests for ClientTimeTracker initialization.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("pytz")
+
+from helpers.client_time_tracker import ClientTimeTracker
+
+
+def test_initialize_with_full_timestamp():
+    tracker = ClientTimeTracker()
+
+    tracker.initialize("2025-11-24T14:30:00", timezone_offset_minutes=60)
+
+    assert tracker.is_initialized()
+    assert tracker.get_timezone_offset_minutes() == 60
+
+    now = tracker.get_current_client_time()
+
+    assert now.replace(microsecond=0) == datetime(2025, 11, 24, 14, 30, 0)
+
+
+def test_initialize_with_offset_timestamp():
+    tracker = ClientTimeTracker()
+
+    tracker.initialize("2025-11-24T14:30:00+02:00")
+
+    assert tracker.get_current_client_time().utcoffset().total_seconds() == 7200
+
+
+@pytest.mark.parametrize(
+    "client_time_iso",
+    [
+        None,
+        "",
+        "not a time",
+        "14:30:00",
+        # fromisoformat accepts these as midnight
+        "2025-11-24",
+        "20251124",
+    ],
+)
+def test_malformed_input_falls_back_to_server_time(client_time_iso):
+    tracker = ClientTimeTracker()
+
+    tracker.initialize(client_time_iso, timezone_offset_minutes=120)
+
+    assert tracker.is_initialized()
+    assert tracker.get_timezone_offset_minutes() == 0
+
+    # Server UTC time, not midnight of the given date
+    drift = tracker.get_current_client_time() - datetime.now(timezone.utc)
+
+    assert abs(drift) < timedelta(seconds=5)
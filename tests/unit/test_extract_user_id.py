@@ -0,0 +1,75 @@
+"""
+Unit tests for extract_user_id against the original split-based parser.
+"""
+
+import random
+
+import pytest
+
+from helpers.extract_user_id import extract_user_id
+
+
+def original_extract_user_id(room_name: str) -> str:
+    """extract_user_id before the precompiled regex."""
+    if not room_name.startswith("room_"):
+        return None
+
+    parts = room_name.replace("room_", "", 1).rsplit("_", 2)
+
+    if len(parts) != 3:
+        return None
+
+    return parts[0]
+
+
+@pytest.mark.parametrize(
+    "room_name",
+    [
+        "room_user_20250601111146_bc2d2766-bac9-4271-89d9-9b15c33cab8a_Harith_1704384000000",
+        "room_abc_Harith_1704384000000",
+        # userId with several underscores
+        "room_user_a_b_c_Harith_1704384000000",
+        "room___Harith_1704384000000",
+        # Too few parts
+        "room_abc_1704384000000",
+        "room_abc",
+        "room_",
+        # Empty segments
+        "room___",
+        "room_abc__",
+        "room__Harith_",
+        # Prefix appears again inside the name
+        "room_room_abc_Harith_1704384000000",
+        "room_user_room_x_Harith_1",
+        # Not a room name
+        "abc_Harith_1704384000000",
+        "Room_abc_Harith_1704384000000",
+        " room_abc_Harith_1",
+        "",
+        # Characters a regex could trip over
+        "room_a.b*c_Ha+rith_1",
+        "room_abc\n_Harith_1",
+        "room_abc_Harith_1\n",
+    ],
+)
+def test_matches_original_parser(room_name):
+    assert extract_user_id(room_name) == original_extract_user_id(room_name)
+
+
+def test_extracts_user_id_with_underscores():
+    room_name = "room_user_20250601111146_bc2d2766-bac9-4271-89d9-9b15c33cab8a_Harith_1704384000000"
+
+    assert (
+        extract_user_id(room_name)
+        == "user_20250601111146_bc2d2766-bac9-4271-89d9-9b15c33cab8a"
+    )
+
+
+def test_matches_original_parser_on_random_names():
+    rng = random.Random(1234)
+
+    for _ in range(2000):
+        body = "".join(rng.choice("ab_-1\n") for _ in range(rng.randrange(12)))
+        room_name = rng.choice(["room_", "room_room_", "roo_", ""]) + body
+
+        assert extract_user_id(room_name) == original_extract_user_id(room_name)
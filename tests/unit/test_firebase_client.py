@@ -0,0 +1,138 @@
+"""
+Unit tests for FirebaseClient's buffered message writes and shutdown drain.
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("firebase_admin")
+
+import clients.firebase_client as firebase_module
+from clients.firebase_client import FirebaseClient
+
+
+class FakeBatch:
+    def __init__(self, db):
+        self.db = db
+
+        self.writes = []
+
+    def set(self, doc_ref, data):
+        self.writes.append(data)
+
+    async def commit(self):
+        self.db.commits_started += 1
+
+        if self.db.hold is not None:
+            await self.db.hold.wait()
+
+        if self.db.failures:
+            self.db.failures -= 1
+            raise RuntimeError("commit failed")
+
+        self.db.committed.extend(self.writes)
+
+
+class FakeCollection:
+    def document(self):
+        return object()
+
+
+class FakeAsyncDb:
+    def __init__(self):
+        self.committed = []
+
+        self.commits_started = 0
+
+        # Commits fail while this is positive
+        self.failures = 0
+
+        # Commits wait on this event when set
+        self.hold = None
+
+    def collection(self, name):
+        return FakeCollection()
+
+    def batch(self):
+        return FakeBatch(self)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    db = FakeAsyncDb()
+
+    # Skip credential loading; the app counts as initialized
+    monkeypatch.setattr(firebase_module.firebase_admin, "_apps", {"[DEFAULT]": None})
+    monkeypatch.setattr(firebase_module.firestore, "client", lambda: None)
+    monkeypatch.setattr(firebase_module.firestore_async, "client", lambda: db)
+    monkeypatch.setattr(FirebaseClient, "FLUSH_RETRY_DELAY_SECONDS", 0)
+
+    return FirebaseClient()
+
+
+def contents(client):
+    return [message["content"] for message in client.async_db.committed]
+
+
+def test_close_writes_messages_waiting_for_the_delayed_flush(client):
+    async def run():
+        client.queue_message("user_1", "user", "hello")
+
+        assert client._flush_task is not None
+
+        assert await client.close()
+
+    asyncio.run(run())
+
+    assert contents(client) == ["hello"]
+    assert client._flush_tasks == set()
+
+
+def test_close_waits_for_in_flight_flush_and_retries_it(client):
+    db = client.async_db
+
+    async def run():
+        db.hold = asyncio.Event()
+        db.failures = 1
+
+        # A full batch starts flushing straight away
+        for i in range(FirebaseClient.FLUSH_BATCH_SIZE):
+            client.queue_message("user_1", "user", f"message {i}")
+
+        await asyncio.sleep(0)
+
+        assert db.commits_started == 1
+        assert client._pending_messages == []
+
+        closing = asyncio.create_task(client.close())
+
+        await asyncio.sleep(0)
+
+        # The in-flight commit fails after shutdown started
+        db.hold.set()
+
+        assert await closing
+
+    asyncio.run(run())
+
+    assert contents(client) == [
+        f"message {i}" for i in range(FirebaseClient.FLUSH_BATCH_SIZE)
+    ]
+    assert client._pending_messages == []
+
+
+def test_close_gives_up_after_max_retries(client):
+    db = client.async_db
+
+    async def run():
+        db.failures = FirebaseClient.MAX_FLUSH_RETRIES + 1
+
+        client.queue_message("user_1", "user", "lost")
+
+        return await client.close()
+
+    assert not asyncio.run(run())
+
+    assert db.commits_started == FirebaseClient.MAX_FLUSH_RETRIES + 1
+    assert client._pending_messages == []
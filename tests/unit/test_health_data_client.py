@@ -0,0 +1,277 @@
+"""
+Unit tests for HealthDataClient: the encryption key file cache, and
+decryption and aggregation against the original implementations.
+"""
+
+import base64
+import json
+import os
+import random
+import time
+
+import pytest
+
+pytest.importorskip("boto3")
+pytest.importorskip("cryptography")
+pytest.importorskip("dotenv")
+pytest.importorskip("numpy")
+pytest.importorskip("requests")
+
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+from clients.health_data_client import NUMPY_XOR_MIN_BYTES, HealthDataClient
+
+ENCRYPTION_KEY = "0123456789abcdef0123456789abcdef"
+
+
+class FakeResource:
+    def Table(self, name):
+        return None
+
+
+def make_client():
+    client = HealthDataClient(dynamodb_resource=FakeResource())
+
+    client._set_encryption_key(ENCRYPTION_KEY)
+
+    return client
+
+
+@pytest.fixture
+def key_cache_path(tmp_path, monkeypatch):
+    path = tmp_path / "cache" / "health_key.cache"
+
+    monkeypatch.setenv("HEALTH_KEY_CACHE_PATH", str(path))
+
+    return path
+
+
+def test_key_cache_round_trip(key_cache_path):
+    make_client()._write_cached_key(ENCRYPTION_KEY)
+
+    assert key_cache_path.parent.stat().st_mode & 0o777 == 0o700
+    assert key_cache_path.stat().st_mode & 0o777 == 0o600
+    # No temp files left behind
+    assert os.listdir(key_cache_path.parent) == [key_cache_path.name]
+
+    assert make_client()._read_cached_key() == ENCRYPTION_KEY
+
+
+def test_key_cache_expires(key_cache_path):
+    make_client()._write_cached_key(ENCRYPTION_KEY)
+
+    stale = time.time() - HealthDataClient.KEY_CACHE_TTL_SECONDS - 1
+    os.utime(key_cache_path, (stale, stale))
+
+    assert make_client()._read_cached_key() is None
+
+
+def test_key_cache_ignores_readable_file(key_cache_path):
+    make_client()._write_cached_key(ENCRYPTION_KEY)
+
+    key_cache_path.chmod(0o644)
+
+    assert make_client()._read_cached_key() is None
+
+
+def test_key_cache_ignores_symlink(key_cache_path, tmp_path):
+    target = tmp_path / "planted"
+    target.write_text("attacker key")
+    target.chmod(0o600)
+
+    key_cache_path.parent.mkdir(mode=0o700)
+    key_cache_path.symlink_to(target)
+
+    assert make_client()._read_cached_key() is None
+
+
+def test_key_cache_not_written_to_shared_directory(key_cache_path):
+    key_cache_path.parent.mkdir()
+    key_cache_path.parent.chmod(0o777)
+
+    make_client()._write_cached_key(ENCRYPTION_KEY)
+
+    assert not key_cache_path.exists()
+
+
+def encrypt(plaintext: bytes) -> str:
+    """Encrypt the way the app does: AES-CTR with the static IV."""
+    encryptor = Cipher(
+        algorithms.AES(ENCRYPTION_KEY.encode("utf-8")),
+        modes.CTR(HealthDataClient.IV_KEY.encode("utf-8")),
+    ).encryptor()
+
+    return base64.b64encode(encryptor.update(plaintext) + encryptor.finalize()).decode()
+
+
+def original_decrypt(encrypted_base64: str) -> dict:
+    """HealthDataClient._decrypt_data before the cached keystream."""
+    decryptor = Cipher(
+        algorithms.AES(ENCRYPTION_KEY.encode("utf-8")),
+        modes.CTR(HealthDataClient.IV_KEY.encode("utf-8")),
+    ).decryptor()
+
+    decrypted_bytes = (
+        decryptor.update(base64.b64decode(encrypted_base64)) + decryptor.finalize()
+    )
+    decrypted_bytes = decrypted_bytes.rstrip(
+        b"\x00\x01\x02\x03\x04\x05\x06\x07\x08\x09\x0a\x0b\x0c\x0d\x0e\x0f"
+    )
+    decrypted_json = decrypted_bytes.rstrip().decode("utf-8")
+
+    try:
+        return json.loads(decrypted_json)
+    except json.JSONDecodeError:
+        return json.loads(decrypted_json[: decrypted_json.rfind("}") + 1])
+
+
+def make_plaintext(size: int, padding: bytes = b"") -> bytes:
+    """JSON health record of exactly `size` bytes, followed by padding."""
+    record = {"type": "heartRate", "value": 72, "unit": "BEATS_PER_MINUTE", "note": ""}
+
+    filler = size - len(json.dumps(record).encode("utf-8"))
+    assert filler >= 0
+
+    record["note"] = "x" * filler
+
+    plaintext = json.dumps(record).encode("utf-8")
+    assert len(plaintext) == size
+
+    return plaintext + padding
+
+
+@pytest.mark.parametrize(
+    "size",
+    [
+        80,
+        NUMPY_XOR_MIN_BYTES - 1,
+        NUMPY_XOR_MIN_BYTES,
+        NUMPY_XOR_MIN_BYTES + 1,
+        5000,
+        # Longer than the preloaded keystream, so it has to grow
+        HealthDataClient.KEYSTREAM_PRELOAD_BYTES + 4096,
+    ],
+)
+@pytest.mark.parametrize("padding", [b"", b"\x00\x00\x00", b"\x05" * 5, b"  \n"])
+def test_decrypt_matches_original_aes_ctr(size, padding):
+    client = make_client()
+
+    encrypted = encrypt(make_plaintext(size, padding))
+
+    decrypted = client._decrypt_data(encrypted, client._key_bytes)
+
+    assert decrypted == original_decrypt(encrypted)
+    assert len(decrypted["note"]) > 0
+
+
+def test_decrypt_matches_original_across_sizes_on_one_client():
+    client = make_client()
+
+    # Mixed lengths share one keystream; a short item after a long one must
+    # still only XOR its own prefix
+    for size in (
+        HealthDataClient.KEYSTREAM_PRELOAD_BYTES * 3,
+        80,
+        NUMPY_XOR_MIN_BYTES,
+        300,
+    ):
+        encrypted = encrypt(make_plaintext(size))
+
+        assert client._decrypt_data(encrypted, client._key_bytes) == original_decrypt(
+            encrypted
+        )
+
+
+def test_keystream_is_rebuilt_for_a_new_key():
+    client = make_client()
+
+    plaintext = make_plaintext(2000)
+    encrypted = encrypt(plaintext)
+
+    client._set_encryption_key("fedcba9876543210fedcba9876543210")
+    client._set_encryption_key(ENCRYPTION_KEY)
+
+    assert client._decrypt_data(encrypted, client._key_bytes) == json.loads(plaintext)
+
+
+def test_decrypt_without_closing_brace_raises():
+    client = make_client()
+
+    encrypted = encrypt(b'{"type": "heartRate"')
+
+    with pytest.raises(json.JSONDecodeError):
+        client._decrypt_data(encrypted, client._key_bytes)
+
+
+def original_aggregate(all_data):
+    """get_aggregated_metrics before the single-pass _aggregate."""
+    metrics_by_type = {}
+    for item in all_data:
+        metrics_by_type.setdefault(item.get("type"), []).append(item)
+
+    aggregated = {}
+    for metric_type, items in metrics_by_type.items():
+        values = [item.get("value") for item in items if item.get("value") is not None]
+
+        if values:
+            aggregated[metric_type] = {
+                "latest": values[0],
+                "average": sum(values) / len(values),
+                "min": min(values),
+                "max": max(values),
+                "count": len(values),
+                "unit": items[0].get("unit", ""),
+                "source": items[0].get("source", ""),
+            }
+
+    return aggregated
+
+
+def test_aggregate_matches_original_on_edge_cases():
+    all_data = [
+        # Most recent item has no value; unit/source still come from it
+        {"type": "heartRate", "unit": "BPM", "source": "watch"},
+        {"type": "heartRate", "value": 80, "unit": "bpm", "source": "phone"},
+        {"type": "heartRate", "value": 60},
+        {"type": "heartRate", "value": 95.5},
+        {"type": "heartRate", "value": 60},
+        # Only missing values - left out entirely
+        {"type": "bloodOxygen", "unit": "%"},
+        {"type": "bloodOxygen", "value": None},
+        # Single value, falsy
+        {"type": "steps", "value": 0, "unit": "COUNT"},
+        # No type
+        {"value": 3},
+        # Decreasing then increasing values
+        {"type": "weight", "value": 70},
+        {"type": "weight", "value": 68},
+        {"type": "weight", "value": 72},
+    ]
+
+    assert HealthDataClient._aggregate(all_data) == original_aggregate(all_data)
+
+
+def test_aggregate_matches_original_on_random_data():
+    rng = random.Random(42)
+
+    for _ in range(200):
+        all_data = []
+
+        for _ in range(rng.randrange(40)):
+            item = {"type": rng.choice(["heartRate", "steps", "sleep", None])}
+
+            value = rng.choice([None, rng.randint(-5, 200), rng.uniform(-5, 200)])
+            if value is not None:
+                item["value"] = value
+            if rng.random() < 0.7:
+                item["unit"] = rng.choice(["BPM", "COUNT", "MINUTES"])
+            if rng.random() < 0.7:
+                item["source"] = rng.choice(["watch", "phone"])
+
+            all_data.append(item)
+
+        assert HealthDataClient._aggregate(all_data) == original_aggregate(all_data)
+
+
+def test_aggregate_empty():
+    assert HealthDataClient._aggregate([]) == {}
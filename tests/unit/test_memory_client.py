@@ -0,0 +1,221 @@
+"""
+Unit tests for MemoryClient activity logging (batched BatchWriteItem writes)
+and the per-thread DynamoDB resources.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("boto3")
+pytest.importorskip("dotenv")
+pytest.importorskip("numpy")
+pytest.importorskip("openai")
+pytest.importorskip("pinecone")
+
+from boto3.dynamodb.table import BatchWriter
+from botocore.exceptions import ClientError
+
+from clients.memory_client import (
+    MemoryClient,
+    get_dynamodb_client,
+    get_dynamodb_resource,
+    get_dynamodb_table,
+)
+
+USER_ID = "user_1"
+
+
+class FakeClient:
+    """Low-level client behind boto3's BatchWriter, storing puts by key."""
+
+    def __init__(self, table):
+        self.table = table
+
+    def batch_write_item(self, RequestItems):
+        if self.table.error is not None:
+            raise self.table.error
+
+        (requests,) = RequestItems.values()
+
+        keys = [
+            (
+                request["PutRequest"]["Item"]["user_id"],
+                request["PutRequest"]["Item"]["timestamp"],
+            )
+            for request in requests
+        ]
+
+        # DynamoDB rejects a batch that writes the same key twice
+        assert len(keys) == len(set(keys))
+        assert len(requests) <= 25
+
+        self.table.batch_sizes.append(len(requests))
+
+        for key, request in zip(keys, requests):
+            self.table.items[key] = request["PutRequest"]["Item"]
+
+        return {"UnprocessedItems": {}}
+
+
+class FakeTable:
+    def __init__(self):
+        self.items = {}
+
+        self.batch_sizes = []
+
+        self.error = None
+
+    def put_item(self, Item):
+        self.items[(Item["user_id"], Item["timestamp"])] = Item
+
+    def batch_writer(self, overwrite_by_pkeys=None):
+        return BatchWriter(
+            "memory_daily_context",
+            FakeClient(self),
+            overwrite_by_pkeys=overwrite_by_pkeys,
+        )
+
+
+class FakeResource:
+    def __init__(self):
+        self.tables = {}
+
+    def Table(self, name):
+        return self.tables.setdefault(name, FakeTable())
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # Pinecone/OpenAI clients only need a key to construct
+    monkeypatch.setenv("PINECONE_API_KEY", "test")
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+
+    return MemoryClient(dynamodb_resource=FakeResource())
+
+
+def make_activity(timestamp, activity_type="walk"):
+    return {
+        "user_id": USER_ID,
+        "timestamp": timestamp,
+        "activity_type": activity_type,
+        "details": {},
+        "date": timestamp[:10],
+    }
+
+
+def test_concurrent_activities_match_individual_puts(client):
+    items = [
+        make_activity(f"2025-11-24T14:00:00.{i:06d}", f"activity_{i}")
+        for i in range(30)
+    ]
+
+    async def write_all():
+        await asyncio.gather(*(client._write_activity(item) for item in items))
+
+    asyncio.run(write_all())
+
+    # The original wrote each activity with its own put_item
+    expected = FakeTable()
+    for item in items:
+        expected.put_item(Item=item)
+
+    assert client.context_table.items == expected.items
+
+    # One window, split into BatchWriteItem requests of at most 25
+    assert client.context_table.batch_sizes == [25, 5]
+
+
+def test_concurrent_log_activity_calls_are_all_stored(client):
+    async def log_all():
+        return await asyncio.gather(
+            *(
+                client.log_activity(USER_ID, f"activity_{i}", {"step": i, "km": 1.5})
+                for i in range(10)
+            )
+        )
+
+    results = asyncio.run(log_all())
+
+    assert all(result["success"] for result in results)
+
+    stored = client.context_table.items
+
+    # Every returned timestamp is readable once log_activity returns
+    assert {(USER_ID, result["timestamp"]) for result in results} == set(stored)
+    assert len(client.context_table.batch_sizes) == 1
+
+
+def test_same_key_in_one_batch_keeps_last_write(client):
+    first = make_activity("2025-11-24T14:00:00.000001", "walk")
+    second = make_activity("2025-11-24T14:00:00.000001", "nap")
+    other = make_activity("2025-11-24T14:00:00.000002", "lunch")
+
+    async def write_all():
+        await asyncio.gather(
+            client._write_activity(first),
+            client._write_activity(second),
+            client._write_activity(other),
+        )
+
+    asyncio.run(write_all())
+
+    # Same result as sequential put_item calls: the later write wins
+    expected = FakeTable()
+    for item in (first, second, other):
+        expected.put_item(Item=item)
+
+    assert client.context_table.items == expected.items
+    assert client.context_table.batch_sizes == [2]
+
+
+def test_separate_windows_write_separate_batches(client):
+    async def write_apart():
+        await client._write_activity(make_activity("2025-11-24T14:00:00"))
+        await client._write_activity(make_activity("2025-11-24T15:00:00"))
+
+    asyncio.run(write_apart())
+
+    assert client.context_table.batch_sizes == [1, 1]
+    assert len(client.context_table.items) == 2
+
+
+def test_batch_errors_reach_every_caller(client):
+    client.context_table.error = ClientError(
+        {"Error": {"Code": "ProvisionedThroughputExceededException"}},
+        "BatchWriteItem",
+    )
+
+    async def log_all():
+        return await asyncio.gather(
+            *(client.log_activity(USER_ID, "walk", {}) for _ in range(3))
+        )
+
+    results = asyncio.run(log_all())
+
+    assert [result["success"] for result in results] == [False, False, False]
+    assert client.context_table.items == {}
+
+
+def test_dynamodb_resources_are_per_thread_over_one_client(monkeypatch):
+    monkeypatch.setenv("AWS_REGION", "us-east-1")
+
+    def lookup():
+        return get_dynamodb_resource(), get_dynamodb_table("memory_daily_context")
+
+    main_resource, main_table = lookup()
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        worker_resource, worker_table = pool.submit(lookup).result()
+
+        # Cached for the life of the thread
+        assert pool.submit(lookup).result() == (worker_resource, worker_table)
+
+    assert worker_resource is not main_resource
+    assert worker_table is not main_table
+    assert lookup() == (main_resource, main_table)
+
+    assert main_resource.meta.client is get_dynamodb_client()
+    assert worker_resource.meta.client is get_dynamodb_client()
+    assert worker_table.meta.client is get_dynamodb_client()
@@ -0,0 +1,109 @@
+"""
+Unit tests for PineconeClient's batched embedding requests.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("dotenv")
+pytest.importorskip("numpy")
+pytest.importorskip("openai")
+pytest.importorskip("pinecone")
+
+from clients.pinecone_client import PineconeClient
+
+
+def embedding_for(text):
+    return [float(len(text)), float(ord(text[0]))]
+
+
+class FakeEmbeddings:
+    """Embeds each text as [len, first char], optionally misreporting."""
+
+    def __init__(self, reverse=False, drop_last=False):
+        self.reverse = reverse
+
+        self.drop_last = drop_last
+
+        self.requests = []
+
+    def create(self, model, input):
+        self.requests.append(input)
+
+        texts = [input] if isinstance(input, str) else input
+
+        data = [
+            SimpleNamespace(index=i, embedding=embedding_for(text))
+            for i, text in enumerate(texts)
+        ]
+
+        if isinstance(input, list):
+            if self.reverse:
+                data.reverse()
+            if self.drop_last:
+                data.pop()
+
+        return SimpleNamespace(data=data)
+
+
+@pytest.fixture
+def make_client(monkeypatch):
+    # Pinecone/OpenAI clients only need a key to construct
+    monkeypatch.setenv("PINECONE_API_KEY", "test")
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+
+    def make(**fake_options):
+        client = PineconeClient()
+
+        client.openai_client = SimpleNamespace(
+            embeddings=FakeEmbeddings(**fake_options)
+        )
+
+        return client
+
+    return make
+
+
+def embed_all(client, texts):
+    async def run():
+        return await asyncio.gather(
+            *(client.generate_embedding_async(text) for text in texts)
+        )
+
+    return asyncio.run(run())
+
+
+TEXTS = ["a", "bb", "ccc", "dddd"]
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_batched_results_go_to_their_own_callers(make_client, reverse):
+    client = make_client(reverse=reverse)
+
+    embeddings = embed_all(client, TEXTS)
+
+    assert [list(embedding) for embedding in embeddings] == [
+        embedding_for(text) for text in TEXTS
+    ]
+    assert client.openai_client.embeddings.requests == [TEXTS]
+
+
+def test_short_batch_response_falls_back_to_single_requests(make_client):
+    client = make_client(drop_last=True)
+
+    embeddings = embed_all(client, TEXTS)
+
+    assert [list(embedding) for embedding in embeddings] == [
+        embedding_for(text) for text in TEXTS
+    ]
+    assert client.openai_client.embeddings.requests[0] == TEXTS
+    assert len(client.openai_client.embeddings.requests) == 1 + len(TEXTS)
+
+
+def test_empty_text_is_rejected(make_client):
+    client = make_client()
+
+    with pytest.raises(ValueError):
+        asyncio.run(client.generate_embedding_async("  "))
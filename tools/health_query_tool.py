@@ -64,7 +64,7 @@ class HealthQueryTool(ServerSideTool):
         hours = period_hours[period]
 
         # Fetch data
-        aggregated = self.health_client.get_aggregated_metrics(
+        aggregated = await self.health_client.get_aggregated_metrics_async(
             self._user_id, hours_back=hours
         )
 
@@ -126,7 +126,7 @@ class HealthQueryTool(ServerSideTool):
         hours = period_hours[period]
 
         # Fetch data
-        data = self.health_client.get_health_data(
+        data = await self.health_client.get_health_data_async(
             self._user_id, hours_back=hours, metric_type=metric_type
         )
 
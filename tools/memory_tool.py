@@ -73,7 +73,7 @@ class MemoryTool(ServerSideTool):
             return "Error: User ID not set"
 
         try:
-            result = self.memory_client.store_item_location(
+            result = await self.memory_client.store_item_location(
                 user_id=self._user_id,
                 item=item,
                 location=location,
@@ -107,7 +107,7 @@ class MemoryTool(ServerSideTool):
             return "Error: User ID not set"
 
         try:
-            result = self.memory_client.find_item(
+            result = await self.memory_client.find_item(
                 user_id=self._user_id,
                 item=item,
             )
@@ -151,7 +151,7 @@ class MemoryTool(ServerSideTool):
             if category not in valid_categories:
                 category = "personal"  # Default fallback
 
-            result = self.memory_client.store_information(
+            result = await self.memory_client.store_information(
                 user_id=self._user_id,
                 category=category,
                 key=key,
@@ -184,7 +184,7 @@ class MemoryTool(ServerSideTool):
             return "Error: User ID not set"
 
         try:
-            result = self.memory_client.recall_information(
+            result = await self.memory_client.recall_information(
                 user_id=self._user_id,
                 search_key=key,
             )
@@ -228,7 +228,7 @@ class MemoryTool(ServerSideTool):
             if activity_type not in valid_types:
                 activity_type = "activity"  # Default fallback
 
-            result = self.memory_client.log_activity(
+            result = await self.memory_client.log_activity(
                 user_id=self._user_id,
                 activity_type=activity_type,
                 details={"description": details},
@@ -259,7 +259,7 @@ class MemoryTool(ServerSideTool):
             return "Error: User ID not set"
 
         try:
-            activities = self.memory_client.get_daily_context(
+            activities = await self.memory_client.get_daily_context(
                 user_id=self._user_id,
                 date=date,
             )
@@ -312,7 +312,7 @@ class MemoryTool(ServerSideTool):
             return "Error: User ID not set"
 
         try:
-            activity = self.memory_client.get_recent_activity(user_id=self._user_id)
+            activity = await self.memory_client.get_recent_activity(user_id=self._user_id)
 
             if activity is None:  # Explicit None check
                 return "I don't have any recent activities recorded. What have you been up to?"
@@ -144,6 +144,7 @@ class ReadBookTool(BaseTool):
             query=book_name,
             top_k=10,  # Get a few chunks to identify the book
             user_id=user_id,
+            semantic=False,  # A similar title may be a different book
         )
 
         logger.info(f"📚 Query returned {len(initial_chunks)} chunks")
@@ -195,6 +196,7 @@ class ReadBookTool(BaseTool):
             query=f"{best_title} {best_filename}",
             top_k=500,  # Get many chunks to ensure complete book content
             user_id=user_id,
+            semantic=False,
         )
 
         # Filter to only include chunks from the identified book
@@ -1,20 +1,48 @@
 from typing import List, Optional, Dict, Any
 import time
+import uuid
+import json
+import asyncio
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 from langchain_core.documents import Document
 from langchain_openai import OpenAIEmbeddings
 
 from langchain_pinecone import Pinecone
+from pinecone import Pinecone as PineconeSDK
 
 
 # Configuration
 INDEX_NAME = "sidekick-books"
 
+# Max vectors per Pinecone upsert request
+UPSERT_BATCH_SIZE = 100
+
+# Query caching: exact repeats are served by an LRU, near-identical
+# phrasings by comparing against recent query embeddings. Books are ingested
+# outside the agent, so entries expire instead of waiting for an explicit clear.
+QUERY_CACHE_SIZE = 512
+QUERY_CACHE_TTL_SECONDS = 300
+SEMANTIC_CACHE_SIZE = 128
+SEMANTIC_CACHE_THRESHOLD = 0.9
+
 # Singleton instances to avoid repeated initializations
 _embeddings = None
 _pinecone_client = None
 _pinecone_index = None
 _vectorstore = None
 
+# (query, top_k, filter_json, semantic) -> (expires_at, results), in LRU order
+_query_cache = OrderedDict()
+
+# Ring buffer of (expires_at, query_vector, top_k, filter_json, results)
+_semantic_cache = deque(maxlen=SEMANTIC_CACHE_SIZE)
+
+# Queries run in worker threads, so both caches are guarded
+_cache_lock = threading.Lock()
+
 
 def get_embeddings():
     """Get or initialize the OpenAI embeddings instance."""
@@ -31,10 +59,7 @@ def get_pinecone_client():
     """Get or initialize the Pinecone client."""
     global _pinecone_client
     if _pinecone_client is None:
-        _pinecone_client = Pinecone(
-            embedding=get_embeddings(),
-            index_name=INDEX_NAME,
-        )
+        _pinecone_client = PineconeSDK()
     return _pinecone_client
 
 
@@ -58,11 +83,23 @@ def get_vectorstore():
     return _vectorstore
 
 
+async def warmup_books_store():
+    """
+    Initialize the vector store (and the embeddings it wraps) off the event
+    loop, so the first query_books call doesn't pay for it.
+
+    Only the objects query_books uses are built; the raw Pinecone client
+    is for bulk writes. Errors propagate to the caller.
+    """
+    await asyncio.to_thread(get_vectorstore)
+
+
 async def query_books(
     query: str,
     top_k: int = 3,
     filter_dict: Optional[dict] = None,
     user_id: Optional[str] = None,
+    semantic: bool = True,
 ) -> List[Document]:
     """
     Query the vector store for similar books.
@@ -72,6 +109,9 @@ async def query_books(
         top_k: Number of results to return
         filter_dict: Optional dictionary for filtering results (e.g., by genre, author)
         user_id: Optional user ID to filter results for specific user
+        semantic: Whether near-identical cached queries may answer this one.
+            Pass False for lookups by title, where a similar title can belong
+            to a different book.
 
     Returns:
         List of Document objects representing books
@@ -79,16 +119,17 @@ async def query_books(
     start_time = time.time()
 
     try:
-        vectorstore = get_vectorstore()
-
         # Build filter with user_id if provided
         final_filter = filter_dict.copy() if filter_dict else {}
         if user_id:
             final_filter["user_id"] = user_id
 
-        # Perform similarity search
-        results = vectorstore.similarity_search(
-            query=query, k=top_k, filter=final_filter if final_filter else None
+        # Serialize the filter so it can be part of the cache key
+        filter_json = json.dumps(final_filter, sort_keys=True)
+
+        # Embedding and Pinecone calls are blocking - run them off the event loop
+        results = await asyncio.to_thread(
+            _query_books_sync, query, top_k, filter_json, semantic
         )
 
         execution_time = time.time() - start_time
@@ -101,6 +142,88 @@ async def query_books(
         return []
 
 
+def _query_books_sync(
+    query: str, top_k: int, filter_json: str, semantic: bool = True
+) -> List[Document]:
+    """
+    Run a book similarity search, reusing results for repeated queries.
+
+    Exact (query, top_k, filter) repeats are answered by the LRU cache. On a
+    miss, and when semantic is True, the query embedding is compared against
+    recently searched queries with the same top_k and filter; a cosine
+    similarity at or above SEMANTIC_CACHE_THRESHOLD returns the cached
+    results without hitting Pinecone. Entries expire after
+    QUERY_CACHE_TTL_SECONDS and empty results are never cached.
+    """
+    key = (query, top_k, filter_json, semantic)
+
+    now = time.monotonic()
+
+    with _cache_lock:
+        entry = _query_cache.get(key)
+
+        if entry is not None:
+            if entry[0] > now:
+                _query_cache.move_to_end(key)
+
+                return entry[1]
+
+            del _query_cache[key]
+
+    final_filter = json.loads(filter_json)
+
+    # OpenAI embeddings are unit length, so the dot product is the cosine
+    query_vector = np.asarray(get_embeddings().embed_query(query), dtype=np.float32)
+
+    if semantic:
+        with _cache_lock:
+            cached = list(_semantic_cache)
+
+        for expires_at, cached_vector, cached_top_k, cached_filter, results in cached:
+            if expires_at <= now:
+                continue
+
+            if cached_top_k != top_k or cached_filter != filter_json:
+                continue
+
+            if float(np.dot(query_vector, cached_vector)) >= SEMANTIC_CACHE_THRESHOLD:
+                return results
+
+    # Perform similarity search with the embedding we already have
+    results = get_vectorstore().similarity_search_by_vector(
+        embedding=query_vector.tolist(),
+        k=top_k,
+        filter=final_filter if final_filter else None,
+    )
+
+    # An empty result may just mean the book hasn't been ingested yet
+    if results:
+        expires_at = time.monotonic() + QUERY_CACHE_TTL_SECONDS
+
+        with _cache_lock:
+            _query_cache[key] = (expires_at, results)
+
+            _query_cache.move_to_end(key)
+
+            if len(_query_cache) > QUERY_CACHE_SIZE:
+                _query_cache.popitem(last=False)
+
+            if semantic:
+                _semantic_cache.append(
+                    (expires_at, query_vector, top_k, filter_json, results)
+                )
+
+    return results
+
+
+def clear_query_cache():
+    """Drop cached query results after the index contents change."""
+    with _cache_lock:
+        _query_cache.clear()
+
+        _semantic_cache.clear()
+
+
 def add_book(
     book_content: str,
     metadata: Dict[str, Any],
@@ -117,10 +240,9 @@ def add_book(
         user_id: Optional user ID to associate with the book
     """
     try:
-        # Add user_id to metadata if provided
+        # Add user_id to metadata if provided (without mutating the caller's dict)
         if user_id:
-            metadata = metadata.copy()
-            metadata["user_id"] = user_id
+            metadata = {**metadata, "user_id": user_id}
 
         # Create a Document object
         doc = Document(page_content=book_content, metadata=metadata)
@@ -133,6 +255,8 @@ def add_book(
         else:
             vectorstore.add_documents(documents=[doc])
 
+        clear_query_cache()
+
         return "Book added successfully."
     except Exception as e:
         print(f"Error adding book: {e}")
@@ -148,15 +272,30 @@ def add_books(books: List[Dict[str, Any]], ids: Optional[List[str]] = None):
         ids: Optional list of IDs for the books
     """
     try:
-        # Create Document objects
-        documents = [
-            Document(page_content=book["content"], metadata=book["metadata"])
-            for book in books
+        texts = [book["content"] for book in books]
+
+        if ids is None:
+            ids = [str(uuid.uuid4()) for _ in books]
+
+        # Embed every book in one batched call instead of per document
+        vectors = get_embeddings().embed_documents(texts)
+
+        records = [
+            (book_id, vector, {"text": text, **book["metadata"]})
+            for book_id, vector, text, book in zip(ids, vectors, texts, books)
         ]
 
-        # Add to vector store
-        vectorstore = get_vectorstore()
-        vectorstore.add_documents(documents=documents, ids=ids)
+        batches = [
+            records[i : i + UPSERT_BATCH_SIZE]
+            for i in range(0, len(records), UPSERT_BATCH_SIZE)
+        ]
+
+        # Upsert batches in parallel
+        index = get_pinecone_index()
+        with ThreadPoolExecutor() as executor:
+            list(executor.map(lambda batch: index.upsert(vectors=batch), batches))
+
+        clear_query_cache()
 
         return "Books added successfully."
     except Exception as e:
@@ -186,6 +325,8 @@ def update_book(book_id: str, book_content: str, metadata: Dict[str, Any]):
             set_metadata={"text": book_content, **metadata},
         )
 
+        clear_query_cache()
+
         return "Book updated successfully."
     except Exception as e:
         print(f"Error updating book: {e}")
@@ -202,6 +343,9 @@ def delete_books(book_ids: List[str]):
     try:
         vectorstore = get_vectorstore()
         vectorstore.delete(ids=book_ids)
+
+        clear_query_cache()
+
         return "Books deleted successfully."
     except Exception as e:
         print(f"Error deleting books: {e}")
@@ -217,25 +361,13 @@ def delete_books_by_filter(filter_dict: dict):
                     (e.g., {'genre': 'fiction'})
     """
     try:
-        vectorstore = get_vectorstore()
-
-        # Find books matching the filter
-        results = vectorstore.similarity_search(
-            query="",  # Empty query to match based on filter only
-            filter=filter_dict,
-            k=100,  # Adjust this based on your needs
-        )
+        # Pinecone deletes by metadata filter natively - no search needed
+        index = get_pinecone_index()
+        index.delete(filter=filter_dict)
 
-        if not results:
-            return "No matching books found."
+        clear_query_cache()
 
-        # Extract IDs and delete
-        ids = [doc.metadata.get("id") for doc in results if "id" in doc.metadata]
-        if ids:
-            vectorstore.delete(ids=ids)
-            return f"{len(ids)} books deleted successfully."
-        else:
-            return "Found books but couldn't extract IDs for deletion."
+        return "Matching books deleted successfully."
     except Exception as e:
         print(f"Error in delete_books_by_filter: {e}")
         return f"An error occurred: {str(e)}"